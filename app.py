@@ -11,6 +11,16 @@ import math
 from statsmodels.tsa.seasonal import seasonal_decompose
 from great_tables import GT, html, style, loc 
 import backend.data_fetching
+import backend.indicators
+import backend.indicator_cache
+import backend.market_sim
+import backend.analytics
+import backend.correlation
+import backend.online_stats
+import backend.risk
+import backend.volatility
+from backend.quote_table import diff_quotes
+from backend.search import fuzzy_search
 from st_aggrid import AgGrid, GridOptionsBuilder, GridUpdateMode, JsCode
 import datetime
 import yfinance as yf
@@ -20,44 +30,6 @@ import yfinance as yf
 # from tabs.charts import render_tab as render_charts_tab
 # from tabs.analytics import render_tab as render_analytics_tab
 
-# Simple fuzzy search function
-def fuzzy_search(query, items, threshold=2):
-    """Simple fuzzy search using Levenshtein distance"""
-    if not query:
-        return items
-    
-    def levenshtein_distance(s1, s2):
-        if len(s1) < len(s2):
-            return levenshtein_distance(s2, s1)
-        if len(s2) == 0:
-            return len(s1)
-        
-        previous_row = range(len(s2) + 1)
-        for i, c1 in enumerate(s1):
-            current_row = [i + 1]
-            for j, c2 in enumerate(s2):
-                insertions = previous_row[j + 1] + 1
-                deletions = current_row[j] + 1
-                substitutions = previous_row[j] + (c1 != c2)
-                current_row.append(min(insertions, deletions, substitutions))
-            previous_row = current_row
-        
-        return previous_row[-1]
-    
-    matches = []
-    for item in items:
-        # Check ticker
-        ticker_distance = levenshtein_distance(query.lower(), item["ticker"].lower())
-        # Check company name
-        name_distance = levenshtein_distance(query.lower(), item["name"].lower())
-        
-        min_distance = min(ticker_distance, name_distance)
-        if min_distance <= threshold:
-            matches.append((item, min_distance))
-    
-    # Sort by distance (closest matches first)
-    return [item for item, _ in sorted(matches, key=lambda x: x[1])]
-
 # Country data - comprehensive list
 countries = [
     "Afghanistan", "Albania", "Algeria", "Andorra", "Angola", "Antigua and Barbuda", "Argentina", "Armenia", "Australia", "Austria", "Azerbaijan",
@@ -87,21 +59,43 @@ countries = [
 ]
 
 # Countries with major stock indices (for map data)
+symbol_catalog = backend.data_fetching.get_symbol_catalog()
+# Starts the cache warm-up schedule with the first session
+prewarmer = backend.data_fetching.get_prewarmer()
+
+# Demo market state per country benchmark; tickers, names and currencies come from the symbol catalog
+index_market_state = {
+    'USA': {'change_pct': 1.25, 'is_open': True},
+    'DEU': {'change_pct': -0.85, 'is_open': False},
+    'JPN': {'change_pct': 0.45, 'is_open': False},
+    'GBR': {'change_pct': -0.32, 'is_open': False},
+    'FRA': {'change_pct': 0.78, 'is_open': False},
+    'ITA': {'change_pct': -1.12, 'is_open': False},
+    'ESP': {'change_pct': 0.23, 'is_open': False},
+    'CAN': {'change_pct': 0.67, 'is_open': True},
+    'AUS': {'change_pct': -0.54, 'is_open': False},
+    'BRA': {'change_pct': 2.15, 'is_open': True},
+    'CHN': {'change_pct': -0.89, 'is_open': False},
+    'IND': {'change_pct': 1.45, 'is_open': False},
+    'RUS': {'change_pct': 0.12, 'is_open': False},
+    'ZAF': {'change_pct': -0.76, 'is_open': False},
+}
+country_indices = symbol_catalog.filter(tag='country_index')
+# Live index quotes and FX rates, fetched concurrently; the demo values fill in whatever is missing
+index_quotes, fx_rates = backend.data_fetching.get_market_overview(
+    country_indices.tickers, tuple(sorted(set(country_indices.frame['currency'].dropna())))
+)
+index_changes = {} if index_quotes is None else index_quotes.dropna(subset=['change_pct']).set_index('ticker')['change_pct'].to_dict()
 countries_with_indices = {
-    'USA': {'index': '^GSPC', 'name': 'S&P 500', 'change_pct': 1.25, 'is_open': True, 'currency': 'USD'},
-    'DEU': {'index': '^GDAXI', 'name': 'DAX', 'change_pct': -0.85, 'is_open': False, 'currency': 'EUR'},
-    'JPN': {'index': '^N225', 'name': 'Nikkei 225', 'change_pct': 0.45, 'is_open': False, 'currency': 'JPY'},
-    'GBR': {'index': '^FTSE', 'name': 'FTSE 100', 'change_pct': -0.32, 'is_open': False, 'currency': 'GBP'},
-    'FRA': {'index': '^FCHI', 'name': 'CAC 40', 'change_pct': 0.78, 'is_open': False, 'currency': 'EUR'},
-    'ITA': {'index': '^FMIB', 'name': 'FTSE MIB', 'change_pct': -1.12, 'is_open': False, 'currency': 'EUR'},
-    'ESP': {'index': '^IBEX', 'name': 'IBEX 35', 'change_pct': 0.23, 'is_open': False, 'currency': 'EUR'},
-    'CAN': {'index': '^GSPTSE', 'name': 'TSX', 'change_pct': 0.67, 'is_open': True, 'currency': 'CAD'},
-    'AUS': {'index': '^AXJO', 'name': 'ASX 200', 'change_pct': -0.54, 'is_open': False, 'currency': 'AUD'},
-    'BRA': {'index': '^BVSP', 'name': 'Bovespa', 'change_pct': 2.15, 'is_open': True, 'currency': 'BRL'},
-    'CHN': {'index': '^SSEC', 'name': 'Shanghai Composite', 'change_pct': -0.89, 'is_open': False, 'currency': 'CNY'},
-    'IND': {'index': '^NSEI', 'name': 'NIFTY 50', 'change_pct': 1.45, 'is_open': False, 'currency': 'INR'},
-    'RUS': {'index': '^IMOEX', 'name': 'MOEX', 'change_pct': 0.12, 'is_open': False, 'currency': 'RUB'},
-    'ZAF': {'index': '^JN0U', 'name': 'JSE Top 40', 'change_pct': -0.76, 'is_open': False, 'currency': 'ZAR'},
+    index['country']: {
+        'index': index['ticker'],
+        'name': index['name'],
+        'change_pct': index_changes.get(index['ticker'], index_market_state.get(index['country'], {}).get('change_pct', 0.0)),
+        'is_open': index_market_state.get(index['country'], {}).get('is_open', False),
+        'currency': index['currency'],
+        'fx': fx_rates.get(index['currency']),
+    }
+    for index in country_indices.records()
 }
 
 # Mapping from full country names to country codes
@@ -226,9 +220,12 @@ with tab1:
         title = "Stock Market Performance (%)"
         colorscale = 'RdYlGn'
     elif metric == "Currency vs USD % Change":
-        # Simulate currency changes vs USD
+        # Live changes vs USD where a rate came back, simulated ones otherwise
         currency_changes = [0.0, -0.15, 0.08, -0.22, -0.15, -0.15, -0.15, -0.05, -0.12, 0.45, 0.02, -0.08, 0.18, -0.25]
-        z_values = currency_changes
+        z_values = [
+            country_data[country]['fx']['change_pct'] if country_data[country]['fx'] else simulated
+            for country, simulated in zip(country_data.keys(), currency_changes)
+        ]
         title = "Currency Performance vs USD (%)"
         colorscale = 'RdYlGn'
     elif metric == "Market Status (Open/Closed)":
@@ -313,12 +310,15 @@ with tab1:
             
             with col2:
                 st.markdown("**Currency vs USD**")
-                # Simulate currency data from /exchange_rate endpoint
                 if country_data['currency'] != 'USD':
                     currency_pair = f"{country_data['currency']}/USD"
                     st.write(f"- **Pair**: {currency_pair}")
-                    st.write(f"- **Rate**: 1.0850")  # Would come from /exchange_rate
-                    st.write(f"- **Change**: -0.15%")  # Would come from /exchange_rate
+                    if country_data['fx']:
+                        st.write(f"- **Rate**: {country_data['fx']['rate']:.4f}")
+                        st.write(f"- **Change**: {country_data['fx']['change_pct']:+.2f}%")
+                    else:
+                        st.write(f"- **Rate**: 1.0850")  # Simulated: no rate available
+                        st.write(f"- **Change**: -0.15%")
                 else:
                     st.write("- **Base Currency**: USD")
                     st.write("- **No conversion needed**")
@@ -403,17 +403,8 @@ with tab2:
     if 'show_stock_modal' not in st.session_state:
         st.session_state.show_stock_modal = False
     
-    # Static sample data (no real-time fetching)
-    sample_quotes = [
-        {"ticker": "AAPL", "name": "Apple Inc.", "last_price": 185.92, "change": 2.45, "change_pct": 1.34, "volume": 1250000, "bid": 185.90, "ask": 185.95, "day_high": 186.45, "day_low": 184.20, "year_high": 198.23, "year_low": 124.17, "market_cap": "2.89T"},
-        {"ticker": "MSFT", "name": "Microsoft Corp.", "last_price": 378.85, "change": -1.23, "change_pct": -0.32, "volume": 890000, "bid": 378.80, "ask": 378.90, "day_high": 379.50, "day_low": 377.20, "year_high": 420.00, "year_low": 280.00, "market_cap": "2.81T"},
-        {"ticker": "GOOGL", "name": "Alphabet Inc.", "last_price": 142.56, "change": 0.78, "change_pct": 0.55, "volume": 2100000, "bid": 142.50, "ask": 142.60, "day_high": 143.20, "day_low": 141.80, "year_high": 150.00, "year_low": 120.00, "market_cap": "1.79T"},
-        {"ticker": "AMZN", "name": "Amazon.com Inc.", "last_price": 145.24, "change": -3.12, "change_pct": -2.10, "volume": 3400000, "bid": 145.20, "ask": 145.30, "day_high": 148.50, "day_low": 144.80, "year_high": 160.00, "year_low": 100.00, "market_cap": "1.51T"},
-        {"ticker": "TSLA", "name": "Tesla Inc.", "last_price": 248.50, "change": 12.45, "change_pct": 5.28, "volume": 5600000, "bid": 248.40, "ask": 248.60, "day_high": 250.00, "day_low": 240.00, "year_high": 300.00, "year_low": 150.00, "market_cap": "789B"},
-        {"ticker": "META", "name": "Meta Platforms Inc.", "last_price": 334.69, "change": 5.67, "change_pct": 1.72, "volume": 1800000, "bid": 334.60, "ask": 334.80, "day_high": 335.50, "day_low": 330.00, "year_high": 380.00, "year_low": 200.00, "market_cap": "851B"},
-        {"ticker": "NVDA", "name": "NVIDIA Corp.", "last_price": 485.09, "change": 15.23, "change_pct": 3.24, "volume": 4200000, "bid": 485.00, "ask": 485.20, "day_high": 490.00, "day_low": 480.00, "year_high": 500.00, "year_low": 300.00, "market_cap": "1.20T"},
-        {"ticker": "NFLX", "name": "Netflix Inc.", "last_price": 492.98, "change": -8.45, "change_pct": -1.68, "volume": 950000, "bid": 492.90, "ask": 493.10, "day_high": 500.00, "day_low": 490.00, "year_high": 550.00, "year_low": 400.00, "market_cap": "218B"},
-    ]
+    # Symbols behind the price grid
+    quote_symbols = symbol_catalog.filter(tag='top_quotes')
 
     # Controls Row
     quotes_df = backend.data_fetching.get_top_stocks_quotes()
@@ -423,74 +414,129 @@ with tab2:
         placeholder="AAPL, Apple...",
         key="search_control"
     )
-    if search_filter:
-        search = search_filter.lower()
-        quotes_df = quotes_df[
-            quotes_df['ticker'].str.lower().str.contains(search) |
-            quotes_df['name'].str.lower().str.contains(search)
-        ]
 
-    
+    # The grid only ever receives one page: filtering, sorting and paging happen here against
+    # an indexed table, so the payload stays the same size however many symbols there are
+    quote_table = backend.data_fetching.get_quote_table(quotes_df)
+    sort_options = {
+        "Ticker": "ticker", "Name": "name", "Last Price": "last_price",
+        "Change": "change", "% Change": "change_pct", "Volume": "volume",
+    }
+    sort_col1, sort_col2, sort_col3, sort_col4 = st.columns(4)
+    with sort_col1:
+        sort_label = st.selectbox("Sort by", list(sort_options), key="quotes_sort_by")
+        st.session_state.sort_column = sort_options[sort_label]
+    with sort_col2:
+        sort_direction = st.selectbox("Direction", ["Ascending", "Descending"], key="quotes_sort_direction")
+        st.session_state.sort_direction = "asc" if sort_direction == "Ascending" else "desc"
+    with sort_col3:
+        page_size = st.selectbox("Rows per page", [10, 25, 50, 100], index=0, key="quotes_page_size")
+    pages = quote_table.page(0, page_size, query=search_filter).pages
+    if st.session_state.get("quotes_page", 1) > pages:
+        st.session_state.quotes_page = 1
+    with sort_col4:
+        page_number = st.number_input("Page", min_value=1, max_value=pages, step=1, key="quotes_page")
+    live_refresh = st.toggle(
+        "Live refresh",
+        key="quotes_live_refresh",
+        help="Re-render only the grid every second; rows that changed since the last refresh are updated in place",
+    )
+
     # Price Grid
     st.markdown("### Price Grid")
     st.markdown("**Click on the stock to view details**")
-    # --- AG Grid setup ---
-    # Before building the grid, drop unnecessary columns for display
-    columns_to_drop = ['currency', 'bid', 'ask', 'year_high', 'year_low', 'market_cap']
-    display_df = quotes_df.drop(columns=[col for col in columns_to_drop if col in quotes_df.columns], errors='ignore')
 
-    gb = GridOptionsBuilder.from_dataframe(display_df)
-    gb.configure_pagination(paginationAutoPageSize=False, paginationPageSize=10)
-    gb.configure_default_column(editable=False, groupable=False)
-    gb.configure_selection('single', use_checkbox=False)
-    gb.configure_column(
-        "last_price",
-        header_name="Last Price",
-        type=["numericColumn"],
-        valueFormatter="`$${x.toLocaleString(undefined, {minimumFractionDigits: 2, maximumFractionDigits: 2})}`"
-    )
-    gb.configure_column(
-        "day_high",
-        header_name="Day High",
-        type=["numericColumn"],
-        valueFormatter="`$${x.toLocaleString(undefined, {minimumFractionDigits: 2, maximumFractionDigits: 2})}`"
-    )
-    gb.configure_column(
-        "day_low",
-        header_name="Day Low",
-        type=["numericColumn"],
-        valueFormatter="`$${x.toLocaleString(undefined, {minimumFractionDigits: 2, maximumFractionDigits: 2})}`"
-    )
-    gb.configure_column("change", header_name="Change", type=["numericColumn"], valueFormatter="x.toFixed(2)")
-    gb.configure_column("change_pct", header_name="% Change", type=["numericColumn"], valueFormatter="x.toFixed(2) + '%'")
-    gb.configure_column("volume", header_name="Volume", type=["numericColumn"])
-    gb.configure_column(
-        "volume",
-        header_name="Volume",
-        type=["numericColumn"],
-        valueFormatter="x.toLocaleString()"
-    )
-    gridOptions = gb.build()
-    gridOptions['enableRangeSelection'] = True
-    gridOptions['enableCellTextSelection'] = True
-    # --- AG Grid display ---
-    
-    response = AgGrid(
-        display_df,
-        gridOptions=gridOptions,
-        update_mode=GridUpdateMode.MODEL_CHANGED | GridUpdateMode.SELECTION_CHANGED,
-        allow_unsafe_jscode=True,
-        theme='streamlit',
-        fit_columns_on_grid_load=True,
-        height=400
-    )
-    selected_rows = response['selected_rows']
-    if isinstance(selected_rows, pd.DataFrame) and len(selected_rows) > 0:
-        selected_ticker = selected_rows.iloc[0]['ticker']
-        st.session_state.selected_stock = selected_ticker
-        st.session_state.show_stock_modal = True
-    else:
-        pass
+    def render_price_grid():
+        """The grid and its caption; a fragment, so live refreshes skip the rest of the app."""
+        quote_snapshot = backend.data_fetching.get_quote_snapshot()
+        snapshot = quote_snapshot.frame.drop(columns=['open'])
+        quote_page = backend.data_fetching.get_quote_table(snapshot).page(
+            page_number - 1,
+            page_size,
+            sort_by=st.session_state.sort_column,
+            ascending=st.session_state.sort_direction == "asc",
+            query=search_filter,
+        )
+        # Diff once per published snapshot, not on every rerun that reads the same one
+        if st.session_state.get('quotes_grid_version') != quote_snapshot.version:
+            previous = st.session_state.get('quotes_grid_snapshot')
+            st.session_state.quotes_grid_delta = diff_quotes(previous, snapshot) if previous is not None else None
+            st.session_state.quotes_grid_snapshot = snapshot
+            st.session_state.quotes_grid_version = quote_snapshot.version
+        caption = (
+            f"Showing {quote_page.first_row}-{quote_page.last_row} of {quote_page.total} symbols"
+            f" · quotes as of {datetime.datetime.fromtimestamp(quote_snapshot.fetched_at):%H:%M:%S} ({quote_snapshot.age:.0f}s old)"
+        )
+        delta = st.session_state.quotes_grid_delta
+        if delta is not None:
+            caption += f" · {len(delta.updated)} changed, {len(delta.added)} added, {len(delta.removed)} removed in the last refresh"
+        st.caption(caption)
+        # --- AG Grid setup ---
+        # Before building the grid, drop unnecessary columns for display
+        columns_to_drop = ['currency', 'bid', 'ask', 'year_high', 'year_low', 'market_cap']
+        display_df = quote_page.rows.drop(columns=[col for col in columns_to_drop if col in quote_page.rows.columns], errors='ignore')
+
+        gb = GridOptionsBuilder.from_dataframe(display_df)
+        # Sorting happens server-side across all rows, so header sorting (one page only) is off
+        gb.configure_default_column(editable=False, groupable=False, sortable=False)
+        gb.configure_selection('single', use_checkbox=False)
+        gb.configure_column(
+            "last_price",
+            header_name="Last Price",
+            type=["numericColumn"],
+            valueFormatter="`$${x.toLocaleString(undefined, {minimumFractionDigits: 2, maximumFractionDigits: 2})}`"
+        )
+        gb.configure_column(
+            "day_high",
+            header_name="Day High",
+            type=["numericColumn"],
+            valueFormatter="`$${x.toLocaleString(undefined, {minimumFractionDigits: 2, maximumFractionDigits: 2})}`"
+        )
+        gb.configure_column(
+            "day_low",
+            header_name="Day Low",
+            type=["numericColumn"],
+            valueFormatter="`$${x.toLocaleString(undefined, {minimumFractionDigits: 2, maximumFractionDigits: 2})}`"
+        )
+        gb.configure_column("change", header_name="Change", type=["numericColumn"], valueFormatter="x.toFixed(2)")
+        gb.configure_column("change_pct", header_name="% Change", type=["numericColumn"], valueFormatter="x.toFixed(2) + '%'")
+        gb.configure_column("volume", header_name="Volume", type=["numericColumn"])
+        gb.configure_column(
+            "volume",
+            header_name="Volume",
+            type=["numericColumn"],
+            valueFormatter="x.toLocaleString()"
+        )
+        gridOptions = gb.build()
+        gridOptions['enableRangeSelection'] = True
+        gridOptions['enableCellTextSelection'] = True
+        # Rows are identified by ticker and the component keeps a stable key, so new row data is
+        # reconciled into the existing grid as a delta: unchanged rows are left alone and only
+        # the changed cells re-render (and flash)
+        gridOptions['getRowId'] = JsCode("function(params) { return params.data.ticker; }")
+        gridOptions['enableCellChangeFlash'] = True
+        # --- AG Grid display ---
+
+        response = AgGrid(
+            display_df,
+            gridOptions=gridOptions,
+            update_mode=GridUpdateMode.MODEL_CHANGED | GridUpdateMode.SELECTION_CHANGED,
+            allow_unsafe_jscode=True,
+            theme='streamlit',
+            fit_columns_on_grid_load=True,
+            height=400,
+            key="quotes_grid",
+        )
+        selected_rows = response['selected_rows']
+        if isinstance(selected_rows, pd.DataFrame) and len(selected_rows) > 0:
+            selected_ticker = selected_rows.iloc[0]['ticker']
+            if selected_ticker != st.session_state.selected_stock or not st.session_state.show_stock_modal:
+                st.session_state.selected_stock = selected_ticker
+                st.session_state.show_stock_modal = True
+                # The detail view lives outside the fragment
+                st.rerun(scope="app")
+
+    st.fragment(render_price_grid, run_every=1 if live_refresh else None)()
         
 
     st.session_state.search_filter = search_filter
@@ -501,15 +547,32 @@ with tab2:
     # st.markdown("---")
     
     # Filter and sort data
-    filtered_quotes = sample_quotes
+    filtered_quotes = quote_symbols.records()
     if st.session_state.search_filter:
         # Use fuzzy search instead of simple contains
-        filtered_quotes = fuzzy_search(st.session_state.search_filter, sample_quotes, threshold=2)
+        filtered_quotes = fuzzy_search(
+            st.session_state.search_filter, quote_symbols.records(), threshold=2, index=quote_symbols.search_index
+        )
     
     # Show fuzzy search indicator
-    if st.session_state.search_filter and len(filtered_quotes) < len(sample_quotes):
+    if st.session_state.search_filter and len(filtered_quotes) < len(quote_symbols):
         st.caption(f"Found {len(filtered_quotes)} matches for '{st.session_state.search_filter}'")
     st.caption(f"Data source: Yahoo Finance | Last updated: {datetime.datetime.now().strftime('%Y-%m-%d %H:%M')}")    # --- Handle ticker button click ---
+    warmup = prewarmer.progress()
+    coverage = prewarmer.coverage()
+    warmup_caption = f"Cache warm-up: {coverage['ratio']:.0%} covered"
+    for kind in ("quotes", "metadata", "history"):
+        warmup_caption += f" · {kind} {coverage[kind]['warm']}/{coverage[kind]['total']}"
+    if warmup['state'] == 'running':
+        warmup_caption += f" · warming {warmup['done']}/{warmup['total']}"
+    elif warmup['finished_at']:
+        warmup_caption += (
+            f" · last run {datetime.datetime.fromtimestamp(warmup['finished_at']):%a %H:%M}: "
+            f"{warmup['fetched']} fetched, {warmup['failed']} failed of {warmup['total']}"
+        )
+    if warmup['next_run']:
+        warmup_caption += f" · next {datetime.datetime.fromtimestamp(warmup['next_run'], prewarmer.schedule.timezone):%a %H:%M %Z}"
+    st.caption(warmup_caption)
 
     # # Sorting controls
     # sort_col1, sort_col2 = st.columns(2)
@@ -749,9 +812,10 @@ with tab2:
                 )
                 interval, period = interval_map[interval_label]
                 
-                # Fetch real OHLC data from Yahoo Finance
+                # Fetch real OHLC data from Yahoo Finance (served from the local history store when possible)
+                backend.data_fetching.record_view("detail", selected_stock_data['ticker'], interval, period)
                 try:
-                    data = yf.Ticker(selected_stock_data['ticker']).history(interval=interval, period=period)
+                    data = backend.data_fetching.get_history(selected_stock_data['ticker'], interval, period)
                 except Exception as e:
                     data = None
                     st.warning(f"Error fetching data: {e}")
@@ -864,24 +928,8 @@ with tab3:
     if 'show_rsi' not in st.session_state:
         st.session_state.show_rsi = False
     
-    # Sample symbols data (in real app, this would come from API)
-    sample_symbols = [
-        {"ticker": "AAPL", "name": "Apple Inc.", "country": "USA", "asset_class": "Equity"},
-        {"ticker": "MSFT", "name": "Microsoft Corp.", "country": "USA", "asset_class": "Equity"},
-        {"ticker": "GOOGL", "name": "Alphabet Inc.", "country": "USA", "asset_class": "Equity"},
-        {"ticker": "AMZN", "name": "Amazon.com Inc.", "country": "USA", "asset_class": "Equity"},
-        {"ticker": "TSLA", "name": "Tesla Inc.", "country": "USA", "asset_class": "Equity"},
-        {"ticker": "META", "name": "Meta Platforms Inc.", "country": "USA", "asset_class": "Equity"},
-        {"ticker": "NVDA", "name": "NVIDIA Corp.", "country": "USA", "asset_class": "Equity"},
-        {"ticker": "NFLX", "name": "Netflix Inc.", "country": "USA", "asset_class": "Equity"},
-        {"ticker": "^GSPC", "name": "S&P 500 Index", "country": "USA", "asset_class": "Index"},
-        {"ticker": "^DJI", "name": "Dow Jones Industrial Average", "country": "USA", "asset_class": "Index"},
-        {"ticker": "^IXIC", "name": "NASDAQ Composite", "country": "USA", "asset_class": "Index"},
-        {"ticker": "EURUSD", "name": "Euro / US Dollar", "country": "Global", "asset_class": "Forex"},
-        {"ticker": "GBPUSD", "name": "British Pound / US Dollar", "country": "Global", "asset_class": "Forex"},
-        {"ticker": "GC=F", "name": "Gold Futures", "country": "Global", "asset_class": "Commodity"},
-        {"ticker": "BTC-USD", "name": "Bitcoin", "country": "Global", "asset_class": "Crypto"},
-    ]
+    # Chartable symbols from the shared catalog
+    chart_symbols = symbol_catalog.filter(tag='charts')
     
     # Favorites (in real app, this would come from watchlist)
     favorites = ["AAPL", "MSFT", "TSLA"]
@@ -898,15 +946,14 @@ with tab3:
         
         # Add favorites first
         for fav in favorites:
-            for symbol in sample_symbols:
-                if symbol["ticker"] == fav:
-                    symbol_options.append(f"{symbol['ticker']} - {symbol['name']}")
-                    break
+            symbol = chart_symbols.get(fav)
+            if symbol is not None:
+                symbol_options.append(f"{symbol['ticker']} - {symbol['name']}")
         
         # Add remaining symbols
-        for symbol in sample_symbols:
-            if symbol["ticker"] not in favorites:
-                symbol_options.append(f"{symbol['ticker']} - {symbol['name']}")
+        for ticker, name in zip(chart_symbols.tickers, chart_symbols.names):
+            if ticker not in favorites:
+                symbol_options.append(f"{ticker} - {name}")
         
         selected_symbol_full = st.selectbox(
             "Symbol",
@@ -922,6 +969,8 @@ with tab3:
                 st.session_state.selected_symbol = selected_symbol_full.split(" - ")[0]
         else:
             st.session_state.selected_symbol = ""
+        if st.session_state.selected_symbol:
+            backend.data_fetching.record_view("charts", st.session_state.selected_symbol)
     
     with col2:
         # Interval Picker with dynamic filtering based on date range
@@ -1196,37 +1245,29 @@ with tab3:
         
         times = pd.date_range(end=current_time, periods=periods, freq=freq)
         
-        # Generate OHLC data
-        base_price = 100.0 + np.random.randint(0, 900)  # Make base_price float
-        opens = []
-        highs = []
-        lows = []
-        closes = []
-        volumes = []
-        
-        current_price = base_price
-        for i in range(periods):
-            # Simulate price movement
-            price_change = np.random.normal(0, base_price * 0.02)
-            current_price += price_change
-            
-            # Create OHLC for this period
-            open_price = current_price
-            high_price = open_price + abs(np.random.normal(0, base_price * 0.01))
-            low_price = open_price - abs(np.random.normal(0, base_price * 0.01))
-            close_price = open_price + np.random.normal(0, base_price * 0.005)
-            
-            # Ensure high >= max(open, close) and low <= min(open, close)
-            high_price = max(high_price, open_price, close_price)
-            low_price = min(low_price, open_price, close_price)
-            
-            opens.append(open_price)
-            highs.append(high_price)
-            lows.append(low_price)
-            closes.append(close_price)
-            volumes.append(np.random.randint(100000, 1000000))
-            
-            current_price = close_price
+        # Generate OHLC data, seeded per symbol/interval/range so reruns see the same series
+        # (and the indicator cache below can hit)
+        chart_seed = backend.market_sim.seed_for(
+            st.session_state.selected_symbol,
+            st.session_state.selected_interval,
+            st.session_state.selected_date_range,
+        )
+        bars = backend.market_sim.simulate_ohlcv(periods, seed=chart_seed)
+        opens = bars['Open'].to_numpy()
+        highs = bars['High'].to_numpy()
+        lows = bars['Low'].to_numpy()
+        closes = bars['Close'].to_numpy()
+        volumes = bars['Volume'].to_numpy()
+        
+        # Indicator series are memoized on the data fingerprint and their parameters, so
+        # toggling an unrelated widget doesn't recompute them
+        indicator_cache = backend.data_fetching.get_indicator_cache()
+        data_key = (
+            st.session_state.selected_symbol,
+            st.session_state.selected_interval,
+            st.session_state.selected_date_range,
+            backend.indicator_cache.fingerprint(opens, highs, lows, closes, volumes),
+        )
         
         # Create main chart
         fig = go.Figure()
@@ -1256,7 +1297,7 @@ with tab3:
         
         # Add technical indicators
         if st.session_state.show_sma:
-            sma_values = pd.Series(closes).rolling(window=sma_period).mean()
+            sma_values = indicator_cache.get_or_compute(data_key + ('sma', sma_period), lambda: backend.indicators.sma(closes, sma_period))
             fig.add_trace(go.Scatter(
                 x=times,
                 y=sma_values,
@@ -1266,7 +1307,7 @@ with tab3:
             ))
         
         if st.session_state.show_ema:
-            ema_values = pd.Series(closes).ewm(span=ema_period).mean()
+            ema_values = indicator_cache.get_or_compute(data_key + ('ema', ema_period), lambda: backend.indicators.ema(closes, ema_period))
             fig.add_trace(go.Scatter(
                 x=times,
                 y=ema_values,
@@ -1277,15 +1318,7 @@ with tab3:
         
         if st.session_state.show_wma:
             # Calculate WMA (Weighted Moving Average)
-            wma_values = []
-            for i in range(len(closes)):
-                if i < wma_period - 1:
-                    wma_values.append(np.nan)
-                else:
-                    weights = list(range(1, wma_period + 1))
-                    weighted_sum = sum(closes[i-j] * weights[j] for j in range(wma_period))
-                    weight_sum = sum(weights)
-                    wma_values.append(weighted_sum / weight_sum)
+            wma_values = indicator_cache.get_or_compute(data_key + ('wma', wma_period), lambda: backend.indicators.wma(closes, wma_period))
             
             fig.add_trace(go.Scatter(
                 x=times,
@@ -1298,49 +1331,7 @@ with tab3:
         if st.session_state.show_hma:
             # Calculate HMA (Hull Moving Average)
             # HMA = WMA(2*WMA(n/2) - WMA(n)), where n is the period
-            half_period = hma_period // 2
-            sqrt_period = int(np.sqrt(hma_period))
-            
-            # Calculate WMA(n/2)
-            wma_half = []
-            for i in range(len(closes)):
-                if i < half_period - 1:
-                    wma_half.append(np.nan)
-                else:
-                    weights = list(range(1, half_period + 1))
-                    weighted_sum = sum(closes[i-j] * weights[j] for j in range(half_period))
-                    weight_sum = sum(weights)
-                    wma_half.append(weighted_sum / weight_sum)
-            
-            # Calculate WMA(n)
-            wma_full = []
-            for i in range(len(closes)):
-                if i < hma_period - 1:
-                    wma_full.append(np.nan)
-                else:
-                    weights = list(range(1, hma_period + 1))
-                    weighted_sum = sum(closes[i-j] * weights[j] for j in range(hma_period))
-                    weight_sum = sum(weights)
-                    wma_full.append(weighted_sum / weight_sum)
-            
-            # Calculate 2*WMA(n/2) - WMA(n)
-            raw_hma = []
-            for i in range(len(closes)):
-                if pd.isna(wma_half[i]) or pd.isna(wma_full[i]):
-                    raw_hma.append(np.nan)
-                else:
-                    raw_hma.append(2 * wma_half[i] - wma_full[i])
-            
-            # Calculate final HMA using WMA on the raw HMA values
-            hma_values = []
-            for i in range(len(raw_hma)):
-                if i < sqrt_period - 1 or pd.isna(raw_hma[i]):
-                    hma_values.append(np.nan)
-                else:
-                    weights = list(range(1, sqrt_period + 1))
-                    weighted_sum = sum(raw_hma[i-j] * weights[j] for j in range(sqrt_period))
-                    weight_sum = sum(weights)
-                    hma_values.append(weighted_sum / weight_sum)
+            hma_values = indicator_cache.get_or_compute(data_key + ('hma', hma_period), lambda: backend.indicators.hma(closes, hma_period))
             
             fig.add_trace(go.Scatter(
                 x=times,
@@ -1352,15 +1343,7 @@ with tab3:
         
         if st.session_state.show_vwap:
             # Calculate VWAP (Volume Weighted Average Price)
-            typical_prices = [(opens[i] + highs[i] + lows[i] + closes[i]) / 4 for i in range(len(opens))]
-            vwap_values = []
-            cumulative_tpv = 0  # Total Price Volume
-            cumulative_volume = 0
-            
-            for i in range(len(typical_prices)):
-                cumulative_tpv += typical_prices[i] * volumes[i]
-                cumulative_volume += volumes[i]
-                vwap_values.append(cumulative_tpv / cumulative_volume if cumulative_volume > 0 else typical_prices[i])
+            vwap_values = indicator_cache.get_or_compute(data_key + ('vwap',), lambda: backend.indicators.vwap(opens, highs, lows, closes, volumes))
             
             fig.add_trace(go.Scatter(
                 x=times,
@@ -1371,10 +1354,7 @@ with tab3:
             ))
         
         if st.session_state.show_bollinger:
-            bb_sma = pd.Series(closes).rolling(window=bb_period).mean()
-            bb_std = pd.Series(closes).rolling(window=bb_period).std()
-            bb_upper = bb_sma + (bb_std * bb_std)
-            bb_lower = bb_sma - (bb_std * bb_std)
+            bb_upper, bb_sma, bb_lower = indicator_cache.get_or_compute(data_key + ('bollinger', bb_period, bb_std), lambda: backend.indicators.bollinger(closes, bb_period, bb_std))
             
             fig.add_trace(go.Scatter(
                 x=times,
@@ -1423,11 +1403,7 @@ with tab3:
         # Add MACD subplot if enabled
         if st.session_state.show_macd:
             # Calculate MACD
-            ema_fast = pd.Series(closes).ewm(span=macd_fast).mean()
-            ema_slow = pd.Series(closes).ewm(span=macd_slow).mean()
-            macd_line = ema_fast - ema_slow
-            signal_line = macd_line.ewm(span=macd_signal).mean()
-            histogram = macd_line - signal_line
+            macd_line, signal_line, histogram = indicator_cache.get_or_compute(data_key + ('macd', macd_fast, macd_slow, macd_signal), lambda: backend.indicators.macd(closes, macd_fast, macd_slow, macd_signal))
             
             # Create MACD subplot
             fig_macd = go.Figure()
@@ -1466,10 +1442,7 @@ with tab3:
         # Add Stochastic subplot if enabled
         if st.session_state.show_stochastic:
             # Calculate Stochastic
-            lowest_low = pd.Series(lows).rolling(window=stoch_k).min()
-            highest_high = pd.Series(highs).rolling(window=stoch_k).max()
-            k_percent = 100 * ((pd.Series(closes) - lowest_low) / (highest_high - lowest_low))
-            d_percent = k_percent.rolling(window=stoch_d).mean()
+            k_percent, d_percent = indicator_cache.get_or_compute(data_key + ('stochastic', stoch_k, stoch_d), lambda: backend.indicators.stochastic(highs, lows, closes, stoch_k, stoch_d))
             
             # Create Stochastic subplot
             fig_stoch = go.Figure()
@@ -1507,9 +1480,7 @@ with tab3:
         # Add Williams %R subplot if enabled
         if st.session_state.show_williams_r:
             # Calculate Williams %R
-            highest_high = pd.Series(highs).rolling(window=williams_r_period).max()
-            lowest_low = pd.Series(lows).rolling(window=williams_r_period).min()
-            williams_r = -100 * ((highest_high - pd.Series(closes)) / (highest_high - lowest_low))
+            williams_r = indicator_cache.get_or_compute(data_key + ('williams_r', williams_r_period), lambda: backend.indicators.williams_r(highs, lows, closes, williams_r_period))
             
             # Create Williams %R subplot
             fig_williams = go.Figure()
@@ -1540,11 +1511,7 @@ with tab3:
         # Add ATR subplot if enabled
         if st.session_state.show_atr:
             # Calculate ATR (Average True Range)
-            high_low = pd.Series(highs) - pd.Series(lows)
-            high_close = abs(pd.Series(highs) - pd.Series(closes).shift(1))
-            low_close = abs(pd.Series(lows) - pd.Series(closes).shift(1))
-            true_range = pd.concat([high_low, high_close, low_close], axis=1).max(axis=1)
-            atr_values = true_range.rolling(window=atr_period).mean()
+            atr_values = indicator_cache.get_or_compute(data_key + ('atr', atr_period), lambda: backend.indicators.atr(highs, lows, closes, atr_period))
             
             # Create ATR subplot
             fig_atr = go.Figure()
@@ -1570,11 +1537,7 @@ with tab3:
         # Add RSI subplot if enabled
         if st.session_state.show_rsi:
             # Calculate RSI
-            delta = pd.Series(closes).diff()
-            gain = (delta.where(delta > 0, 0)).rolling(window=rsi_period).mean()
-            loss = (-delta.where(delta < 0, 0)).rolling(window=rsi_period).mean()
-            rs = gain / loss
-            rsi = 100 - (100 / (1 + rs))
+            rsi = indicator_cache.get_or_compute(data_key + ('rsi', rsi_period), lambda: backend.indicators.rsi(closes, rsi_period))
             
             # Create RSI subplot
             fig_rsi = go.Figure()
@@ -1651,6 +1614,14 @@ with tab3:
             else:
                 st.metric("Volume", "N/A")
         
+        cache_stats = indicator_cache.stats()
+        st.caption(
+            f"Indicator cache: {cache_stats['hits']} hits, {cache_stats['misses']} misses "
+            f"({cache_stats['hit_rate']:.0%} hit rate), {cache_stats['entries']} series, "
+            f"{cache_stats['bytes'] / 2**20:.1f} / {cache_stats['max_bytes'] / 2**20:.0f} MB, "
+            f"{cache_stats['evictions']} evictions"
+        )
+        
         # --- Time Series Decomposition ---
         st.markdown("---")
         st.markdown("### Time Series Decomposition")
@@ -1839,17 +1810,8 @@ with tab4:
     if 'selected_symbols_analytics' not in st.session_state:
         st.session_state.selected_symbols_analytics = ["AAPL", "MSFT", "GOOGL"]
     
-    # Sample symbols for analytics
-    analytics_symbols = [
-        {"ticker": "AAPL", "name": "Apple Inc.", "sector": "Technology", "market_cap": 2.89e12},
-        {"ticker": "MSFT", "name": "Microsoft Corp.", "sector": "Technology", "market_cap": 2.81e12},
-        {"ticker": "GOOGL", "name": "Alphabet Inc.", "sector": "Technology", "market_cap": 1.79e12},
-        {"ticker": "AMZN", "name": "Amazon.com Inc.", "sector": "Technology", "market_cap": 1.51e12},
-        {"ticker": "TSLA", "name": "Tesla Inc.", "sector": "Consumer Discretionary", "market_cap": 7.89e11},
-        {"ticker": "META", "name": "Meta Platforms Inc.", "sector": "Technology", "market_cap": 8.51e11},
-        {"ticker": "NVDA", "name": "NVIDIA Corp.", "sector": "Technology", "market_cap": 1.20e12},
-        {"ticker": "NFLX", "name": "Netflix Inc.", "sector": "Communication Services", "market_cap": 2.18e11},
-    ]
+    # Symbols available for analytics
+    analytics_symbols = symbol_catalog.filter(tag='analytics')
     
     # Period selector for all analytics
     st.markdown("### Analysis Period")
@@ -1877,7 +1839,7 @@ with tab4:
     
     # Symbol selector for analytics
     st.markdown("### Symbol Selection")
-    symbol_options = [s["ticker"] for s in analytics_symbols]
+    symbol_options = list(analytics_symbols.tickers)
     st.session_state.selected_symbols_analytics = st.multiselect(
         "Select symbols for analysis:",
         symbol_options,
@@ -1910,29 +1872,20 @@ with tab4:
             else:
                 periods = 30  # Default fallback
         
-        # Generate price data for all selected symbols
-        symbol_data = {}
-        for symbol in st.session_state.selected_symbols_analytics:
-            # Generate realistic price series
-            base_price = 100.0 + np.random.randint(0, 900)  # Make base_price float
-            prices = [base_price]  # Initialize with float
-            
-            for i in range(periods - 1):
-                # Simulate price movement with some correlation between symbols
-                price_change = np.random.normal(0, base_price * 0.02)
-                new_price = prices[-1] + price_change
-                prices.append(max(new_price, 1.0))  # Ensure positive prices as float
-            
-            symbol_data[symbol] = prices
+        # Generate daily bars for all selected symbols (seeded per symbol and period); the
+        # closes drive returns, the full OHLC the range-based volatility estimators
+        analytics_seed = backend.market_sim.seed_for(st.session_state.analytics_period, periods)
+        ohlc_panel = backend.market_sim.simulate_ohlc_panel(
+            st.session_state.selected_symbols_analytics, periods, seed=analytics_seed
+        )
+        price_panel = ohlc_panel['Close']
         
-        # Calculate returns
-        returns_data = {}
-        for symbol, prices in symbol_data.items():
-            returns = []
-            for i in range(1, len(prices)):
-                ret = (prices[i] - prices[i-1]) / prices[i-1]
-                returns.append(ret)
-            returns_data[symbol] = returns
+        # Calculate returns: one aligned (period x symbol) matrix, plus a per-symbol view of it
+        returns_panel = backend.analytics.returns_frame(price_panel)
+        returns_data = {symbol: returns_panel[symbol].to_numpy() for symbol in returns_panel.columns}
+        # Running mean/std/skew/extremes/drawdown for every symbol in one linear pass; the last
+        # row is the full-period value
+        return_stats = backend.online_stats.expanding_stats(returns_panel)
         
         # 1. Returns Distribution
         st.markdown("---")
@@ -1974,9 +1927,8 @@ with tab4:
             # First column
             if row * 2 < num_symbols:
                 symbol1 = st.session_state.selected_symbols_analytics[row * 2]
-                returns1 = returns_data[symbol1]
-                mean_ret1 = np.mean(returns1)
-                std_ret1 = np.std(returns1)
+                mean_ret1 = return_stats['mean'][symbol1].iloc[-1]
+                std_ret1 = return_stats['std'][symbol1].iloc[-1]
                 
                 with col1:
                     st.write(f"**{symbol1}:**")
@@ -1986,9 +1938,8 @@ with tab4:
             # Second column
             if row * 2 + 1 < num_symbols:
                 symbol2 = st.session_state.selected_symbols_analytics[row * 2 + 1]
-                returns2 = returns_data[symbol2]
-                mean_ret2 = np.mean(returns2)
-                std_ret2 = np.std(returns2)
+                mean_ret2 = return_stats['mean'][symbol2].iloc[-1]
+                std_ret2 = return_stats['std'][symbol2].iloc[-1]
                 
                 with col2:
                     st.write(f"**{symbol2}:**")
@@ -2013,11 +1964,15 @@ with tab4:
             
             # Calculate correlation matrix
             if len(st.session_state.selected_symbols_analytics) > 1:
-                # Create DataFrame with returns
-                returns_df = pd.DataFrame(returns_data)
-                
-                # Calculate correlation matrix
-                corr_matrix = returns_df.corr()
+                # One rolling engine per returns panel, kept across reruns: moving the slider
+                # only adds or drops the periods between the old and the new lookback
+                panel_key = (tuple(returns_panel.columns), analytics_seed, periods)
+                if st.session_state.get('correlation_engine_key') != panel_key:
+                    st.session_state.correlation_engine = backend.correlation.RollingCorrelation(returns_panel)
+                    st.session_state.correlation_engine_key = panel_key
+                correlation_engine = st.session_state.correlation_engine
+                lookback = min(st.session_state.correlation_lookback, len(returns_panel))
+                corr_matrix = correlation_engine.correlation(lookback)
                 
                 # Create heatmap
                 fig_corr = go.Figure(data=go.Heatmap(
@@ -2033,12 +1988,36 @@ with tab4:
                 ))
                 
                 fig_corr.update_layout(
-                    title=f"Correlation Matrix ({st.session_state.correlation_lookback} days)",
+                    title=f"Correlation Matrix ({lookback} days)",
                     height=400,
                     template="plotly_white"
                 )
                 
                 st.plotly_chart(fig_corr, use_container_width=True)
+                if lookback < st.session_state.correlation_lookback:
+                    st.caption(f"The selected period has {len(returns_panel)} days of returns, so all of them are used.")
+                
+                # How the correlation of one pair moved over time, for the same lookback
+                pair_options = [
+                    (a, b) for position, a in enumerate(returns_panel.columns) for b in returns_panel.columns[position + 1:]
+                ]
+                pair = st.selectbox(
+                    "Rolling correlation pair:",
+                    pair_options,
+                    format_func=lambda pair: f"{pair[0]} / {pair[1]}",
+                    key="correlation_pair_selector"
+                )
+                pair_series = correlation_engine.pair_series(pair[0], pair[1], lookback).dropna()
+                fig_pair = go.Figure(go.Scatter(x=pair_series.index, y=pair_series.values, mode='lines', name=pair_series.name))
+                fig_pair.update_layout(
+                    title=f"{pair[0]} / {pair[1]} Rolling Correlation ({lookback}-day window)",
+                    xaxis_title="Time",
+                    yaxis_title="Correlation",
+                    yaxis_range=[-1, 1],
+                    height=300,
+                    template="plotly_white"
+                )
+                st.plotly_chart(fig_pair, use_container_width=True)
             else:
                 st.info("Select at least 2 symbols to view correlation matrix.")
         
@@ -2092,12 +2071,11 @@ with tab4:
             
             for symbol in st.session_state.selected_symbols_analytics:
                 # Get symbol info
-                symbol_info = next(s for s in analytics_symbols if s["ticker"] == symbol)
+                symbol_info = analytics_symbols.get(symbol)
                 
                 # Calculate metrics
-                returns = returns_data[symbol]
-                mean_return = np.mean(returns)
-                volatility = np.std(returns)
+                mean_return = return_stats['mean'][symbol].iloc[-1]
+                volatility = return_stats['std'][symbol].iloc[-1]
                 volume_change = np.random.normal(0, 0.1)  # Simulated volume change
                 market_cap = symbol_info["market_cap"]
                 beta = 0.5 + np.random.random()  # Simulated beta
@@ -2252,49 +2230,51 @@ with tab4:
                 key="var_confidence_selector"
             )
         
+        # Every metric below is computed once for the whole panel; the display only reads it
+        risk_table = backend.risk.risk_metrics(returns_panel, st.session_state.var_confidence)
+        
         # Rolling volatility chart taking full width
+        volatility_model = st.selectbox(
+            "Volatility estimator:",
+            list(backend.volatility.MODELS),
+            index=0,
+            key="volatility_model_selector",
+            help="Range-based estimators (Parkinson, Garman-Klass, Rogers-Satchell, Yang-Zhang) use each "
+                 "bar's open, high and low as well as its close, so they need far fewer bars for the same "
+                 "accuracy. Only Yang-Zhang and the close-based ones include overnight gaps."
+        )
         fig_volatility = go.Figure()
         
-        for symbol in st.session_state.selected_symbols_analytics:
-            returns = returns_data[symbol]
-            
-            # Calculate rolling volatility
-            rolling_vol = []
-            
-            # Ensure window size doesn't exceed available data
-            actual_window = min(st.session_state.volatility_window, len(returns))
-            
-            if actual_window < len(returns):
-                for i in range(len(returns) - actual_window + 1):
-                    window_returns = returns[i:i + actual_window]
-                    vol = np.std(window_returns)
-                    rolling_vol.append(vol)
-                
-                # Create time axis for rolling volatility
-                vol_times = list(range(len(rolling_vol)))
-                
+        # Ensure window size doesn't exceed available data
+        actual_window = min(st.session_state.volatility_window, len(returns_panel))
+        rolling_vol_panel = backend.volatility.rolling_volatility(
+            ohlc_panel, actual_window, backend.volatility.MODELS[volatility_model]
+        )
+        
+        for symbol in returns_panel.columns:
+            rolling_vol = rolling_vol_panel[symbol].dropna()
+            if len(rolling_vol) > 1:
                 fig_volatility.add_trace(go.Scatter(
-                    x=vol_times,
+                    x=rolling_vol.index,
                     y=rolling_vol,
                     mode='lines',
                     name=f"{symbol} Volatility",
                     line=dict(width=2)
                 ))
             else:
-                # If window size >= data points, show single volatility point
-                vol = np.std(returns)
+                # If the window covers all the data, show a single volatility point
                 fig_volatility.add_trace(go.Scatter(
-                    x=[0],
-                    y=[vol],
+                    x=[len(price_panel) - 1],
+                    y=[rolling_vol.iloc[-1] if len(rolling_vol) else risk_table.loc[symbol, 'volatility']],
                     mode='markers',
                     name=f"{symbol} Volatility",
                     marker=dict(size=10)
                 ))
         
         fig_volatility.update_layout(
-            title=f"Rolling Volatility ({st.session_state.volatility_window}-day window)",
-            xaxis_title="Time",
-            yaxis_title="Volatility",
+            title=f"Rolling Volatility: {volatility_model} ({st.session_state.volatility_window}-day window)",
+            xaxis_title="Time (day)",
+            yaxis_title="Volatility (per day)",
             height=400,
             template="plotly_white"
         )
@@ -2304,80 +2284,93 @@ with tab4:
         # Risk metrics in 2-column grid underneath
         st.markdown("**Risk Metrics**")
         
-        # Calculate and display VaR/CVaR
-        risk_metrics = []
-        for symbol in st.session_state.selected_symbols_analytics:
-            returns = returns_data[symbol]
-            
-            # Calculate VaR and CVaR
-            sorted_returns = np.sort(returns)
-            var_index = int((1 - st.session_state.var_confidence) * len(sorted_returns))
-            var = sorted_returns[var_index]
-            cvar = np.mean(sorted_returns[:var_index + 1])
-            volatility = np.std(returns)
-            
-            risk_metrics.append({
-                "Symbol": symbol,
-                "Volatility": f"{volatility:.4f}",
-                "VaR": f"{var:.4f}",
-                "CVaR": f"{cvar:.4f}"
-            })
-        
-        # Calculate how many rows we need
+        # Two-column grid of the per-symbol figures
         num_symbols = len(st.session_state.selected_symbols_analytics)
         num_rows = (num_symbols + 1) // 2  # Round up division
         
         for row in range(num_rows):
-            col1, col2 = st.columns(2)
-            
-            # First column
-            if row * 2 < num_symbols:
-                symbol1 = st.session_state.selected_symbols_analytics[row * 2]
-                returns1 = returns_data[symbol1]
-                sorted_returns1 = np.sort(returns1)
-                var_index1 = int((1 - st.session_state.var_confidence) * len(sorted_returns1))
-                var1 = sorted_returns1[var_index1]
-                cvar1 = np.mean(sorted_returns1[:var_index1 + 1])
-                volatility1 = np.std(returns1)
-                
-                with col1:
-                    st.write(f"**{symbol1}:**")
-                    st.write(f"σ: {volatility1:.4f}")
-                    st.write(f"VaR: {var1:.4f}")
-                    st.write(f"CVaR: {cvar1:.4f}")
-            
-            # Second column
-            if row * 2 + 1 < num_symbols:
-                symbol2 = st.session_state.selected_symbols_analytics[row * 2 + 1]
-                returns2 = returns_data[symbol2]
-                sorted_returns2 = np.sort(returns2)
-                var_index2 = int((1 - st.session_state.var_confidence) * len(sorted_returns2))
-                var2 = sorted_returns2[var_index2]
-                cvar2 = np.mean(sorted_returns2[:var_index2 + 1])
-                volatility2 = np.std(returns2)
-                
-                with col2:
-                    st.write(f"**{symbol2}:**")
-                    st.write(f"σ: {volatility2:.4f}")
-                    st.write(f"VaR: {var2:.4f}")
-                    st.write(f"CVaR: {cvar2:.4f}")
+            for col, position in zip(st.columns(2), (row * 2, row * 2 + 1)):
+                if position >= num_symbols:
+                    continue
+                symbol = st.session_state.selected_symbols_analytics[position]
+                metrics = risk_table.loc[symbol]
+                with col:
+                    st.write(f"**{symbol}:**")
+                    st.write(f"σ: {metrics['volatility']:.4f}")
+                    st.write(f"VaR: {metrics['var_historical']:.4f}")
+                    st.write(f"CVaR: {metrics['cvar_historical']:.4f}")
         
         # Risk Dashboard Summary
         st.markdown("### Risk Dashboard Summary")
         
-        if risk_metrics:
+        if not risk_table.empty:
             # Create summary table
-            risk_df = pd.DataFrame(risk_metrics)
+            risk_df = risk_table.rename(columns={
+                'volatility': "Volatility", 'var_historical': "VaR", 'cvar_historical': "CVaR",
+                'var_parametric': "VaR (normal)", 'var_cornish_fisher': "VaR (Cornish-Fisher)",
+                'max_drawdown': "Max Drawdown", 'skew': "Skew", 'kurtosis': "Excess Kurtosis",
+            })[["Volatility", "VaR", "CVaR", "VaR (normal)", "VaR (Cornish-Fisher)", "Max Drawdown", "Skew", "Excess Kurtosis"]]
             st.dataframe(
-                risk_df,
+                risk_df.rename_axis("Symbol").reset_index(),
                 use_container_width=True,
-                hide_index=True
+                hide_index=True,
+                column_config={column: st.column_config.NumberColumn(format="%.4f") for column in risk_df.columns},
             )
             
             # Export risk metrics
             if st.button("Export Risk Metrics", use_container_width=True):
                 st.success("(In real app, this would download a CSV file)")
         
+        # --- Monte Carlo VaR ---
+        st.markdown("### Monte Carlo VaR (Equal-Weight Portfolio)")
+        st.caption(
+            "Simulates correlated daily returns fitted to the selected symbols (Cholesky of their covariance), "
+            "holds the portfolio over the horizon and reads VaR/CVaR off the simulated P&L."
+        )
+        mc_col1, mc_col2, mc_col3 = st.columns(3)
+        with mc_col1:
+            mc_paths = st.selectbox("Paths:", [10_000, 50_000, 100_000, 250_000], index=2, format_func="{:,}".format, key="mc_paths")
+        with mc_col2:
+            mc_horizon = st.slider("Horizon (days):", min_value=1, max_value=20, value=10, key="mc_horizon")
+        with mc_col3:
+            mc_distribution = st.selectbox("Return distribution:", ["Normal", "Student-t (fat tails)"], key="mc_distribution")
+        
+        mc_result = backend.data_fetching.get_monte_carlo_risk(
+            returns_panel, mc_paths, mc_horizon, st.session_state.var_confidence,
+            dof=5 if mc_distribution.startswith("Student") else None,
+        )
+        mc_metric1, mc_metric2, mc_metric3 = st.columns(3)
+        mc_metric1.metric(f"{mc_horizon}-day VaR ({st.session_state.var_confidence:.0%})", f"{mc_result.var:.2%}")
+        mc_metric2.metric(f"{mc_horizon}-day CVaR", f"{mc_result.cvar:.2%}")
+        mc_metric3.metric("1-day historical VaR (avg)", f"{risk_table['var_historical'].mean():.2%}")
+        st.caption(
+            f"VaR 95% interval {mc_result.var_interval[0]:.2%} to {mc_result.var_interval[1]:.2%} "
+            f"from {mc_result.shards} independent shards · {mc_paths:,} paths in {mc_result.seconds:.2f} s"
+        )
+        
+        # Fan chart: P&L percentiles after each day of the horizon
+        fig_mc = go.Figure()
+        band_pairs = [(0.01, 0.99), (0.05, 0.95), (0.25, 0.75)]
+        for low, high in band_pairs:
+            fig_mc.add_trace(go.Scatter(
+                x=list(mc_result.bands.index) + list(mc_result.bands.index[::-1]),
+                y=list(mc_result.bands[high]) + list(mc_result.bands[low][::-1]),
+                fill='toself',
+                fillcolor='rgba(31, 119, 180, 0.15)',
+                line=dict(width=0),
+                name=f"{low:.0%}-{high:.0%}",
+            ))
+        fig_mc.add_trace(go.Scatter(x=mc_result.bands.index, y=mc_result.bands[0.5], mode='lines', name="Median", line=dict(width=2)))
+        fig_mc.update_layout(
+            title="Simulated Portfolio P&L Bands",
+            xaxis_title="Day",
+            yaxis_title="P&L (fraction of portfolio)",
+            yaxis_tickformat=".1%",
+            height=400,
+            template="plotly_white"
+        )
+        st.plotly_chart(fig_mc, use_container_width=True)
+        
         # --- Small Multiples ---
         st.markdown("---")
         st.markdown("### Small Multiples: Returns by Symbol")
@@ -2410,14 +2403,14 @@ with tab4:
                 row = idx // ncols + 1
                 col = idx % ncols + 1
                 # Get symbol info
-                symbol_info = next((s for s in analytics_symbols if s["ticker"] == symbol), None)
+                symbol_info = analytics_symbols.get(symbol)
                 # Get returns
                 returns = returns_data[symbol]
                 # Select y values based on metric
                 if small_multiples_metric == "Returns":
                     y_vals = returns
                 elif small_multiples_metric == "Volatility":
-                    y_vals = [np.std(returns[:i+1]) if i > 0 else 0 for i in range(len(returns))]
+                    y_vals = return_stats['std'][symbol].to_numpy()
                 elif small_multiples_metric == "Volume Change":
                     y_vals = [np.random.normal(0, 0.1) for _ in range(len(returns))]  # Simulated
                 else:
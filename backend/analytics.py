@@ -0,0 +1,47 @@
+# backend/analytics.py
+"""
+Return, correlation, volatility and VaR calculations behind the Analytics tab, kept free of
+Streamlit so the benchmark suite can time them headless. Returns are per-symbol arrays of
+simple period returns.
+"""
+import numpy as np
+import pandas as pd
+
+from backend import online_stats
+
+
+def returns_frame(prices):
+    """Simple returns from a price panel (one column per symbol), aligned on the price index."""
+    return prices.pct_change().iloc[1:]
+
+
+def returns_by_symbol(prices):
+    """Simple returns from a price panel (one column per symbol) as {symbol: ndarray}."""
+    returns = returns_frame(prices)
+    return {symbol: returns[symbol].to_numpy() for symbol in returns.columns}
+
+
+def correlation_matrix(returns_data):
+    """Pearson correlation of the per-symbol returns over the whole window."""
+    return pd.DataFrame(returns_data).corr()
+
+
+def rolling_volatility(returns, window):
+    """
+    Population standard deviation of each full `window`-length slice, along the first axis
+    (so a returns matrix gives one column per symbol), from a single sliding Welford pass
+    (see backend.online_stats).
+    """
+    return online_stats.rolling_moments(returns, window, skew=False)['std']
+
+
+def expanding_volatility(returns):
+    """Standard deviation of returns[:i + 1] for every i (0 for the first point), in one pass."""
+    return online_stats.expanding_stats(np.asarray(returns, dtype=float))['std']
+
+
+def historical_var_cvar(returns, confidence):
+    """Historical VaR and CVaR (expected shortfall) at `confidence`, as returns (negative = loss)."""
+    sorted_returns = np.sort(returns)
+    var_index = int((1 - confidence) * len(sorted_returns))
+    return sorted_returns[var_index], np.mean(sorted_returns[:var_index + 1])
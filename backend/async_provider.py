@@ -0,0 +1,180 @@
+# backend/async_provider.py
+"""
+Async data-provider interface, a Yahoo Finance implementation and a blocking facade for
+the Streamlit script.
+
+AsyncProvider coroutines can be gathered on one event loop, so a rerun that needs index
+quotes, exchange rates and metadata pays for one round trip instead of one per request.
+yfinance itself is blocking, so YahooAsyncProvider (a ThreadedProvider) runs each provider
+call on a bounded thread pool and awaits it; the calls still overlap, and the interface
+stays the same for a native async transport. Other providers live in backend.providers.
+SyncProvider owns a background event loop and exposes the same methods as plain
+functions, so it can be called from the script thread or any other.
+"""
+import asyncio
+import functools
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import yfinance as yf
+
+from backend.history_store import fetch_history
+from backend.metadata_fetcher import fetch_metadata_concurrently, fetch_ticker_info
+from backend.quote_snapshot import download_bars, fetch_quote_metadata, fetch_quote_snapshot
+
+
+def fetch_exchange_rate(base, quote="USD"):
+    """Latest `base`/`quote` rate and its % change against the previous daily close."""
+    closes = yf.Ticker(f"{base}{quote}=X").history(period="5d", interval="1d")['Close'].dropna()
+    if closes.empty:
+        raise ValueError(f"no rate for {base}/{quote}")
+    previous = closes.iloc[-2] if len(closes) > 1 else closes.iloc[-1]
+    return {'rate': float(closes.iloc[-1]), 'change_pct': float((closes.iloc[-1] / previous - 1) * 100)}
+
+
+class AsyncProvider:
+    """Interface for market data providers; every method is a coroutine."""
+
+    async def quote_snapshot(self, tickers, metadata_cache=None):
+        """Quotes frame (QUOTE_COLUMNS) for `tickers`."""
+        raise NotImplementedError
+
+    async def metadata(self, tickers):
+        """{ticker: {field: value}} for the tickers the provider knows; others are left out."""
+        raise NotImplementedError
+
+    async def history(self, symbol, interval, period=None, start=None):
+        """OHLCV bars for `symbol` over `period`, or from `start`."""
+        raise NotImplementedError
+
+    async def exchange_rate(self, base, quote="USD"):
+        """{'rate': float, 'change_pct': float} for `base`/`quote`."""
+        raise NotImplementedError
+
+    async def exchange_rates(self, bases, quote="USD"):
+        """exchange_rate for each base currency, concurrently; failed ones are left out."""
+        bases = list(dict.fromkeys(bases))
+        results = await asyncio.gather(*(self.exchange_rate(base, quote) for base in bases), return_exceptions=True)
+        return {base: result for base, result in zip(bases, results) if not isinstance(result, BaseException)}
+
+
+class ThreadedProvider(AsyncProvider):
+    """
+    Base for providers whose client library is blocking: each call runs on a bounded thread
+    pool and is awaited, so calls still overlap on the loop. At most `max_concurrency` run
+    at once and each is given up on after `timeout` seconds.
+    """
+
+    def __init__(self, max_concurrency=32, timeout=10.0):
+        self.timeout = timeout
+        self.executor = ThreadPoolExecutor(max_workers=max_concurrency, thread_name_prefix="provider")
+
+    async def _call(self, fn, *args, **kwargs):
+        return await self._call_within(self.timeout, fn, *args, **kwargs)
+
+    async def _call_within(self, timeout, fn, *args, **kwargs):
+        loop = asyncio.get_running_loop()
+        call = loop.run_in_executor(self.executor, functools.partial(fn, *args, **kwargs))
+        return await asyncio.wait_for(call, timeout)
+
+
+class YahooAsyncProvider(ThreadedProvider):
+    """
+    Yahoo Finance behind the async interface. The blocking functions are injectable, which
+    the benchmarks use to stand in for the network. `retries` and `backoff` apply to the
+    per-ticker metadata fallback when the batched quote request fails, and the whole fallback
+    stops after `fallback_timeout` seconds (default two timeouts) however many tickers it has.
+    """
+
+    def __init__(self, max_concurrency=32, timeout=10.0, download=download_bars, fetch_quotes=fetch_quote_metadata,
+                 fetch_info=fetch_ticker_info, fetch_bars=fetch_history, fetch_rate=fetch_exchange_rate,
+                 retries=2, backoff=0.25, fallback_workers=8, fallback_timeout=None):
+        super().__init__(max_concurrency, timeout)
+        self.retries = retries
+        self.backoff = backoff
+        self.fallback_workers = fallback_workers
+        self.fallback_timeout = 2 * timeout if fallback_timeout is None else fallback_timeout
+        self.download = download
+        self.fetch_quotes = fetch_quotes
+        self.fetch_info = fetch_info
+        self.fetch_bars = fetch_bars
+        self.fetch_rate = fetch_rate
+
+    async def quote_snapshot(self, tickers, metadata_cache=None):
+        tickers = list(tickers)
+        # The bar download and the batched quote request don't depend on each other
+        bars, records = await asyncio.gather(
+            self._call(self.download, tickers), self._call(self.fetch_quotes, tickers), return_exceptions=True
+        )
+        bars = None if isinstance(bars, BaseException) else bars
+        records = [] if isinstance(records, BaseException) else records
+        fetch_missing = functools.partial(
+            fetch_metadata_concurrently, fetch_one=self.fetch_info, max_workers=self.fallback_workers,
+            timeout=self.timeout, retries=self.retries, backoff=self.backoff, total_timeout=self.fallback_timeout,
+        )
+        # Cache lookups, per-ticker fallbacks and frame assembly are the blocking path's own.
+        # The fallback stops by itself after fallback_timeout and keeps the rows it has, so
+        # one more timeout covers assembly; the wait doesn't grow with the ticker count
+        return await self._call_within(
+            self.fallback_timeout + self.timeout,
+            fetch_quote_snapshot, tickers, download=lambda _: bars, fetch_metadata=lambda _: records,
+            fetch_missing=fetch_missing, metadata_cache=metadata_cache,
+        )
+
+    async def metadata(self, tickers):
+        tickers = list(dict.fromkeys(tickers))
+        results = await asyncio.gather(*(self._call(self.fetch_info, ticker) for ticker in tickers), return_exceptions=True)
+        return {ticker: fields for ticker, fields in zip(tickers, results) if isinstance(fields, dict) and fields}
+
+    async def history(self, symbol, interval, period=None, start=None):
+        return await self._call(self.fetch_bars, symbol, interval, period=period, start=start)
+
+    async def exchange_rate(self, base, quote="USD"):
+        if base == quote:
+            return {'rate': 1.0, 'change_pct': 0.0}
+        return await self._call(self.fetch_rate, base, quote)
+
+
+class SyncProvider:
+    """
+    Blocking facade over an AsyncProvider. Coroutines run on one event loop in a daemon
+    thread, so calls from different sessions share the loop and the provider's limits.
+    """
+
+    def __init__(self, provider):
+        self.provider = provider
+        self.loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self.loop.run_forever, name="provider-loop", daemon=True)
+        self._thread.start()
+
+    def run(self, coroutine, timeout=None):
+        """Runs `coroutine` on the provider loop and returns its result."""
+        return asyncio.run_coroutine_threadsafe(coroutine, self.loop).result(timeout)
+
+    def gather(self, *coroutines, return_exceptions=False, timeout=None):
+        """Runs the coroutines concurrently; results come back in the same order."""
+        async def gather_all():
+            return await asyncio.gather(*coroutines, return_exceptions=return_exceptions)
+        return self.run(gather_all(), timeout)
+
+    def quote_snapshot(self, tickers, metadata_cache=None):
+        return self.run(self.provider.quote_snapshot(tickers, metadata_cache=metadata_cache))
+
+    def metadata(self, tickers):
+        return self.run(self.provider.metadata(tickers))
+
+    def history(self, symbol, interval, period=None, start=None):
+        return self.run(self.provider.history(symbol, interval, period=period, start=start))
+
+    def exchange_rate(self, base, quote="USD"):
+        return self.run(self.provider.exchange_rate(base, quote))
+
+    def exchange_rates(self, bases, quote="USD"):
+        return self.run(self.provider.exchange_rates(bases, quote))
+
+    def close(self):
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self._thread.join()
+        executor = getattr(self.provider, 'executor', None)
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
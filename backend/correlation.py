@@ -0,0 +1,153 @@
+# backend/correlation.py
+"""
+Rolling covariance and correlation over a returns panel (rows are periods, columns are
+symbols) from windowed sufficient statistics: per-pair observation counts, sums, sums of
+squares and cross-products. Moving the window adds the rows that enter it and subtracts
+the rows that leave (a rank-k update, O(k * N^2)), so changing the lookback by k periods
+never rescans the rows the old and new windows share.
+
+    engine = RollingCorrelation(returns)
+    engine.correlation(60)              # last 60 periods
+    engine.correlation(90)              # adds 30 rows to the same statistics
+    engine.pair_series("AAPL", "MSFT", 60)
+
+Missing returns (NaN) are handled pairwise, like DataFrame.corr(): each pair uses the rows
+where both symbols have a return.
+"""
+import numpy as np
+import pandas as pd
+
+
+class RollingCorrelation:
+    """
+    Windowed sufficient statistics over `returns` (a DataFrame or 2-D array). The current
+    window is [start, end); correlation()/covariance() slide it to the requested lookback.
+    After `refresh_after` rows of incremental updates the statistics are rebuilt from the
+    window itself, so rounding from long chains of additions and subtractions can't build up.
+    """
+
+    def __init__(self, returns, refresh_after=None):
+        if isinstance(returns, pd.DataFrame):
+            self.index, self.columns = returns.index, returns.columns
+            values = returns.to_numpy(dtype=float)
+        else:
+            values = np.asarray(returns, dtype=float)
+            self.index, self.columns = pd.RangeIndex(len(values)), pd.RangeIndex(values.shape[1])
+        finite = np.isfinite(values)
+        # Correlation and covariance don't change under a shift; centering on the panel means
+        # keeps the sums small, so subtracting them loses little precision
+        with np.errstate(invalid='ignore'):
+            center = np.nanmean(np.where(finite.any(axis=0), values, 0.0), axis=0)
+        self.values = np.where(finite, values - center, 0.0)
+        self.mask = finite.astype(float)
+        self.complete = bool(finite.all())
+        self.refresh_after = refresh_after or max(len(values), 1)
+        self.start = self.end = 0
+        self.updated_rows = 0
+        n = self.values.shape[1]
+        self._xy = np.zeros((n, n))      # sum of x_i * x_j
+        if self.complete:
+            self._count = 0
+            self._sum = np.zeros(n)
+            self._squares = np.zeros(n)
+        else:
+            self._count = np.zeros((n, n))    # rows where both i and j are present
+            self._sum = np.zeros((n, n))      # sum of x_i over those rows
+            self._squares = np.zeros((n, n))  # sum of x_i^2 over those rows
+
+    def __len__(self):
+        return len(self.values)
+
+    def _apply(self, start, end, sign):
+        """Adds (sign=1) or removes (sign=-1) rows [start, end) from the statistics."""
+        if end <= start:
+            return
+        x = self.values[start:end]
+        self._xy += sign * (x.T @ x)
+        if self.complete:
+            self._count += sign * (end - start)
+            self._sum += sign * x.sum(axis=0)
+            self._squares += sign * np.einsum('ij,ij->j', x, x)
+        else:
+            m = self.mask[start:end]
+            self._count += sign * (m.T @ m)
+            self._sum += sign * (x.T @ m)
+            self._squares += sign * ((x * x).T @ m)
+        self.updated_rows += end - start
+
+    def move(self, start, end):
+        """Slides the window to rows [start, end), touching only the rows that differ."""
+        start, end = max(0, start), min(len(self), end)
+        changed = abs(start - self.start) + abs(end - self.end)
+        if changed >= end - start or self.updated_rows + changed > self.refresh_after or start >= self.end or end <= self.start:
+            # Rebuilding is no dearer than updating, or it's time to drop accumulated rounding
+            self._xy[:] = 0
+            self._count = self._count * 0
+            self._sum[:] = 0
+            self._squares[:] = 0
+            self.updated_rows = 0
+            self._apply(start, end, 1)
+        else:
+            self._apply(self.start, start, -1) if start > self.start else self._apply(start, self.start, 1)
+            self._apply(end, self.end, -1) if end < self.end else self._apply(self.end, end, 1)
+        self.start, self.end = start, end
+        return self
+
+    def window(self, lookback, end=None):
+        """Slides the window to the `lookback` periods ending before row `end` (default: the last)."""
+        end = len(self) if end is None else end
+        return self.move(end - lookback, end)
+
+    def _moments(self):
+        """(count, covariance numerator, variance numerators for rows, for columns) of the window."""
+        if self.complete:
+            count = float(self._count)
+            co = count * self._xy - np.outer(self._sum, self._sum)
+            var = count * self._squares - self._sum * self._sum
+            return count, co, var[:, None], var[None, :]
+        count = self._count
+        co = count * self._xy - self._sum * self._sum.T
+        var = count * self._squares - self._sum * self._sum
+        return count, co, var, var.T
+
+    def covariance(self, lookback=None, end=None):
+        """Sample covariance (ddof=1, like DataFrame.cov) over the window."""
+        if lookback is not None:
+            self.window(lookback, end)
+        count, co, _, _ = self._moments()
+        with np.errstate(divide='ignore', invalid='ignore'):
+            cov = co / (count * (count - 1))
+        cov = np.where(np.asarray(count) > 1, cov, np.nan)
+        return pd.DataFrame(cov, index=self.columns, columns=self.columns)
+
+    def correlation(self, lookback=None, end=None):
+        """Pearson correlation over the window; NaN where a pair has under two rows or no variance."""
+        if lookback is not None:
+            self.window(lookback, end)
+        count, co, var_rows, var_columns = self._moments()
+        with np.errstate(divide='ignore', invalid='ignore'):
+            corr = co / np.sqrt(var_rows * var_columns)
+        valid = (np.asarray(count) > 1) & (var_rows > 0) & (var_columns > 0)
+        corr = np.where(valid, np.clip(corr, -1.0, 1.0), np.nan)
+        np.fill_diagonal(corr, np.where(np.diag(valid), 1.0, np.nan))
+        return pd.DataFrame(corr, index=self.columns, columns=self.columns)
+
+    def pair_series(self, a, b, lookback, min_periods=None):
+        """
+        Correlation of symbols `a` and `b` over the `lookback` periods ending at every row,
+        from running sums of the pair's five statistics (O(T), independent of the window).
+        Rows with fewer than `min_periods` (default `lookback`) joint observations are NaN.
+        """
+        i, j = self.columns.get_loc(a), self.columns.get_loc(b)
+        both = self.mask[:, i] * self.mask[:, j]
+        x, y = self.values[:, i] * both, self.values[:, j] * both
+        stats = np.column_stack([both, x, y, x * x, y * y, x * y])
+        running = np.vstack([np.zeros(6), np.cumsum(stats, axis=0)])
+        window = running[lookback:] - running[:-lookback] if lookback <= len(self) else np.empty((0, 6))
+        n, sx, sy, sxx, syy, sxy = window.T
+        with np.errstate(divide='ignore', invalid='ignore'):
+            corr = (n * sxy - sx * sy) / np.sqrt((n * sxx - sx * sx) * (n * syy - sy * sy))
+        corr = np.where(n >= (lookback if min_periods is None else min_periods), np.clip(corr, -1.0, 1.0), np.nan)
+        series = np.full(len(self), np.nan)
+        series[lookback - 1:] = corr
+        return pd.Series(series, index=self.index, name=f"{a}/{b}")
@@ -1,92 +1,187 @@
 # backend/data_fetching.py
-import requests
-import yfinance as yf
+import os
 import pandas as pd
 import streamlit as st
+from backend.async_provider import SyncProvider
+from backend.history_store import BAR_COLUMNS, HistoryStore
+from backend.indicator_cache import IndicatorCache
+from backend.metadata_cache import DEFAULT_SEED_PATH, MetadataCache
+from backend.monte_carlo import INLINE_WORK, process_pool, simulate_portfolio
+from backend.prewarm import PREWARM_ENABLED, Prewarmer, UsageStats
+from backend.providers import provider_from_env
+from backend.quote_hub import QuoteHub
+from backend.quote_table import QuoteTable
+from backend.single_flight import StaleWhileRevalidate
+from backend.symbol_catalog import SymbolCatalog
+from backend.twelve_data import TwelveDataClient
 
 def fetch_quotes(symbols, api_key):
-    url = "https://api.12data.com/quote"
-    params = {
-        "symbol": ",".join(symbols),
-        "apikey": api_key
-    }
-    response = requests.get(url, params=params)
-    data = response.json()
-    # Parse and return in your app's expected format
-    return data
-
-@st.cache_data(show_spinner=False)
+    """
+    Quotes frame (QUOTE_COLUMNS) from Twelve Data. Identical concurrent requests share one
+    call and an expired answer is served while a single background request refreshes it
+    (see get_quote_requests).
+    """
+    client = get_twelve_data_client(api_key)
+    return get_quote_requests().get((tuple(symbols), api_key), lambda: client.quotes(symbols))
+
+@st.cache_resource(show_spinner=False)
+def get_twelve_data_client(api_key):
+    """Process-wide Twelve Data client per API key: pooled keep-alive session and credit limiter."""
+    return TwelveDataClient(api_key)
+
+@st.cache_resource(show_spinner=False)
+def get_metadata_cache():
+    """
+    Process-wide metadata cache (memory LRU in front of a SQLite file that survives restarts).
+    Pre-warmed from the seed file on first use, so a fresh deploy needs no metadata requests.
+    """
+    cache = MetadataCache()
+    if os.path.exists(DEFAULT_SEED_PATH):
+        cache.load_seed(DEFAULT_SEED_PATH)
+    return cache
+
 def get_company_name(ticker):
+    cache = get_metadata_cache()
+    cached = cache.get(ticker)
+    if cached and cached.get('name'):
+        return cached['name']
     try:
-        info = yf.Ticker(ticker).info
-        return info.get('shortName', ticker)
+        info = get_provider().metadata([ticker]).get(ticker, {})
     except Exception:
         return ticker
+    name = info.get('name') or ticker
+    fields = {'name': name}
+    if info.get('currency'):
+        fields['currency'] = info['currency']
+    cache.put(ticker, fields)
+    return name
+
+@st.cache_resource(show_spinner=False)
+def get_history_store():
+    """Process-wide on-disk OHLCV store shared by all sessions, filled from the history provider."""
+    return HistoryStore(fetch=get_provider().history)
+
+
+@st.cache_resource(show_spinner=False)
+def get_indicator_cache():
+    """Process-wide memoized indicator series, bounded by INDICATOR_CACHE_MB (default 64 MB)."""
+    return IndicatorCache(max_bytes=int(os.environ.get("INDICATOR_CACHE_MB", 64)) * 1024 * 1024)
+
+
+@st.cache_resource(show_spinner=False)
+def get_symbol_catalog():
+    """Process-wide symbol universe (data/symbols.csv or SYMBOL_CATALOG_PATH) shared by all tabs."""
+    return SymbolCatalog.load()
+
+
+@st.cache_resource(show_spinner=False, max_entries=4)
+def get_quote_table(quotes):
+    """Indexed table behind the Quotes grid, built once per quotes snapshot and shared by sessions."""
+    return QuoteTable(quotes)
+
+def get_history(ticker, interval, period):
+    """
+    Returns OHLCV bars for the detail view. Bars already on disk are reused and only
+    newer bars are requested from the history provider; only the OHLCV columns are loaded.
+    """
+    return get_history_store().get(ticker, interval, period, columns=BAR_COLUMNS)
+
+# How often the quote hub refetches each symbol set it serves
+QUOTES_REFRESH_SECONDS = float(os.environ.get("QUOTES_REFRESH_SECONDS", 15))
+
+@st.cache_resource(show_spinner=False)
+def get_provider():
+    """
+    Process-wide blocking facade over the configured providers (MARKET_DATA_PROVIDER and the
+    per-type overrides, see backend.providers); one event loop for all sessions.
+    """
+    return SyncProvider(provider_from_env())
+
+@st.cache_data(show_spinner=False, ttl=QUOTES_REFRESH_SECONDS)
+def get_market_overview(index_tickers, currencies):
+    """
+    Quotes for the Overview tab's country indices and each currency's rate against USD,
+    requested concurrently, so the whole map costs about one provider round trip.
+    Returns (quotes frame or None, {currency: {'rate', 'change_pct'}}).
+    """
+    facade = get_provider()
+    quotes, rates = facade.gather(
+        facade.provider.quote_snapshot(index_tickers, metadata_cache=get_metadata_cache()),
+        facade.provider.exchange_rates(currencies),
+        return_exceptions=True,
+    )
+    return (None if isinstance(quotes, BaseException) else quotes), ({} if isinstance(rates, BaseException) else rates)
+
+@st.cache_resource(show_spinner=False)
+def get_quote_hub():
+    """
+    Process-wide quote hub: one background thread refreshes the quotes every
+    QUOTES_REFRESH_SECONDS and every session reads the published snapshot.
+    """
+    metadata_cache = get_metadata_cache()
+    provider = get_provider()
+    hub = QuoteHub(lambda tickers: provider.quote_snapshot(tickers, metadata_cache=metadata_cache), interval=QUOTES_REFRESH_SECONDS)
+    return hub.start()
+
+@st.cache_resource(show_spinner=False)
+def get_quote_requests():
+    """Process-wide single-flight, stale-while-revalidate cache in front of the Twelve Data client."""
+    return StaleWhileRevalidate(ttl=QUOTES_REFRESH_SECONDS, name="12data-quotes")
+
+def get_quote_snapshot():
+    """The latest QuoteSnapshot of the top_quotes universe (frame, fetched_at, age)."""
+    tickers = get_symbol_catalog().filter(tag='top_quotes').tickers
+    return get_quote_hub().snapshot(tickers)
 
-@st.cache_data(show_spinner=False)
 def get_top_stocks_quotes():
     """
-    Fetches the latest quote data for 30 well-known stocks using Yahoo Finance (yfinance),
-    including company name, change, and percent change. Uses caching for efficiency.
+    Returns the latest quote data for 30 well-known stocks using Yahoo Finance (yfinance),
+    including company name, change, and percent change. Prices and metadata are fetched
+    in batched requests (see backend.quote_snapshot) by the shared quote hub.
     Returns a DataFrame with columns: ticker, name, last_price, day_high, day_low, open, volume, change, change_pct.
     """
-    tickers = [
-        "AAPL", "MSFT", "GOOGL", "AMZN", "TSLA", "META", "NVDA", "NFLX", "BRK-B", "JPM",
-        "V", "UNH", "HD", "MA", "PG", "DIS", "KO", "PEP", "BAC", "XOM",
-        "PFE", "CSCO", "T", "VZ", "WMT", "INTC", "CVX", "MCD", "NKE", "ADBE", "SAP", "BNTX"
-    ]
-    data = yf.download(tickers, period="1d", interval="1d", group_by='ticker', auto_adjust=True, threads=True)
-    quotes = []
-    for ticker in tickers:
-        try:
-            last_close = data[ticker]['Close'][-1]
-            high = data[ticker]['High'][-1]
-            low = data[ticker]['Low'][-1]
-            open_ = data[ticker]['Open'][-1]
-            volume = data[ticker]['Volume'][-1]
-            name = get_company_name(ticker)
-            info = yf.Ticker(ticker).info
-            currency = info.get('currency', None)
-            bid = info.get('bid', None)
-            ask = info.get('ask', None)
-            year_high = info.get('fiftyTwoWeekHigh', None)
-            year_low = info.get('fiftyTwoWeekLow', None)
-            market_cap = info.get('marketCap', None)
-            change = last_close - open_ if open_ is not None else None
-            change_pct = (change / open_ * 100) if (open_ not in [None, 0]) else None
-            quotes.append({
-                'ticker': ticker,
-                'name': name,
-                'last_price': last_close,
-                'day_high': high,
-                'day_low': low,
-                'open': open_,
-                'volume': volume,
-                'change': change,
-                'change_pct': change_pct,
-                'currency': currency,
-                'bid': bid,
-                'ask': ask,
-                'year_high': year_high,
-                'year_low': year_low,
-                'market_cap': market_cap
-            })
-        except Exception:
-            quotes.append({
-                'ticker': ticker,
-                'name': ticker,
-                'last_price': None,
-                'day_high': None,
-                'day_low': None,
-                'open': None,
-                'volume': None,
-                'change': None,
-                'change_pct': None,
-                'currency': None,
-                'bid': None,
-                'ask': None,
-                'year_high': None,
-                'year_low': None,
-                'market_cap': None
-            })
-    return pd.DataFrame(quotes)
\ No newline at end of file
+    return get_quote_snapshot().frame
+
+@st.cache_resource(show_spinner=False)
+def get_usage_stats():
+    """Process-wide decaying view counts; the prewarmer warms the most viewed symbols and charts."""
+    return UsageStats()
+
+def record_view(place, symbol, interval=None, period=None):
+    """
+    Counts a view of `symbol` (and of its chart) shown in `place`, once until that place
+    of this session shows something else, so reruns don't inflate the counts.
+    """
+    view = (symbol, interval, period)
+    if st.session_state.get(f'recorded_view_{place}') != view:
+        get_usage_stats().record(symbol, interval, period)
+        st.session_state[f'recorded_view_{place}'] = view
+
+@st.cache_resource(show_spinner=False)
+def get_prewarmer():
+    """
+    Process-wide cache warm-up on PREWARM_SCHEDULE (see backend.prewarm), started with the
+    first session unless PREWARM_ENABLED=0.
+    """
+    prewarmer = Prewarmer(
+        get_provider(), get_history_store(), get_metadata_cache(), get_quote_hub(),
+        get_symbol_catalog(), get_usage_stats(),
+    )
+    return prewarmer.start() if PREWARM_ENABLED else prewarmer
+
+@st.cache_resource(show_spinner=False)
+def get_monte_carlo_pool():
+    """Process-wide workers for large Monte Carlo runs: MONTE_CARLO_WORKERS, default one per core."""
+    return process_pool(int(os.environ.get("MONTE_CARLO_WORKERS", os.cpu_count() or 1)))
+
+@st.cache_data(show_spinner=False, max_entries=16)
+def get_monte_carlo_risk(returns, paths, horizon, confidence, dof=None):
+    """
+    Monte Carlo VaR/CVaR of an equal-weight book of the symbols in `returns` (see
+    backend.monte_carlo). Runs too big to be worth it inline go to the shared process pool.
+    """
+    large = paths * returns.shape[1] * horizon >= INLINE_WORK and (os.cpu_count() or 1) > 1
+    return simulate_portfolio(
+        returns, paths=paths, horizon=horizon, confidence=confidence, dof=dof,
+        workers=1, executor=get_monte_carlo_pool() if large else None,
+    )
@@ -0,0 +1,257 @@
+# backend/history_store.py
+import os
+import tempfile
+import threading
+import time
+from urllib.parse import quote
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import yfinance as yf
+
+from backend.metadata_cache import ROOT_DIR
+from backend.single_flight import SingleFlight
+
+DEFAULT_HISTORY_DIR = os.environ.get("HISTORY_STORE_DIR", os.path.join(ROOT_DIR, ".cache", "history"))
+
+BAR_COLUMNS = ['Open', 'High', 'Low', 'Close', 'Volume']
+# Name of the timestamp column in the Arrow files; the frame's own index name is kept in the metadata
+TIME_COLUMN = 'Datetime'
+
+# Don't ask the provider again until a bar's worth of time has passed (seconds)
+REFRESH_AFTER = {
+    '1m': 60, '2m': 120, '5m': 300, '15m': 900, '30m': 1800, '60m': 1800, '1h': 1800,
+    '1d': 3600, '1wk': 3600, '1mo': 3600,
+}
+
+# Stored bars past their refresh time are still served (while one background refresh runs)
+# for up to this long; older ones make the caller wait for the provider
+SERVE_STALE_FOR = 24 * 3600
+
+# Intraday bars older than this are dropped when the file is rewritten; None keeps everything
+RETENTION = {
+    '1m': pd.Timedelta(days=30), '2m': pd.Timedelta(days=60), '5m': pd.Timedelta(days=60),
+    '15m': pd.Timedelta(days=60), '30m': pd.Timedelta(days=60), '60m': pd.Timedelta(days=730),
+    '1h': pd.Timedelta(days=730),
+}
+
+
+def fetch_history(symbol, interval, period=None, start=None):
+    """Downloads bars from Yahoo Finance, either for a `period` or from `start` onwards."""
+    ticker = yf.Ticker(symbol)
+    if start is not None:
+        return ticker.history(interval=interval, start=start)
+    return ticker.history(interval=interval, period=period)
+
+
+def parse_period(period):
+    """Splits a Yahoo-style period such as "5d", "1mo" or "2y" into (count, unit)."""
+    unit = period.lstrip('0123456789')
+    return int(period[:len(period) - len(unit)] or 1), unit
+
+
+def period_days(period):
+    """Approximate calendar days spanned by a period, for comparing periods with each other."""
+    if period in (None, 'max'):
+        return float('inf')
+    count, unit = parse_period(period)
+    return count * {'d': 1, 'wk': 7, 'mo': 31, 'y': 366}.get(unit, 1)
+
+
+def period_start(index, period):
+    """
+    Returns the position of the first bar of `index` inside a Yahoo-style period
+    ("1d", "5d", "1mo", "1y", "max"). Day periods count trading sessions rather than
+    24-hour blocks, like the provider does.
+    """
+    if len(index) == 0 or period in (None, 'max'):
+        return 0
+    count, unit = parse_period(period)
+    if unit == 'd':
+        # Only the tail can hold the last `count` sessions; widen to the full index if it doesn't
+        tail_start = index.searchsorted(index[-1] - pd.Timedelta(days=2 * count + 7))
+        sessions = index[tail_start:].normalize().unique()
+        if len(sessions) < count and tail_start > 0:
+            sessions = index.normalize().unique()
+        return index.searchsorted(sessions[-min(count, len(sessions))])
+    offsets = {'wk': pd.DateOffset(weeks=count), 'mo': pd.DateOffset(months=count), 'y': pd.DateOffset(years=count)}
+    if unit not in offsets:
+        return 0
+    return index.searchsorted(index[-1] - offsets[unit], side='right')
+
+
+def period_window(bars, period):
+    """Returns the tail of `bars` covered by `period` (see period_start)."""
+    return bars.iloc[period_start(bars.index, period):]
+
+
+def merge_bars(stored, fresh):
+    """Appends `fresh` to `stored`; where timestamps overlap the fresh bar wins."""
+    merged = pd.concat([stored, fresh])
+    return merged[~merged.index.duplicated(keep='last')].sort_index()
+
+
+class HistoryStore:
+    """
+    On-disk store of OHLCV bars, one Arrow IPC file per (symbol, interval). Files are
+    memory-mapped on read, so only the requested columns and rows are copied into RAM.
+    Only bars newer than the last stored one are requested from the provider and merged
+    in, so repeat views are served from disk. Intraday files drop bars older than their
+    RETENTION on every write.
+
+    Provider calls go through a SingleFlight keyed by (symbol, interval, period), so
+    sessions opening the same chart at once share one download. Updates of the same file
+    for different periods are serialized by a per-(symbol, interval) lock, so each merges
+    into the bars the previous one wrote instead of overwriting them.
+    """
+
+    def __init__(self, root=DEFAULT_HISTORY_DIR, fetch=fetch_history, serve_stale_for=SERVE_STALE_FOR):
+        self.root = root
+        self.fetch = fetch
+        self.serve_stale_for = serve_stale_for
+        self.flight = SingleFlight("history")
+        self._file_locks = {}   # (symbol, interval) -> Lock held while its file is updated
+        self._file_locks_lock = threading.Lock()
+
+    def path(self, symbol, interval):
+        return os.path.join(self.root, interval, quote(symbol, safe='') + ".arrow")
+
+    def open(self, symbol, interval):
+        """Returns the stored bars as a memory-mapped Arrow table, or None if nothing is stored yet."""
+        try:
+            source = pa.memory_map(self.path(symbol, interval), 'r')
+        except FileNotFoundError:
+            return None
+        return pa.ipc.open_file(source).read_all()
+
+    def to_frame(self, table, columns=None, period=None):
+        """
+        Converts a stored table to a DataFrame indexed by time, copying only `columns`
+        (all of them if None) and the rows inside `period`.
+        """
+        metadata = table.schema.metadata or {}
+        times = table.column(TIME_COLUMN)
+        start = 0
+        if period not in (None, 'max') and len(times):
+            # Timestamps are sorted, so only the tail has to be converted to find where the period starts
+            utc = times.to_numpy()
+            tail_start = int(np.searchsorted(utc, utc[-1] - np.timedelta64(int(2 * period_days(period) + 7), 'D')))
+            start = tail_start + period_start(pd.DatetimeIndex(times.slice(tail_start).to_pandas()), period)
+        if columns is not None:
+            table = table.select([TIME_COLUMN] + [c for c in columns if c in table.column_names])
+        bars = table.slice(start).to_pandas().set_index(TIME_COLUMN)
+        bars.index.name = metadata.get(b'index_name', b'').decode() or None
+        bars.attrs['period'] = metadata.get(b'period', b'').decode() or None
+        return bars
+
+    def read(self, symbol, interval, columns=None, period=None):
+        """Returns the stored bars (optionally only some columns / the tail in `period`), or None."""
+        table = self.open(symbol, interval)
+        return None if table is None else self.to_frame(table, columns, period)
+
+    def write(self, symbol, interval, bars):
+        path = self.path(symbol, interval)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        bars = self.compact(bars, interval)
+        table = pa.Table.from_pandas(bars.rename_axis(TIME_COLUMN).reset_index(), preserve_index=False)
+        table = table.replace_schema_metadata({
+            b'index_name': (bars.index.name or '').encode(),
+            b'period': (bars.attrs.get('period') or '').encode(),
+        })
+        # Write to a temporary file first so readers never see a half-written file; the name
+        # is unique, so writers in other threads or processes never share it
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), prefix=os.path.basename(path) + ".", suffix=".tmp")
+        os.close(fd)
+        try:
+            with pa.OSFile(tmp_path, 'wb') as sink, pa.ipc.new_file(sink, table.schema) as writer:
+                writer.write_table(table)
+            os.replace(tmp_path, path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+        return bars
+
+    def compact(self, bars, interval):
+        retention = RETENTION.get(interval)
+        if retention is None or bars.empty:
+            return bars
+        return bars[bars.index >= bars.index[-1] - retention]
+
+    def age(self, symbol, interval):
+        """Seconds since the stored file was last refreshed, or None if there is no file."""
+        try:
+            return time.time() - os.path.getmtime(self.path(symbol, interval))
+        except FileNotFoundError:
+            return None
+
+    def _file_lock(self, symbol, interval):
+        with self._file_locks_lock:
+            return self._file_locks.setdefault((symbol, interval), threading.Lock())
+
+    def update(self, symbol, interval, period):
+        """
+        Brings the stored bars up to date and returns all of them. The store remembers the
+        longest period it was filled with (in DataFrame.attrs) to know what it can answer.
+        """
+        with self._file_lock(symbol, interval):
+            return self._update(symbol, interval, period)
+
+    def _update(self, symbol, interval, period):
+        stored = self.read(symbol, interval)
+        if stored is None or stored.empty or period_days(period) > period_days(stored.attrs.get('period')):
+            bars = self.fetch(symbol, interval, period=period)
+            if stored is not None and not stored.empty:
+                bars = merge_bars(stored, bars)
+            bars.attrs['period'] = period
+            return self.write(symbol, interval, bars)
+
+        # Start at the last stored bar: it may have been incomplete when it was fetched
+        fresh = self.fetch(symbol, interval, start=stored.index[-1])
+        if fresh is None or fresh.empty:
+            os.utime(self.path(symbol, interval))
+            return stored
+        merged = merge_bars(stored, fresh)
+        merged.attrs['period'] = stored.attrs.get('period')
+        return self.write(symbol, interval, merged)
+
+    def refresh(self, symbol, interval, period):
+        """update(), joining a download already in flight for the same request."""
+        return self.flight.do((symbol, interval, period), lambda: self.update(symbol, interval, period))
+
+    def is_fresh(self, symbol, interval, period):
+        """True if get() would answer `period` from disk without calling the provider at all."""
+        age = self.age(symbol, interval)
+        return age is not None and age < REFRESH_AFTER.get(interval, 60) and self.is_warm(symbol, interval, period)
+
+    def is_warm(self, symbol, interval, period):
+        """True if get() would answer `period` from disk without waiting for the provider."""
+        age = self.age(symbol, interval)
+        if age is None or age >= REFRESH_AFTER.get(interval, 60) + self.serve_stale_for:
+            return False
+        table = self.open(symbol, interval)
+        stored_period = None if table is None else (table.schema.metadata or {}).get(b'period', b'').decode() or None
+        return table is not None and period_days(period) <= period_days(stored_period)
+
+    def get(self, symbol, interval, period, columns=None):
+        """
+        Returns bars for `period` (only `columns` if given), fetching only what is missing.
+        If the stored bars were refreshed less than REFRESH_AFTER[interval] seconds ago the
+        provider isn't called and the answer is sliced straight out of the memory-mapped file.
+        Past that (up to serve_stale_for) the stored bars are still returned right away and
+        one background refresh brings the file up to date for the next reader.
+        A longer period than the store was first filled with triggers one full download.
+        """
+        key = (symbol, interval, period)
+        age = self.age(symbol, interval)
+        if age is not None and age < REFRESH_AFTER.get(interval, 60) + self.serve_stale_for:
+            table = self.open(symbol, interval)
+            if table is not None:
+                stored_period = (table.schema.metadata or {}).get(b'period', b'').decode() or None
+                if period_days(period) <= period_days(stored_period):
+                    if age >= REFRESH_AFTER.get(interval, 60):
+                        self.flight.do_async(key, lambda: self.update(symbol, interval, period))
+                    return self.to_frame(table, columns, period)
+        bars = period_window(self.refresh(symbol, interval, period), period)
+        return bars if columns is None else bars[[c for c in columns if c in bars.columns]]
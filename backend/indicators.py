@@ -0,0 +1,119 @@
+# backend/indicators.py
+"""
+Technical indicators for the Charts tab, computed with whole-array NumPy/pandas operations.
+Every function accepts lists, arrays or Series and returns pandas Series (aligned to the
+input's index when a Series is passed). The first `period - 1` values are NaN.
+"""
+import numpy as np
+import pandas as pd
+
+
+def _series(values):
+    return values.astype(float) if isinstance(values, pd.Series) else pd.Series(values, dtype=float)
+
+
+def sma(close, period):
+    """Simple moving average."""
+    return _series(close).rolling(window=period).mean()
+
+
+def ema(close, period):
+    """Exponential moving average with span `period` (pandas' adjusted EWM)."""
+    return _series(close).ewm(span=period).mean()
+
+
+def wma(close, period):
+    """
+    Linearly weighted moving average: the newest bar has weight `period`, the oldest weight 1.
+    Computed as one convolution, so the cost no longer grows with period in Python.
+    """
+    close = _series(close)
+    values = close.to_numpy()
+    result = np.full(len(values), np.nan)
+    if period <= len(values):
+        weights = np.arange(1, period + 1, dtype=float)
+        # np.convolve flips the kernel, so reversed weights put `period` on the newest bar
+        result[period - 1:] = np.convolve(values, weights[::-1], mode='valid') / weights.sum()
+    return pd.Series(result, index=close.index)
+
+
+def hma(close, period):
+    """Hull moving average: WMA(2 * WMA(n/2) - WMA(n), sqrt(n))."""
+    raw = 2 * wma(close, period // 2) - wma(close, period)
+    return wma(raw, int(np.sqrt(period)))
+
+
+def vwap(open_, high, low, close, volume):
+    """Cumulative volume-weighted average of the (O + H + L + C) / 4 price."""
+    typical = (_series(open_) + _series(high).values + _series(low).values + _series(close).values) / 4
+    volume = _series(volume).values
+    cumulative_volume = np.cumsum(volume)
+    cumulative_tpv = np.cumsum(typical.values * volume)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        result = np.where(cumulative_volume > 0, cumulative_tpv / cumulative_volume, typical.values)
+    return pd.Series(result, index=typical.index)
+
+
+def bollinger(close, period, num_std=2.0):
+    """Returns (upper, middle, lower) bands: SMA(period) +/- num_std rolling standard deviations."""
+    close = _series(close)
+    middle = close.rolling(window=period).mean()
+    std = close.rolling(window=period).std()
+    return middle + num_std * std, middle, middle - num_std * std
+
+
+def rsi(close, period, method='simple'):
+    """
+    Relative strength index. method='simple' averages gains and losses with rolling means
+    (what the Charts tab plots); method='wilder' seeds with a simple mean over the first
+    `period` changes and then applies Wilder's smoothing.
+    """
+    delta = _series(close).diff()
+    if method == 'wilder':
+        gain = _wilder_average(delta.clip(lower=0), period)
+        loss = _wilder_average((-delta).clip(lower=0), period)
+    else:
+        gain = delta.where(delta > 0, 0).rolling(window=period).mean()
+        loss = (-delta.where(delta < 0, 0)).rolling(window=period).mean()
+    return 100 - (100 / (1 + gain / loss))
+
+
+def _wilder_average(values, period):
+    seeded = pd.Series(np.nan, index=values.index)
+    if len(values) > period:
+        seeded.iloc[period] = values.iloc[1:period + 1].mean()
+        seeded.iloc[period + 1:] = values.iloc[period + 1:]
+    return seeded.ewm(alpha=1 / period, adjust=False).mean()
+
+
+def macd(close, fast=12, slow=26, signal=9):
+    """Returns (macd_line, signal_line, histogram)."""
+    close = _series(close)
+    macd_line = close.ewm(span=fast).mean() - close.ewm(span=slow).mean()
+    signal_line = macd_line.ewm(span=signal).mean()
+    return macd_line, signal_line, macd_line - signal_line
+
+
+def stochastic(high, low, close, k_period=14, d_period=3):
+    """Returns (%K, %D)."""
+    lowest_low = _series(low).rolling(window=k_period).min()
+    highest_high = _series(high).rolling(window=k_period).max()
+    k_percent = 100 * ((_series(close) - lowest_low) / (highest_high - lowest_low))
+    return k_percent, k_percent.rolling(window=d_period).mean()
+
+
+def williams_r(high, low, close, period=14):
+    highest_high = _series(high).rolling(window=period).max()
+    lowest_low = _series(low).rolling(window=period).min()
+    return -100 * ((highest_high - _series(close)) / (highest_high - lowest_low))
+
+
+def true_range(high, low, close):
+    high, low, close = _series(high), _series(low), _series(close)
+    previous_close = close.shift(1)
+    return pd.concat([high - low, (high - previous_close).abs(), (low - previous_close).abs()], axis=1).max(axis=1)
+
+
+def atr(high, low, close, period=14):
+    """Average true range as a simple rolling mean of the true range."""
+    return true_range(high, low, close).rolling(window=period).mean()
@@ -0,0 +1,131 @@
+# backend/market_sim.py
+"""
+Seeded synthetic market data for the demo tabs, load tests and benchmark fixtures.
+Everything is generated in whole-array NumPy passes, so millions of bars or thousands
+of symbols cost one allocation per column rather than a Python loop per bar.
+
+    bars = simulate_ohlcv(7200, seed=seed_for("AAPL", "1 day"))
+    returns = simulate_returns(["AAPL", "MSFT"], 252, seed=1, correlation=0.3)
+"""
+import zlib
+
+import numpy as np
+import pandas as pd
+
+
+def seed_for(*parts):
+    """Stable 32-bit seed from arbitrary labels (unlike hash(), identical across processes)."""
+    return zlib.crc32("|".join(str(part) for part in parts).encode())
+
+
+def _symbol_rng(seed, symbol):
+    # One independent stream per symbol, so adding a symbol leaves the others unchanged
+    return np.random.default_rng(np.random.SeedSequence(seed, spawn_key=(seed_for(symbol),)))
+
+
+def simulate_ohlcv(periods, seed=None, base_price=None, volatility=0.02, wick=0.01, body=0.005,
+                   volume_range=(100000, 1000000), index=None):
+    """
+    Random-walk OHLCV bars. Each bar opens at the previous close plus a N(0, volatility * base)
+    gap, closes N(0, body * base) away from its open, and gets wicks of |N(0, wick * base)|
+    beyond the body. Returns a DataFrame with Open/High/Low/Close/Volume columns.
+    """
+    rng = np.random.default_rng(seed)
+    if base_price is None:
+        base_price = 100.0 + rng.integers(0, 900)
+    base_price = float(base_price)
+
+    gaps = rng.normal(0, base_price * volatility, periods)
+    bodies = rng.normal(0, base_price * body, periods)
+    upper_wicks = np.abs(rng.normal(0, base_price * wick, periods))
+    lower_wicks = np.abs(rng.normal(0, base_price * wick, periods))
+    volumes = rng.integers(volume_range[0], volume_range[1], periods)
+
+    closes = base_price + np.cumsum(gaps + bodies)
+    opens = closes - bodies
+    # A wick can only extend the body, so High/Low bound Open/Close by construction
+    highs = np.maximum(opens, closes) + upper_wicks
+    lows = np.minimum(opens, closes) - lower_wicks
+    frame = pd.DataFrame({'Open': opens, 'High': highs, 'Low': lows, 'Close': closes, 'Volume': volumes})
+    if index is not None:
+        frame.index = index
+    return frame
+
+
+def simulate_returns(symbols, periods, seed=None, volatility=0.02, drift=0.0, correlation=0.0, index=None):
+    """
+    Panel of simple returns, one column per symbol. `volatility` and `drift` may be scalars or
+    per-symbol sequences. `correlation` is either a scalar pairwise correlation (one common
+    factor, O(periods * symbols), fine for thousands of symbols) or a full correlation matrix
+    (applied through its Cholesky factor).
+    """
+    symbols = list(symbols)
+    shocks = np.empty((periods, len(symbols)))
+    for column, symbol in enumerate(symbols):
+        shocks[:, column] = _symbol_rng(seed, symbol).standard_normal(periods)
+
+    if np.ndim(correlation) == 0:
+        if correlation:
+            market = np.random.default_rng(np.random.SeedSequence(seed, spawn_key=(0,))).standard_normal((periods, 1))
+            shocks = np.sqrt(correlation) * market + np.sqrt(1 - correlation) * shocks
+    else:
+        shocks = shocks @ np.linalg.cholesky(np.asarray(correlation, dtype=float)).T
+
+    returns = np.asarray(drift) + np.asarray(volatility) * shocks
+    # Simple returns below -100% would make prices negative
+    np.clip(returns, -0.99, None, out=returns)
+    return pd.DataFrame(returns, columns=symbols, index=index)
+
+
+def simulate_prices(symbols, periods, seed=None, base_prices=None, **kwargs):
+    """
+    Price paths of `periods` points per symbol (the first point is the base price), compounded
+    from simulate_returns. Base prices default to a seeded 100-999 per symbol.
+    """
+    symbols = list(symbols)
+    if base_prices is None:
+        base_prices = [100.0 + _symbol_rng(seed, f"base|{symbol}").integers(0, 900) for symbol in symbols]
+    returns = simulate_returns(symbols, periods - 1, seed=seed, **kwargs).to_numpy()
+    growth = np.vstack([np.ones((1, len(symbols))), np.cumprod(1 + returns, axis=0)])
+    return pd.DataFrame(growth * np.asarray(base_prices, dtype=float), columns=symbols)
+
+
+def simulate_ohlc_panel(symbols, periods, seed=None, volatility=0.02, overnight=0.2, **kwargs):
+    """
+    Daily bars for a panel of symbols as {'Open', 'High', 'Low', 'Close'} DataFrames (periods x
+    symbols). Closes are exactly simulate_prices(symbols, periods, seed, volatility=...), so
+    the bars line up with the close-only panel. Each close-to-close log return is split into
+    an overnight gap carrying `overnight` of its variance (drawn from its distribution given
+    the return) and an intraday move; High and Low are the extremes of a Brownian bridge
+    between Open and Close with the intraday variance, so range-based volatility estimators
+    see a realistic trading day.
+    """
+    symbols = list(symbols)
+    closes = simulate_prices(symbols, periods, seed=seed, volatility=volatility, **kwargs)
+    close = closes.to_numpy()
+    log_returns = np.diff(np.log(close), axis=0, prepend=np.log(close[:1]))
+    daily_var = np.broadcast_to(np.asarray(volatility, dtype=float) ** 2, (len(symbols),))
+    shocks = np.empty((periods, len(symbols)))
+    uniforms = np.empty((2, periods, len(symbols)))
+    for column, symbol in enumerate(symbols):
+        rng = _symbol_rng(seed, f"ohlc|{symbol}")
+        shocks[:, column] = rng.standard_normal(periods)
+        uniforms[:, :, column] = rng.random((2, periods))
+
+    # Given the whole return r, the overnight part is N(overnight * r, overnight * (1 - overnight) * var)
+    gap = overnight * log_returns + np.sqrt(overnight * (1 - overnight) * daily_var) * shocks
+    gap[0] = 0.0  # the first bar has no previous close
+    move = log_returns - gap
+    log_open = np.log(close) - move
+    intraday_var = (1 - overnight) * daily_var
+    # Maximum and minimum of a Brownian bridge from 0 to `move` (inverse-CDF draws)
+    log_high = log_open + (move + np.sqrt(move * move - 2 * intraday_var * np.log1p(-uniforms[0]))) / 2
+    log_low = log_open + (move - np.sqrt(move * move - 2 * intraday_var * np.log1p(-uniforms[1]))) / 2
+
+    panel = {'Open': np.exp(log_open), 'High': np.exp(log_high), 'Low': np.exp(log_low)}
+    bars = {name: pd.DataFrame(values, index=closes.index, columns=symbols) for name, values in panel.items()}
+    # Rounding in exp/log must not put Close a hair outside the range
+    bars['High'] = np.maximum(bars['High'], np.maximum(bars['Open'], closes))
+    bars['Low'] = np.minimum(bars['Low'], np.minimum(bars['Open'], closes))
+    bars['Close'] = closes
+    return bars
@@ -0,0 +1,192 @@
+# backend/metadata_cache.py
+# Run from the repo root to write a seed file from the on-disk cache:
+#   python -m backend.metadata_cache export data/metadata_seed.json
+import argparse
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_CACHE_PATH = os.environ.get("METADATA_CACHE_PATH", os.path.join(ROOT_DIR, ".cache", "metadata.sqlite"))
+DEFAULT_SEED_PATH = os.environ.get("METADATA_SEED_PATH", os.path.join(ROOT_DIR, "data", "metadata_seed.json"))
+
+# Stay well below SQLite's limit on bound parameters per statement
+SQL_CHUNK_SIZE = 500
+
+# Metadata that changes rarely enough to outlive a deploy; prices and bid/ask never go in here
+STATIC_FIELDS = ('name', 'currency')
+
+
+def _chunks(items, size=SQL_CHUNK_SIZE):
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+class MetadataCache:
+    """
+    Two-tier cache of per-ticker metadata dicts: an in-memory LRU in front of a SQLite file.
+    Each tier has its own TTL in seconds, measured on `clock`. Disk hits are promoted to memory.
+    Safe to share between threads; several processes can share the same file.
+    """
+
+    def __init__(self, path=DEFAULT_CACHE_PATH, memory_size=4096, memory_ttl=3600, disk_ttl=30 * 86400, clock=time.time):
+        self.path = path
+        self.memory_size = memory_size
+        self.memory_ttl = memory_ttl
+        self.disk_ttl = disk_ttl
+        self.clock = clock
+        self._memory = OrderedDict()  # ticker -> (stored_at, fields)
+        self._lock = threading.Lock()
+        self.hits = {'memory': 0, 'disk': 0}
+        self.misses = 0
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS metadata ("
+                "ticker TEXT PRIMARY KEY, fields TEXT NOT NULL, updated_at REAL NOT NULL)"
+            )
+
+    @contextmanager
+    def _connect(self):
+        conn = sqlite3.connect(self.path, timeout=10)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def _remember(self, ticker, fields, stored_at):
+        self._memory[ticker] = (stored_at, fields)
+        self._memory.move_to_end(ticker)
+        while len(self._memory) > self.memory_size:
+            self._memory.popitem(last=False)
+
+    def get_many(self, tickers):
+        """Returns {ticker: fields} for every ticker found in a fresh tier; misses are left out."""
+        now = self.clock()
+        found = {}
+        with self._lock:
+            for ticker in tickers:
+                entry = self._memory.get(ticker)
+                if entry is None:
+                    continue
+                if now - entry[0] > self.memory_ttl:
+                    del self._memory[ticker]
+                    continue
+                self._memory.move_to_end(ticker)
+                found[ticker] = dict(entry[1])
+            self.hits['memory'] += len(found)
+
+        remaining = [ticker for ticker in tickers if ticker not in found]
+        if remaining:
+            rows = []
+            with self._connect() as conn:
+                for chunk in _chunks(remaining):
+                    rows.extend(conn.execute(
+                        f"SELECT ticker, fields FROM metadata WHERE updated_at >= ? AND ticker IN ({','.join('?' * len(chunk))})",
+                        [now - self.disk_ttl, *chunk]
+                    ).fetchall())
+            with self._lock:
+                for ticker, fields in rows:
+                    fields = json.loads(fields)
+                    self._remember(ticker, fields, now)
+                    found[ticker] = dict(fields)
+                self.hits['disk'] += len(rows)
+                self.misses += len(remaining) - len(rows)
+        return found
+
+    def get(self, ticker):
+        return self.get_many([ticker]).get(ticker)
+
+    def put_many(self, entries):
+        """Stores {ticker: fields} in both tiers, merging with what is already stored."""
+        if not entries:
+            return
+        now = self.clock()
+        with self._connect() as conn:
+            existing = {}
+            for chunk in _chunks(list(entries)):
+                existing.update(conn.execute(
+                    f"SELECT ticker, fields FROM metadata WHERE ticker IN ({','.join('?' * len(chunk))})",
+                    chunk
+                ).fetchall())
+            merged = {}
+            for ticker, fields in entries.items():
+                merged[ticker] = {**json.loads(existing.get(ticker, "{}")), **fields}
+            conn.executemany(
+                "INSERT OR REPLACE INTO metadata (ticker, fields, updated_at) VALUES (?, ?, ?)",
+                [(ticker, json.dumps(fields), now) for ticker, fields in merged.items()]
+            )
+        with self._lock:
+            for ticker, fields in merged.items():
+                self._remember(ticker, fields, now)
+
+    def put(self, ticker, fields):
+        self.put_many({ticker: fields})
+
+    def load_seed(self, path=DEFAULT_SEED_PATH):
+        """
+        Pre-warms the disk tier from a seed file ({ticker: fields} JSON). Seed entries
+        only replace rows that are missing or expired, so a fresher cache file wins.
+        Returns the number of rows written.
+        """
+        with open(path) as f:
+            seed = json.load(f)
+        now = self.clock()
+        with self._connect() as conn:
+            before = conn.total_changes
+            conn.executemany(
+                "INSERT INTO metadata (ticker, fields, updated_at) VALUES (?, ?, ?) "
+                "ON CONFLICT(ticker) DO UPDATE SET fields = excluded.fields, updated_at = excluded.updated_at "
+                "WHERE metadata.updated_at < ?",
+                [(ticker, json.dumps(fields), now, now - self.disk_ttl) for ticker, fields in seed.items()]
+            )
+            return conn.total_changes - before
+
+    def export_seed(self, path=DEFAULT_SEED_PATH):
+        """Writes every fresh disk entry to a seed file that `load_seed` can read."""
+        with self._connect() as conn:
+            rows = conn.execute(
+                "SELECT ticker, fields FROM metadata WHERE updated_at >= ? ORDER BY ticker",
+                [self.clock() - self.disk_ttl]
+            ).fetchall()
+        with open(path, "w") as f:
+            json.dump({ticker: json.loads(fields) for ticker, fields in rows}, f, indent=1, sort_keys=True)
+        return len(rows)
+
+    def get_or_fetch(self, tickers, fetch_many):
+        """
+        Returns {ticker: fields} for all tickers, calling `fetch_many(missing)` only for
+        cache misses. `fetch_many` returns {ticker: fields}; empty results are not cached.
+        """
+        found = self.get_many(tickers)
+        missing = [ticker for ticker in tickers if ticker not in found]
+        if missing:
+            fetched = {ticker: fields for ticker, fields in fetch_many(missing).items() if fields}
+            self.put_many(fetched)
+            found.update(fetched)
+        return found
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Maintain the on-disk metadata cache.")
+    parser.add_argument("command", choices=["export", "load"])
+    parser.add_argument("seed", nargs="?", default=DEFAULT_SEED_PATH)
+    parser.add_argument("--cache", default=DEFAULT_CACHE_PATH)
+    args = parser.parse_args()
+
+    cache = MetadataCache(args.cache)
+    if args.command == "export":
+        print(f"Exported {cache.export_seed(args.seed)} tickers to {args.seed}")
+    else:
+        print(f"Loaded {cache.load_seed(args.seed)} tickers from {args.seed}")
+
+
+if __name__ == "__main__":
+    main()
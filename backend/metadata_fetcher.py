@@ -0,0 +1,129 @@
+# backend/metadata_fetcher.py
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, wait
+from dataclasses import dataclass, field
+
+import yfinance as yf
+
+# Our column name -> field in Yahoo's quote response
+METADATA_FIELDS = {
+    'name': 'shortName',
+    'currency': 'currency',
+    'bid': 'bid',
+    'ask': 'ask',
+    'year_high': 'fiftyTwoWeekHigh',
+    'year_low': 'fiftyTwoWeekLow',
+    'market_cap': 'marketCap',
+}
+
+
+@dataclass
+class MetadataResult:
+    """Metadata for one ticker. `fields` keeps whatever arrived, even if the last attempt failed."""
+    ticker: str
+    fields: dict = field(default_factory=dict)
+    error: str = None
+    attempts: int = 0
+    elapsed: float = 0.0
+
+    @property
+    def ok(self):
+        return self.error is None
+
+    @property
+    def complete(self):
+        return all(self.fields.get(name) is not None for name in METADATA_FIELDS)
+
+
+def fetch_ticker_info(ticker):
+    """Fetches one ticker's metadata via yf.Ticker(...).info, keyed by our column names."""
+    info = yf.Ticker(ticker).info or {}
+    return {name: info[key] for name, key in METADATA_FIELDS.items() if info.get(key) is not None}
+
+
+def _start_attempt(fetch_one, ticker):
+    """
+    Runs one fetch on its own daemon thread and returns its Future. A pool thread stuck in
+    a hung request would keep its slot forever and stall every attempt queued behind it, so
+    each attempt gets a thread that can simply be abandoned.
+    """
+    future = Future()
+
+    def run():
+        if not future.set_running_or_notify_cancel():
+            return
+        try:
+            future.set_result(fetch_one(ticker))
+        except BaseException as e:
+            future.set_exception(e)
+
+    threading.Thread(target=run, name=f"metadata-{ticker}", daemon=True).start()
+    return future
+
+
+def fetch_metadata_concurrently(tickers, fetch_one=fetch_ticker_info, max_workers=8, timeout=5.0, retries=2, backoff=0.25,
+                                total_timeout=None):
+    """
+    Fetches metadata for each ticker with at most `max_workers` attempts in flight.
+
+    Every attempt starts right away on its own thread and gets `timeout` seconds. Failed or
+    timed-out attempts are retried up to `retries` times with exponential backoff. A request
+    that hangs is abandoned rather than waited for, and its thread no longer counts against
+    `max_workers`, so a hung ticker never delays or times out the healthy ones and total
+    time is bounded by the slowest ticker's attempts instead of the sum over all tickers.
+    With `total_timeout`, the whole fetch stops after that many seconds however many
+    tickers are left: unfinished attempts are abandoned and queued retries dropped.
+    Returns {ticker: MetadataResult}.
+    """
+    results = {ticker: MetadataResult(ticker) for ticker in tickers}
+    queue = [(0.0, ticker) for ticker in results]  # (not before, ticker)
+    pending = {}  # future -> (ticker, deadline)
+    started = time.monotonic()
+    give_up = started + total_timeout if total_timeout is not None else float('inf')
+
+    def schedule_retry(ticker, error, now):
+        result = results[ticker]
+        result.error = error
+        if result.attempts <= retries:
+            queue.append((now + backoff * 2 ** (result.attempts - 1), ticker))
+        else:
+            result.elapsed = now - started
+
+    while queue or pending:
+        now = time.monotonic()
+        queue.sort()
+        while queue and queue[0][0] <= now and len(pending) < max_workers:
+            _, ticker = queue.pop(0)
+            results[ticker].attempts += 1
+            pending[_start_attempt(fetch_one, ticker)] = (ticker, min(time.monotonic() + timeout, give_up))
+
+        wake_ups = [give_up] + [deadline for _, deadline in pending.values()]
+        if queue and len(pending) < max_workers:
+            wake_ups.append(queue[0][0])
+        done, _ = wait(list(pending), timeout=max(0.0, min(wake_ups) - now), return_when=FIRST_COMPLETED)
+
+        now = time.monotonic()
+        for future in done:
+            ticker, _ = pending.pop(future)
+            result = results[ticker]
+            try:
+                result.fields.update(future.result() or {})
+                result.error = None
+                result.elapsed = now - started
+            except Exception as e:
+                schedule_retry(ticker, f"{type(e).__name__}: {e}", now)
+
+        for future, (ticker, deadline) in list(pending.items()):
+            if deadline <= now:
+                # The thread can't be interrupted; stop waiting for it and free its slot
+                del pending[future]
+                schedule_retry(ticker, f"timed out after {timeout}s", now)
+
+        if now >= give_up:
+            for ticker in [ticker for ticker, _ in pending.values()] + [ticker for _, ticker in queue]:
+                results[ticker].error = f"gave up after {total_timeout}s"
+                results[ticker].elapsed = now - started
+            pending.clear()
+            queue.clear()
+    return results
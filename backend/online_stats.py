@@ -0,0 +1,164 @@
+# backend/online_stats.py
+"""
+Expanding and rolling statistics for whole return series in one linear pass. Each running
+statistic is written as the Welford/Terriberry update it would get from an online
+accumulator (mean, second and third central moments), and since every update only needs
+the previous point's values, the whole series is a few element-wise array operations and a
+cumulative sum rather than a Python loop or an O(n^2) recompute per prefix.
+
+    stats = expanding_stats(returns_panel)   # dict of DataFrames shaped like the panel
+    stats['std'].iloc[-1]                     # full-sample volatility per symbol
+    rolling_moments(returns, 30)['std']       # one value per full 30-period window
+
+Everything works along the first axis, so a 2-D panel (periods x symbols) gives one column
+per symbol. Expanding statistics skip missing returns (NaN); a rolling window with a missing
+return is NaN.
+"""
+import numpy as np
+import pandas as pd
+
+STAT_NAMES = ['count', 'mean', 'std', 'skew', 'min', 'max', 'drawdown', 'max_drawdown']
+
+
+def _previous(values, first):
+    """`values` shifted down one row along the first axis, with `first` in the top row."""
+    shifted = np.empty_like(values)
+    shifted[0] = first
+    shifted[1:] = values[:-1]
+    return shifted
+
+
+def _skew(count, m2, m3):
+    """Population skewness from moment sums; 0 where there is no spread."""
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.where(m2 > 0, np.sqrt(count) * m3 / np.maximum(m2, 1e-300) ** 1.5, 0.0)
+
+
+def expanding_moments(values):
+    """
+    Count, mean, population variance and skewness of values[:i + 1] for every i, from the
+    running Welford (M2) and Terriberry (M3) updates:
+        delta = x - mean[n-1],  mean[n] = mean[n-1] + delta / n
+        M2[n] = M2[n-1] + delta * (x - mean[n])
+        M3[n] = M3[n-1] + delta^3 (n-1)(n-2) / n^2 - 3 delta M2[n-1] / n
+    Missing values leave every statistic where it was (NaN until the first value).
+    """
+    values = np.asarray(values, dtype=float)
+    finite = np.isfinite(values)
+    # Moments don't change under a shift; centering on the first value keeps the sums small
+    origin = np.where(finite[0], values[0], 0.0) if len(values) else 0.0
+    x = np.where(finite, values - origin, 0.0)
+
+    count = np.cumsum(finite, axis=0, dtype=float)
+    safe_count = np.maximum(count, 1)
+    mean = np.cumsum(x, axis=0) / safe_count
+    previous_mean = _previous(mean, 0.0)
+    delta = np.where(finite, x - previous_mean, 0.0)
+    m2 = np.maximum(np.cumsum(delta * (x - mean) * finite, axis=0), 0.0)
+    previous_m2 = _previous(m2, 0.0)
+    m3 = np.cumsum(
+        delta ** 3 * (count - 1) * (count - 2) / safe_count ** 2 - 3 * delta * previous_m2 / safe_count, axis=0
+    )
+
+    empty = count == 0
+    return {
+        'count': count,
+        'mean': np.where(empty, np.nan, mean + origin),
+        'variance': np.where(empty, np.nan, m2 / safe_count),
+        'skew': np.where(empty, np.nan, _skew(count, m2, m3)),
+    }
+
+
+def running_drawdown(returns):
+    """
+    Drawdown of compounded wealth after each period (wealth / running peak - 1, starting from
+    a peak of 1) and the worst drawdown so far, both as negative fractions.
+    """
+    returns = np.asarray(returns, dtype=float)
+    wealth = np.cumprod(1 + np.nan_to_num(returns), axis=0)
+    peaks = np.maximum(np.maximum.accumulate(wealth, axis=0), 1.0)
+    drawdown = wealth / peaks - 1
+    return drawdown, np.minimum.accumulate(np.minimum(drawdown, 0.0), axis=0)
+
+
+def expanding_stats(returns):
+    """
+    Every expanding statistic in STAT_NAMES for a returns series or panel: count, mean, std
+    (population, like np.std), skew, min, max, drawdown and max_drawdown after each period.
+    A DataFrame or Series gives a dict of DataFrames/Series on the same index; an array gives
+    a dict of arrays.
+    """
+    values = returns.to_numpy(dtype=float) if isinstance(returns, (pd.DataFrame, pd.Series)) else np.asarray(returns, dtype=float)
+    moments = expanding_moments(values)
+    drawdown, max_drawdown = running_drawdown(values)
+    stats = {
+        'count': moments['count'],
+        'mean': moments['mean'],
+        'std': np.sqrt(moments['variance']),
+        'skew': moments['skew'],
+        # fmin/fmax skip NaN, so a missing return doesn't wipe out the running extremes
+        'min': np.fmin.accumulate(values, axis=0) if len(values) else values,
+        'max': np.fmax.accumulate(values, axis=0) if len(values) else values,
+        'drawdown': drawdown,
+        'max_drawdown': max_drawdown,
+    }
+    if isinstance(returns, pd.DataFrame):
+        return {name: pd.DataFrame(stat, index=returns.index, columns=returns.columns) for name, stat in stats.items()}
+    if isinstance(returns, pd.Series):
+        return {name: pd.Series(stat, index=returns.index, name=returns.name) for name, stat in stats.items()}
+    return stats
+
+
+def rolling_moments(values, window, skew=True):
+    """
+    Mean, population variance, std and skewness of every full `window`-length slice along the
+    first axis (n - window + 1 rows). The first window is summed directly; each slide then
+    removes the oldest value and adds the newest with the inverse and forward Welford /
+    Terriberry updates, so the cost is linear in n whatever the window. skew=False skips the
+    third moment (and leaves 'skew' out) when only the volatility is needed.
+    """
+    values = np.asarray(values, dtype=float)
+    if len(values) < window:
+        empty = np.empty((0,) + values.shape[1:])
+        return {name: empty for name in (['mean', 'variance', 'std', 'skew'] if skew else ['mean', 'variance', 'std'])}
+    if window == 1:
+        # Every window is a single value: no spread, and nothing for the updates to do
+        spread = np.where(np.isfinite(values), 0.0, np.nan)
+        moments = {'mean': values, 'variance': spread, 'std': spread}
+        return {**moments, 'skew': spread} if skew else moments
+    finite = np.isfinite(values)
+    origin = np.where(finite[:window], values[:window], 0.0).sum(axis=0) / np.maximum(finite[:window].sum(axis=0), 1)
+    # Zero-filled values still obey the update identities; windows with a gap are masked below
+    x = np.where(finite, values - origin, 0.0)
+    w = float(window)
+
+    first = x[:window]
+    first_mean = first.mean(axis=0)
+    first_m2 = ((first - first_mean) ** 2).sum(axis=0)
+    first_m3 = ((first - first_mean) ** 3).sum(axis=0) if skew else None
+
+    old, new = x[:-window], x[window:]
+    sums = np.cumsum(np.concatenate([first.sum(axis=0, keepdims=True), new - old]), axis=0)
+    mean = sums / w
+    previous_mean = mean[:-1]
+    m2_steps = (new - old) * (new - mean[1:] + old - previous_mean)
+    m2 = np.maximum(np.cumsum(np.concatenate([first_m2[None], m2_steps]), axis=0), 0.0)
+    moments = {'mean': mean + origin, 'variance': m2 / w}
+    if skew:
+        # Removing `old` leaves window - 1 values with this mean and M2; M3 then gets the
+        # inverse Terriberry update for `old` and the forward one for `new`
+        middle_mean = (w * previous_mean - old) / (w - 1)
+        middle_m2 = m2[:-1] - (old - middle_mean) * (old - previous_mean)
+        removed = old - middle_mean
+        added = new - middle_mean
+        scale = (w - 1) * (w - 2) / (w * w)
+        m3_steps = (added ** 3 - removed ** 3) * scale - 3 * (added - removed) * middle_m2 / w
+        m3 = np.cumsum(np.concatenate([first_m3[None], m3_steps]), axis=0)
+        moments['skew'] = _skew(w, m2, m3)
+
+    if not finite.all():
+        missing = np.cumsum(~finite, axis=0)
+        gaps = missing[window - 1:] - np.concatenate([np.zeros((1,) + missing.shape[1:]), missing[:-window]]) > 0
+        moments = {name: np.where(gaps, np.nan, stat) for name, stat in moments.items()}
+    moments['std'] = np.sqrt(moments['variance'])
+    return moments
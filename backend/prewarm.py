@@ -0,0 +1,330 @@
+# backend/prewarm.py
+"""
+Cache warm-up before the first users arrive. A Prewarmer runs on a cron-like Schedule
+(by default 09:20 New York time on weekdays, ten minutes before the open) and fetches
+the configured symbol universes plus the symbols viewed most in UsageStats:
+  - the quote hub's symbol sets, which the hub then keeps polling past the open,
+  - metadata the MetadataCache doesn't have yet,
+  - history at the configured (interval, period) pairs and the most viewed charts.
+Provider requests go through a token bucket, so a warm-up never takes more than its
+share of the rate limit. progress() and coverage() report how far it got.
+
+Configured through PREWARM_* environment variables (see below).
+"""
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from zoneinfo import ZoneInfo
+
+from backend.metadata_cache import ROOT_DIR
+from backend.twelve_data import TokenBucket
+
+PREWARM_ENABLED = os.environ.get("PREWARM_ENABLED", "1") != "0"
+# minute hour day-of-month month day-of-week, in PREWARM_TIMEZONE
+PREWARM_SCHEDULE = os.environ.get("PREWARM_SCHEDULE", "20 9 * * 1-5")
+PREWARM_TIMEZONE = os.environ.get("PREWARM_TIMEZONE", "America/New_York")
+# Catalog tags whose symbols are always warmed; the quote hub serves one symbol set per PREWARM_QUOTE_TAGS tag
+PREWARM_TAGS = os.environ.get("PREWARM_TAGS", "top_quotes charts").split()
+PREWARM_QUOTE_TAGS = os.environ.get("PREWARM_QUOTE_TAGS", "top_quotes").split()
+# interval:period pairs fetched for every warmed symbol (the detail view's default and daily charts)
+PREWARM_HISTORY = [tuple(pair.split(":")) for pair in os.environ.get("PREWARM_HISTORY", "5m:1d 1d:1y").split()]
+# How many of the most viewed symbols and charts are added to the configured universe
+PREWARM_TOP_N = int(os.environ.get("PREWARM_TOP_N", 50))
+PREWARM_REQUESTS_PER_MINUTE = int(os.environ.get("PREWARM_REQUESTS_PER_MINUTE", 60))
+# How long the quote hub keeps polling a warmed symbol set nobody has read yet (seconds)
+PREWARM_HOLD_SECONDS = float(os.environ.get("PREWARM_HOLD_SECONDS", 1800))
+DEFAULT_USAGE_PATH = os.environ.get("USAGE_STATS_PATH", os.path.join(ROOT_DIR, ".cache", "usage.json"))
+
+# (low, high) of each cron field; day-of-week 7 is Sunday as well as 0
+CRON_FIELDS = [(0, 59), (0, 23), (1, 31), (1, 12), (0, 7)]
+
+
+def parse_cron_field(text, low, high):
+    """Set of values matched by one cron field: *, n, a-b, lists of those, each with an optional /step."""
+    values = set()
+    for part in text.split(','):
+        spec, _, step = part.partition('/')
+        if spec == '*':
+            start, end = low, high
+        elif '-' in spec:
+            start, end = (int(value) for value in spec.split('-'))
+        else:
+            start = int(spec)
+            end = high if step else start
+        if not low <= start <= end <= high:
+            raise ValueError(f"cron field {text!r} is outside {low}-{high}")
+        values.update(range(start, end + 1, int(step or 1)))
+    return values
+
+
+class Schedule:
+    """Five-field cron expression evaluated in `timezone`, e.g. "20 9 * * 1-5"."""
+
+    def __init__(self, expression=PREWARM_SCHEDULE, timezone=PREWARM_TIMEZONE):
+        fields = expression.split()
+        if len(fields) != 5:
+            raise ValueError(f"expected 5 cron fields, got {expression!r}")
+        self.expression = expression
+        self.timezone = ZoneInfo(timezone)
+        self.minutes, self.hours, self.days, self.months, weekdays = (
+            parse_cron_field(field, low, high) for field, (low, high) in zip(fields, CRON_FIELDS)
+        )
+        self.weekdays = {day % 7 for day in weekdays}
+        # Like cron: if both day fields are restricted, a day matching either one runs
+        self.either_day = fields[2] != '*' and fields[4] != '*'
+
+    def _day_matches(self, moment):
+        day = moment.day in self.days
+        weekday = moment.isoweekday() % 7 in self.weekdays
+        return (day or weekday) if self.either_day else (day and weekday)
+
+    def next_after(self, when=None):
+        """Epoch seconds of the first matching minute after `when` (default now)."""
+        moment = datetime.fromtimestamp(time.time() if when is None else when, self.timezone)
+        moment = moment.replace(second=0, microsecond=0) + timedelta(minutes=1)
+        limit = moment + timedelta(days=5 * 366)
+        # Skip whole months, days and hours that can't match instead of stepping minute by minute
+        while moment < limit:
+            if moment.month not in self.months:
+                moment = (moment.replace(day=1, hour=0, minute=0) + timedelta(days=32)).replace(day=1)
+            elif not self._day_matches(moment):
+                moment = moment.replace(hour=0, minute=0) + timedelta(days=1)
+            elif moment.hour not in self.hours:
+                moment = moment.replace(minute=0) + timedelta(hours=1)
+            elif moment.minute not in self.minutes:
+                moment += timedelta(minutes=1)
+            else:
+                return moment.timestamp()
+        raise ValueError(f"{self.expression!r} never matches")
+
+
+class UsageStats:
+    """
+    Decaying view counts per symbol and per (symbol, interval, period) chart: each view
+    adds 1 and a score halves every `half_life` seconds, so recent interest outweighs old.
+    Thread-safe; save() writes the counts to `path` (None keeps them in memory only).
+    """
+
+    def __init__(self, path=DEFAULT_USAGE_PATH, half_life=7 * 86400, max_entries=5000, clock=time.time):
+        self.path = path
+        self.half_life = half_life
+        self.max_entries = max_entries
+        self.clock = clock
+        self._scores = {}  # (symbol, interval, period) -> (score, updated_at); interval None for the symbol total
+        self._lock = threading.Lock()
+        self._dirty = False
+        if path and os.path.exists(path):
+            with open(path) as f:
+                for symbol, interval, period, score, updated_at in json.load(f):
+                    self._scores[(symbol, interval, period)] = (score, updated_at)
+
+    def _score(self, entry, now):
+        score, updated_at = entry
+        return score * 0.5 ** ((now - updated_at) / self.half_life)
+
+    def record(self, symbol, interval=None, period=None):
+        """Counts one view of `symbol`, and of its chart if `interval` is given."""
+        now = self.clock()
+        keys = [(symbol, None, None)] + ([(symbol, interval, period)] if interval else [])
+        with self._lock:
+            for key in keys:
+                entry = self._scores.get(key)
+                self._scores[key] = ((self._score(entry, now) if entry else 0.0) + 1.0, now)
+            self._dirty = True
+
+    def _top(self, charts, n):
+        now = self.clock()
+        with self._lock:
+            scored = [(self._score(entry, now), key) for key, entry in self._scores.items() if (key[1] is not None) == charts]
+        scored.sort(key=lambda item: -item[0])
+        return [key for _, key in scored[:n]]
+
+    def top_symbols(self, n):
+        """The `n` most viewed symbols, most viewed first."""
+        return [symbol for symbol, _, _ in self._top(False, n)]
+
+    def top_charts(self, n):
+        """The `n` most viewed (symbol, interval, period) charts, most viewed first."""
+        return self._top(True, n)
+
+    def save(self):
+        """Writes the scores (the `max_entries` highest) to `path` if anything changed."""
+        if not self.path:
+            return
+        now = self.clock()
+        with self._lock:
+            if not self._dirty:
+                return
+            ranked = sorted(self._scores.items(), key=lambda item: -self._score(item[1], now))
+            self._scores = dict(ranked[:self.max_entries])
+            rows = [[*key, score, updated_at] for key, (score, updated_at) in self._scores.items()]
+            self._dirty = False
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        tmp_path = f"{self.path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(rows, f)
+        os.replace(tmp_path, self.path)
+
+
+@dataclass(frozen=True)
+class PrewarmTask:
+    kind: str           # 'quotes', 'metadata' or 'history'
+    symbols: tuple
+    interval: str = None
+    period: str = None
+
+
+class Prewarmer:
+    """
+    Fetches what the first sessions of the day will ask for, on `schedule`. `provider` is
+    the blocking SyncProvider facade; quotes and history are fetched through the hub and
+    the store, so they land exactly where the app reads them. Tasks whose cache is already
+    fresh cost nothing; the rest wait for the token bucket (`requests_per_minute`).
+    """
+
+    def __init__(self, provider, history_store, metadata_cache, quote_hub, catalog, usage, schedule=None,
+                 tags=PREWARM_TAGS, quote_tags=PREWARM_QUOTE_TAGS, history=PREWARM_HISTORY, top_n=PREWARM_TOP_N,
+                 requests_per_minute=PREWARM_REQUESTS_PER_MINUTE, hold=PREWARM_HOLD_SECONDS, workers=4, metadata_batch=20):
+        self.provider = provider
+        self.history_store = history_store
+        self.metadata_cache = metadata_cache
+        self.quote_hub = quote_hub
+        self.catalog = catalog
+        self.usage = usage
+        self.schedule = schedule or Schedule()
+        self.tags = tags
+        self.quote_tags = quote_tags
+        self.history = history
+        self.top_n = top_n
+        self.hold = hold
+        self.workers = workers
+        burst = max(1, requests_per_minute // 8)
+        self.limiter = TokenBucket(rate=requests_per_minute / 60, capacity=burst)
+        self.metadata_batch = min(metadata_batch, burst)
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+        self._next_run = None
+        self._progress = {'state': 'idle', 'runs': 0, 'total': 0, 'done': 0, 'fetched': 0, 'failed': 0,
+                          'started_at': None, 'finished_at': None, 'last_error': None}
+
+    def symbols(self):
+        """Symbols to warm: the most viewed first, then the configured universes."""
+        configured = [ticker for tag in self.tags for ticker in self.catalog.filter(tag=tag).tickers]
+        return list(dict.fromkeys(self.usage.top_symbols(self.top_n) + configured))
+
+    def plan(self):
+        """Tasks for one warm-up, in the order they run: quotes, metadata, history."""
+        symbols = self.symbols()
+        tasks = [PrewarmTask('quotes', self.catalog.filter(tag=tag).tickers) for tag in self.quote_tags]
+        tasks += [PrewarmTask('metadata', tuple(symbols[i:i + self.metadata_batch]))
+                  for i in range(0, len(symbols), self.metadata_batch)]
+        charts = self.usage.top_charts(self.top_n)
+        charts += [(symbol, interval, period) for symbol in symbols for interval, period in self.history]
+        tasks += [PrewarmTask('history', (symbol,), interval, period) for symbol, interval, period in dict.fromkeys(charts)]
+        return tasks
+
+    def warm(self, task):
+        """Runs one task; returns False if its cache was already fresh and nothing was fetched."""
+        if task.kind == 'quotes':
+            current = self.quote_hub.peek(task.symbols)
+            if current is not None and current.age < self.quote_hub.interval:
+                return False
+            self.limiter.acquire(1)
+            self.quote_hub.prefetch(task.symbols, hold=self.hold)
+        elif task.kind == 'metadata':
+            found = self.metadata_cache.get_many(task.symbols)
+            missing = [symbol for symbol in task.symbols if symbol not in found]
+            if not missing:
+                return False
+            self.limiter.acquire(len(missing))
+            self.metadata_cache.put_many({ticker: fields for ticker, fields in self.provider.metadata(missing).items() if fields})
+        else:
+            symbol = task.symbols[0]
+            if self.history_store.is_fresh(symbol, task.interval, task.period):
+                return False
+            self.limiter.acquire(1)
+            self.history_store.refresh(symbol, task.interval, task.period)
+        return True
+
+    def run_once(self):
+        """Warms everything in plan() now and returns progress()."""
+        tasks = self.plan()
+        with self._lock:
+            self._progress.update(state='running', total=len(tasks), done=0, fetched=0, failed=0,
+                                  started_at=time.time(), finished_at=None, last_error=None)
+            self._progress['runs'] += 1
+        with ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="prewarm") as pool:
+            futures = [pool.submit(self.warm, task) for task in tasks]
+            for future in as_completed(futures):
+                with self._lock:
+                    self._progress['done'] += 1
+                    if future.exception() is not None:
+                        self._progress['failed'] += 1
+                        self._progress['last_error'] = f"{type(future.exception()).__name__}: {future.exception()}"
+                    elif future.result():
+                        self._progress['fetched'] += 1
+        self.usage.save()
+        with self._lock:
+            self._progress.update(state='idle', finished_at=time.time())
+        return self.progress()
+
+    def progress(self):
+        """State of the current or last warm-up, and when the next one is due (epoch seconds)."""
+        with self._lock:
+            return {**self._progress, 'next_run': self._next_run,
+                    'running': self._thread is not None and self._thread.is_alive()}
+
+    def coverage(self):
+        """{kind: {'warm', 'total'}} over the current plan, plus the overall 'ratio' served warm."""
+        counts = {kind: {'warm': 0, 'total': 0} for kind in ('quotes', 'metadata', 'history')}
+        for task in self.plan():
+            if task.kind == 'quotes':
+                current = self.quote_hub.peek(task.symbols)
+                warm = int(current is not None and current.age < 2 * self.quote_hub.interval)
+                total = 1
+            elif task.kind == 'metadata':
+                warm, total = len(self.metadata_cache.get_many(task.symbols)), len(task.symbols)
+            else:
+                warm, total = int(self.history_store.is_warm(task.symbols[0], task.interval, task.period)), 1
+            counts[task.kind]['warm'] += warm
+            counts[task.kind]['total'] += total
+        warm = sum(count['warm'] for count in counts.values())
+        total = sum(count['total'] for count in counts.values())
+        return {**counts, 'ratio': warm / total if total else 1.0}
+
+    def start(self, run_now=False, poll=60.0):
+        """Starts the scheduler thread (idempotent); usage stats are saved every `poll` seconds."""
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return self
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, args=(run_now, poll), name="prewarm", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self, timeout=None):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def _run(self, run_now, poll):
+        while not self._stop.is_set():
+            if not run_now:
+                next_run = self.schedule.next_after()
+                with self._lock:
+                    self._next_run = next_run
+                while time.time() < next_run:
+                    if self._stop.wait(min(poll, max(0.0, next_run - time.time()))):
+                        return
+                    self.usage.save()
+            run_now = False
+            try:
+                self.run_once()
+            except Exception as e:
+                with self._lock:
+                    self._progress.update(state='idle', last_error=f"{type(e).__name__}: {e}")
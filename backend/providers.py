@@ -0,0 +1,332 @@
+# backend/providers.py
+"""
+Market-data providers behind the AsyncProvider interface, and how the app picks them:
+
+  yahoo       YahooAsyncProvider (yfinance), the default
+  twelvedata  TwelveDataProvider (Twelve Data REST API, key in TWELVE_DATA_API_KEY)
+  simulated   SimulatedProvider: deterministic data from backend.market_sim, no network
+  replay      ReplayProvider: responses captured in a cassette directory, served from
+              disk after the latency measured when they were recorded
+  record:X    provider X, with every response written to the cassette
+
+MARKET_DATA_PROVIDER names the default and MARKET_DATA_{QUOTES,HISTORY,METADATA,FX}_PROVIDER
+override it per data type; MARKET_DATA_CASSETTE is the cassette directory. Capture one for
+the app's symbol universes with `python -m backend.providers record`.
+"""
+import argparse
+import asyncio
+import hashlib
+import json
+import os
+import pickle
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+
+from backend.async_provider import AsyncProvider, SyncProvider, ThreadedProvider, YahooAsyncProvider
+from backend.history_store import period_days, period_window
+from backend.market_sim import seed_for, simulate_ohlcv
+from backend.metadata_cache import ROOT_DIR
+from backend.quote_snapshot import BAR_FIELDS, build_quote_frame
+from backend.twelve_data import TwelveDataClient
+
+DEFAULT_CASSETTE_PATH = os.environ.get("MARKET_DATA_CASSETTE", os.path.join(ROOT_DIR, ".cache", "cassette"))
+
+# Data type -> the AsyncProvider methods serving it
+DATA_TYPES = {
+    'quotes': ['quote_snapshot'],
+    'history': ['history'],
+    'metadata': ['metadata'],
+    'fx': ['exchange_rate'],
+}
+
+
+class TwelveDataProvider(ThreadedProvider):
+    """Twelve Data behind the async interface, through one shared TwelveDataClient."""
+
+    def __init__(self, client=None, max_concurrency=8, timeout=30.0):
+        super().__init__(max_concurrency, timeout)
+        self.client = client or TwelveDataClient()
+
+    async def quote_snapshot(self, tickers, metadata_cache=None):
+        return await self._call(self.client.quotes, list(tickers))
+
+    async def metadata(self, tickers):
+        quotes = await self._call(self.client.quotes, list(dict.fromkeys(tickers)))
+        fields = quotes.set_index('ticker')[['name', 'currency', 'year_high', 'year_low']]
+        return {
+            ticker: {name: value for name, value in row.items() if pd.notna(value)}
+            for ticker, row in fields.iterrows() if pd.notna(row['currency'])
+        }
+
+    async def history(self, symbol, interval, period=None, start=None):
+        if start is None and period not in (None, 'max'):
+            start = pd.Timestamp.now() - pd.Timedelta(days=period_days(period))
+        return await self._call(self.client.time_series, symbol, interval, start=start)
+
+    async def exchange_rate(self, base, quote="USD"):
+        if base == quote:
+            return {'rate': 1.0, 'change_pct': 0.0}
+        row = (await self._call(self.client.quotes, [f"{base}/{quote}"])).iloc[0]
+        if pd.isna(row['last_price']):
+            raise ValueError(f"no rate for {base}/{quote}")
+        return {'rate': float(row['last_price']), 'change_pct': float(row['change_pct'])}
+
+
+# yfinance interval -> bar spacing for simulated history
+SIMULATED_FREQUENCIES = {
+    '1m': '1min', '2m': '2min', '5m': '5min', '15m': '15min', '30m': '30min', '60m': '60min', '1h': '60min',
+    '1d': '1D', '1wk': '1W', '1mo': '1MS',
+}
+
+
+class SimulatedProvider(AsyncProvider):
+    """
+    Deterministic market data for offline runs: the same (seed, symbol) always gives the
+    same quotes, bars and rates. Each call waits `latency` seconds, like a round trip.
+    History is one fixed series of `max_bars` bars per symbol and interval ending at `end`,
+    so period and start queries agree with each other.
+    """
+
+    def __init__(self, seed=0, latency=0.0, names=None, end="2024-12-31 16:00", max_bars=20_000):
+        self.seed = seed
+        self.latency = latency
+        self.names = names or {}
+        self.end = pd.Timestamp(end, tz="America/New_York")
+        self.max_bars = max_bars
+
+    async def _wait(self):
+        if self.latency:
+            await asyncio.sleep(self.latency)
+
+    async def quote_snapshot(self, tickers, metadata_cache=None):
+        await self._wait()
+        tickers = list(tickers)
+        last = np.vstack([simulate_ohlcv(1, seed=seed_for(self.seed, ticker)).to_numpy()[0] for ticker in tickers])
+        bars = pd.DataFrame(last.reshape(1, -1), index=pd.DatetimeIndex([self.end.normalize()], name="Date"),
+                            columns=pd.MultiIndex.from_product([tickers, BAR_FIELDS]))
+        records = [{'symbol': ticker, 'shortName': self.names.get(ticker, ticker), 'currency': "USD"} for ticker in tickers]
+        return build_quote_frame(bars, records, tickers)
+
+    async def metadata(self, tickers):
+        await self._wait()
+        return {ticker: {'name': self.names.get(ticker, ticker), 'currency': "USD"} for ticker in tickers}
+
+    async def history(self, symbol, interval, period=None, start=None):
+        await self._wait()
+        freq = SIMULATED_FREQUENCIES.get(interval, '1D')
+        index = pd.date_range(end=self.end, periods=self.max_bars, freq=freq,
+                              name="Date" if interval in ('1d', '1wk', '1mo') else "Datetime")
+        bars = simulate_ohlcv(len(index), seed=seed_for(self.seed, symbol, interval), index=index)
+        if start is not None:
+            return bars[bars.index >= pd.Timestamp(start)]
+        return period_window(bars, period)
+
+    async def exchange_rate(self, base, quote="USD"):
+        await self._wait()
+        if base == quote:
+            return {'rate': 1.0, 'change_pct': 0.0}
+        rng = np.random.default_rng(seed_for(self.seed, base, quote))
+        return {'rate': float(rng.lognormal(0, 1)), 'change_pct': float(rng.normal(0, 0.5))}
+
+
+def call_key(method, args):
+    """Stable cassette key for a provider call; list and tuple arguments are equivalent."""
+    normalized = tuple(tuple(arg) if isinstance(arg, (list, tuple)) else arg for arg in args)
+    return hashlib.blake2b(repr((method,) + normalized).encode(), digest_size=12).hexdigest()
+
+
+class Cassette:
+    """
+    Directory of recorded provider responses: one pickle per call plus index.json with
+    the call, its arguments and how long the provider took to answer.
+    """
+
+    def __init__(self, path=DEFAULT_CASSETTE_PATH):
+        self.path = path
+        self._lock = threading.Lock()
+        index_path = os.path.join(path, "index.json")
+        if os.path.exists(index_path):
+            with open(index_path) as f:
+                self.index = json.load(f)
+        else:
+            self.index = {}
+
+    def __len__(self):
+        return len(self.index)
+
+    def put(self, method, args, value, latency):
+        key = call_key(method, args)
+        os.makedirs(self.path, exist_ok=True)
+        with open(os.path.join(self.path, f"{key}.pkl"), "wb") as f:
+            pickle.dump(value, f, protocol=pickle.HIGHEST_PROTOCOL)
+        with self._lock:
+            self.index[key] = {'method': method, 'args': repr(args), 'latency': latency}
+            tmp_path = os.path.join(self.path, f"index.json.{os.getpid()}.tmp")
+            with open(tmp_path, "w") as f:
+                json.dump(self.index, f, indent=1, sort_keys=True)
+            os.replace(tmp_path, os.path.join(self.path, "index.json"))
+
+    def get(self, method, args):
+        """(value, recorded latency) for the call, read from disk; KeyError if it wasn't recorded."""
+        key = call_key(method, args)
+        entry = self.index.get(key)
+        if entry is None:
+            raise KeyError(f"{method}{tuple(args)!r} is not in the cassette at {self.path}")
+        with open(os.path.join(self.path, f"{key}.pkl"), "rb") as f:
+            return pickle.load(f), entry['latency']
+
+
+class RecordingProvider(AsyncProvider):
+    """Passes calls to `inner` and writes each response and its latency to the cassette."""
+
+    def __init__(self, inner, cassette):
+        self.inner = inner
+        self.cassette = cassette
+
+    async def _record(self, method, args, call):
+        start = time.perf_counter()
+        value = await call
+        self.cassette.put(method, args, value, time.perf_counter() - start)
+        return value
+
+    async def quote_snapshot(self, tickers, metadata_cache=None):
+        tickers = list(tickers)
+        return await self._record('quote_snapshot', (tickers,), self.inner.quote_snapshot(tickers, metadata_cache))
+
+    async def metadata(self, tickers):
+        tickers = list(tickers)
+        return await self._record('metadata', (tickers,), self.inner.metadata(tickers))
+
+    async def history(self, symbol, interval, period=None, start=None):
+        return await self._record('history', (symbol, interval, period, start), self.inner.history(symbol, interval, period, start))
+
+    async def exchange_rate(self, base, quote="USD"):
+        return await self._record('exchange_rate', (base, quote), self.inner.exchange_rate(base, quote))
+
+
+class ReplayProvider(AsyncProvider):
+    """
+    Serves a cassette: every answer is read from disk after the latency recorded with it,
+    times `latency_scale` (0 replays as fast as the disk allows), or a fixed `latency`.
+    A call that was never recorded raises KeyError rather than reaching the network.
+    """
+
+    def __init__(self, cassette, latency=None, latency_scale=1.0):
+        self.cassette = cassette
+        self.latency = latency
+        self.latency_scale = latency_scale
+
+    async def _replay(self, method, args):
+        value, recorded = self.cassette.get(method, args)
+        delay = (recorded if self.latency is None else self.latency) * self.latency_scale
+        if delay:
+            await asyncio.sleep(delay)
+        return value
+
+    async def quote_snapshot(self, tickers, metadata_cache=None):
+        return await self._replay('quote_snapshot', (list(tickers),))
+
+    async def metadata(self, tickers):
+        return await self._replay('metadata', (list(tickers),))
+
+    async def history(self, symbol, interval, period=None, start=None):
+        return await self._replay('history', (symbol, interval, period, start))
+
+    async def exchange_rate(self, base, quote="USD"):
+        return await self._replay('exchange_rate', (base, quote))
+
+
+class RoutingProvider(AsyncProvider):
+    """Sends each data type (see DATA_TYPES) to its own provider, `default` for the rest."""
+
+    def __init__(self, default, quotes=None, history=None, metadata=None, fx=None):
+        self.default = default
+        self.routes = {'quotes': quotes, 'history': history, 'metadata': metadata, 'fx': fx}
+        self.executor = getattr(default, 'executor', None)
+
+    def provider_for(self, data_type):
+        return self.routes.get(data_type) or self.default
+
+    async def quote_snapshot(self, tickers, metadata_cache=None):
+        return await self.provider_for('quotes').quote_snapshot(tickers, metadata_cache)
+
+    async def metadata(self, tickers):
+        return await self.provider_for('metadata').metadata(tickers)
+
+    async def history(self, symbol, interval, period=None, start=None):
+        return await self.provider_for('history').history(symbol, interval, period, start)
+
+    async def exchange_rate(self, base, quote="USD"):
+        return await self.provider_for('fx').exchange_rate(base, quote)
+
+
+PROVIDERS = {
+    'yahoo': YahooAsyncProvider,
+    'twelvedata': TwelveDataProvider,
+    'simulated': SimulatedProvider,
+}
+
+
+def make_provider(name, cassette_path=DEFAULT_CASSETTE_PATH):
+    """Provider for a name from the list in the module docstring."""
+    if name == 'replay':
+        return ReplayProvider(Cassette(cassette_path))
+    if name.startswith('record:'):
+        return RecordingProvider(make_provider(name.split(':', 1)[1], cassette_path), Cassette(cassette_path))
+    if name not in PROVIDERS:
+        raise ValueError(f"unknown market data provider {name!r}; expected one of {sorted(PROVIDERS)}, replay or record:<name>")
+    return PROVIDERS[name]()
+
+
+def provider_from_env(environ=os.environ):
+    """RoutingProvider configured by the MARKET_DATA_* variables; one instance per provider name."""
+    cassette_path = environ.get("MARKET_DATA_CASSETTE", DEFAULT_CASSETTE_PATH)
+    instances = {}
+
+    def named(name):
+        if name not in instances:
+            instances[name] = make_provider(name, cassette_path)
+        return instances[name]
+
+    default = named(environ.get("MARKET_DATA_PROVIDER", "yahoo"))
+    routes = {
+        data_type: named(environ[f"MARKET_DATA_{data_type.upper()}_PROVIDER"])
+        for data_type in DATA_TYPES if environ.get(f"MARKET_DATA_{data_type.upper()}_PROVIDER")
+    }
+    return RoutingProvider(default, **routes)
+
+
+def main():
+    from backend.symbol_catalog import SymbolCatalog
+
+    parser = argparse.ArgumentParser(description="Record a cassette of the app's market data for offline replay.")
+    parser.add_argument("command", choices=["record"])
+    parser.add_argument("cassette", nargs="?", default=DEFAULT_CASSETTE_PATH)
+    parser.add_argument("--provider", default="yahoo", choices=sorted(PROVIDERS))
+    parser.add_argument("--history", nargs="*", default=["1d:1y", "5m:5d"], help="interval:period pairs for the chart symbols")
+    args = parser.parse_args()
+
+    catalog = SymbolCatalog.load()
+    cassette = Cassette(args.cassette)
+    facade = SyncProvider(RecordingProvider(make_provider(args.provider), cassette))
+    indices = catalog.filter(tag='country_index')
+    calls = [
+        facade.provider.quote_snapshot(catalog.filter(tag='top_quotes').tickers),
+        facade.provider.quote_snapshot(indices.tickers),
+        facade.provider.metadata(catalog.filter(tag='top_quotes').tickers),
+        facade.provider.exchange_rates(sorted(set(indices.frame['currency'].dropna()))),
+    ]
+    for symbol in catalog.filter(tag='charts').tickers:
+        for pair in args.history:
+            interval, period = pair.split(":")
+            calls.append(facade.provider.history(symbol, interval, period))
+    results = facade.gather(*calls, return_exceptions=True)
+    failed = sum(isinstance(result, BaseException) for result in results)
+    print(f"Recorded {len(cassette)} responses to {args.cassette} ({failed} of {len(calls)} calls failed)")
+
+
+if __name__ == "__main__":
+    main()
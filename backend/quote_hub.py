@@ -0,0 +1,157 @@
+# backend/quote_hub.py
+import threading
+import time
+from dataclasses import dataclass
+
+from backend.single_flight import SingleFlight
+
+
+@dataclass(frozen=True)
+class QuoteSnapshot:
+    """
+    One published set of quotes. Snapshots are never modified after publication; with
+    pandas copy-on-write, a session that edits `frame` gets its own copy.
+    """
+    symbols: tuple
+    frame: object
+    fetched_at: float   # wall clock (time.time) when the fetch finished
+    version: int
+
+    @property
+    def age(self):
+        """Seconds since the quotes were fetched."""
+        return max(0.0, time.time() - self.fetched_at)
+
+
+class QuoteHub:
+    """
+    Process-wide quotes shared by every session. A single background thread refreshes
+    each subscribed symbol set every `interval` seconds and publishes a new QuoteSnapshot;
+    sessions only read the latest one, so N viewers cost one upstream fetch per interval.
+
+    Concurrent requests for a symbol set that has no snapshot yet (or one older than the
+    caller's `max_age`) are coalesced into a single fetch. Symbol sets nobody asked for in
+    `idle_after` seconds stop being polled. If a refresh fails, the previous snapshot stays
+    published and the error is kept in `stats()`.
+    """
+
+    def __init__(self, fetch, interval=15.0, idle_after=300.0):
+        self.fetch = fetch          # fetch(list_of_symbols) -> DataFrame
+        self.interval = interval
+        self.idle_after = idle_after
+        self._snapshots = {}        # symbols -> QuoteSnapshot
+        self._last_read = {}        # symbols -> monotonic time of the last snapshot() call
+        self._flight = SingleFlight("quote-hub-fetch")
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+        self._version = 0
+        self.requests = 0
+        self.errors = 0
+        self.last_error = None
+
+    def snapshot(self, symbols, max_age=None):
+        """
+        Latest snapshot for `symbols` (order is kept). Blocks only when there is none yet,
+        or when it is older than `max_age` seconds; the symbol set is polled from then on.
+        """
+        symbols = tuple(symbols)
+        with self._lock:
+            self.requests += 1
+            self._last_read[symbols] = max(self._last_read.get(symbols, 0.0), time.monotonic())
+            current = self._snapshots.get(symbols)
+        if current is not None and (max_age is None or current.age <= max_age):
+            return current
+        return self.refresh(symbols)
+
+    def peek(self, symbols):
+        """Current snapshot for `symbols` or None, without counting as a read or fetching."""
+        with self._lock:
+            return self._snapshots.get(tuple(symbols))
+
+    def prefetch(self, symbols, hold=0.0):
+        """
+        Fetches `symbols` now and keeps polling them for `hold` seconds plus the usual
+        `idle_after`, as if someone had read them, so the first real reader finds them fresh.
+        """
+        symbols = tuple(symbols)
+        with self._lock:
+            # _due() drops a set `idle_after` seconds after its last read; date the read forward
+            self._last_read[symbols] = max(self._last_read.get(symbols, 0.0), time.monotonic() + hold)
+        return self.refresh(symbols)
+
+    def refresh(self, symbols):
+        """Fetches and publishes `symbols` now, joining a fetch already in flight for them."""
+        symbols = tuple(symbols)
+        return self._flight.do(symbols, lambda: self._fetch(symbols))
+
+    def _fetch(self, symbols):
+        try:
+            frame = self.fetch(list(symbols))
+        except Exception as e:
+            with self._lock:
+                self.errors += 1
+                self.last_error = f"{type(e).__name__}: {e}"
+            raise
+        with self._lock:
+            self._version += 1
+            published = QuoteSnapshot(symbols=symbols, frame=frame, fetched_at=time.time(), version=self._version)
+            self._snapshots[symbols] = published
+        return published
+
+    def start(self):
+        """Starts the background refresher (idempotent)."""
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return self
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="quote-hub", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self, timeout=None):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def _due(self):
+        """Symbol sets whose snapshot is at least `interval` old; drops idle ones."""
+        now = time.monotonic()
+        due = []
+        with self._lock:
+            for symbols, last_read in list(self._last_read.items()):
+                if now - last_read > self.idle_after:
+                    del self._last_read[symbols]
+                    self._snapshots.pop(symbols, None)
+                    continue
+                current = self._snapshots.get(symbols)
+                if current is None or current.age >= self.interval:
+                    due.append(symbols)
+        return due
+
+    def _run(self):
+        while not self._stop.is_set():
+            for symbols in self._due():
+                try:
+                    self.refresh(symbols)
+                except Exception:
+                    pass  # counted in _fetch(); the old snapshot stays published
+            with self._lock:
+                ages = [s.age for s in self._snapshots.values()]
+            # Sleep until the oldest snapshot is due, polling at least once per interval
+            wait = min([self.interval - age for age in ages] + [self.interval])
+            self._stop.wait(max(0.05, wait))
+
+    def stats(self):
+        with self._lock:
+            ages = [s.age for s in self._snapshots.values()]
+            return {
+                'symbol_sets': len(self._last_read),
+                'requests': self.requests,
+                'fetches': self._flight.calls,
+                'coalesced': self._flight.shared,
+                'errors': self.errors,
+                'last_error': self.last_error,
+                'oldest_age': max(ages) if ages else None,
+                'running': self._thread is not None and self._thread.is_alive(),
+            }
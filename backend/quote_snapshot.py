@@ -0,0 +1,141 @@
+# backend/quote_snapshot.py
+import pandas as pd
+import yfinance as yf
+from yfinance.data import YfData
+
+from backend.metadata_cache import STATIC_FIELDS
+from backend.metadata_fetcher import METADATA_FIELDS, fetch_metadata_concurrently
+
+QUOTE_URL = "https://query1.finance.yahoo.com/v7/finance/quote"
+# Yahoo accepts long symbol lists, but keep each request URL at a sane length
+QUOTE_BATCH_SIZE = 50
+
+BAR_FIELDS = ['Open', 'High', 'Low', 'Close', 'Volume']
+
+QUOTE_COLUMNS = [
+    'ticker', 'name', 'last_price', 'day_high', 'day_low', 'open', 'volume', 'change', 'change_pct',
+    'currency', 'bid', 'ask', 'year_high', 'year_low', 'market_cap'
+]
+
+
+def download_bars(tickers):
+    """Downloads the latest daily bar for all tickers in a single request."""
+    return yf.download(tickers, period="1d", interval="1d", group_by='ticker', auto_adjust=True, threads=True, progress=False)
+
+
+def fetch_quote_metadata(tickers, batch_size=QUOTE_BATCH_SIZE):
+    """
+    Fetches name, currency, bid/ask, 52-week range and market cap for many tickers
+    from Yahoo's batched quote endpoint, one request per `batch_size` symbols.
+    Returns a list of raw quote records (dicts keyed by Yahoo field names).
+    """
+    data = YfData()
+    records = []
+    for start in range(0, len(tickers), batch_size):
+        batch = tickers[start:start + batch_size]
+        response = data.get_raw_json(QUOTE_URL, params={"symbols": ",".join(batch), "formatted": "false"})
+        records.extend((response.get('quoteResponse') or {}).get('result') or [])
+    return records
+
+
+def latest_bars(bars, tickers):
+    """Returns the last available OHLCV values as a frame indexed by ticker."""
+    if bars is None or bars.empty:
+        return pd.DataFrame(index=pd.Index(tickers), columns=BAR_FIELDS, dtype=float)
+    if not isinstance(bars.columns, pd.MultiIndex):
+        # A single-ticker download comes back with flat columns
+        bars = pd.concat({tickers[0]: bars}, axis=1)
+    # Tickers from different exchanges can end on different rows, so carry values forward first
+    last = bars.ffill().iloc[-1]
+    return last.unstack().reindex(index=tickers, columns=BAR_FIELDS).astype(float)
+
+
+def metadata_frame(records, tickers):
+    """Turns raw quote records into a frame indexed by ticker with our metadata column names."""
+    fields = list(METADATA_FIELDS.values())
+    if not records:
+        meta = pd.DataFrame(index=pd.Index(tickers), columns=fields)
+    else:
+        meta = pd.DataFrame.from_records(records)
+        meta = meta.drop_duplicates('symbol', keep='last').set_index('symbol')
+        meta = meta.reindex(index=tickers, columns=fields)
+    return meta.rename(columns={v: k for k, v in METADATA_FIELDS.items()})
+
+
+def build_quote_frame(bars, records, tickers):
+    """
+    Assembles the quotes DataFrame from a bar download and quote metadata records
+    using whole-column operations. Tickers without data keep their row with NaN values.
+    """
+    tickers = list(tickers)
+    last = latest_bars(bars, tickers)
+    meta = metadata_frame(records, tickers)
+
+    open_ = last['Open']
+    change = last['Close'] - open_
+    change_pct = (change / open_.where(open_ != 0)) * 100
+    volume = last['Volume']
+    if volume.notna().all():
+        volume = volume.astype('int64')
+
+    quotes = pd.DataFrame({
+        'ticker': tickers,
+        'name': meta['name'].fillna(meta.index.to_series()).values,
+        'last_price': last['Close'].values,
+        'day_high': last['High'].values,
+        'day_low': last['Low'].values,
+        'open': open_.values,
+        'volume': volume.values,
+        'change': change.values,
+        'change_pct': change_pct.values,
+        'currency': meta['currency'].values,
+        'bid': meta['bid'].values,
+        'ask': meta['ask'].values,
+        'year_high': meta['year_high'].values,
+        'year_low': meta['year_low'].values,
+        'market_cap': meta['market_cap'].values,
+    })
+    return quotes[QUOTE_COLUMNS]
+
+
+def fetch_quote_snapshot(tickers, download=download_bars, fetch_metadata=fetch_quote_metadata,
+                         fetch_missing=fetch_metadata_concurrently, metadata_cache=None):
+    """
+    Fetches prices and metadata for all tickers in a fixed number of batched calls
+    (one bar download plus one quote request per batch) and returns the quotes DataFrame.
+    Tickers the batched quote request did not cover are looked up in `metadata_cache`
+    (a MetadataCache) and then fetched one by one, concurrently, through `fetch_missing`;
+    whatever fields arrive for them are kept. Static fields are written back to the cache.
+    """
+    tickers = list(tickers)
+    try:
+        bars = download(tickers)
+    except Exception:
+        bars = None
+    try:
+        records = fetch_metadata(tickers)
+    except Exception:
+        records = []
+
+    fetched = {record.get('symbol'): {name: record.get(key) for name, key in METADATA_FIELDS.items()} for record in records}
+    missing = [ticker for ticker in tickers if ticker not in fetched]
+    cached = {}
+    if missing and metadata_cache is not None:
+        cached = metadata_cache.get_many(missing)
+        missing = [ticker for ticker in missing if ticker not in cached]
+    if missing and fetch_missing is not None:
+        for ticker, result in fetch_missing(missing).items():
+            if result.fields:
+                fetched[ticker] = result.fields
+                records.append({'symbol': ticker, **{METADATA_FIELDS[name]: value for name, value in result.fields.items()}})
+    for ticker, fields in cached.items():
+        records.append({'symbol': ticker, **{METADATA_FIELDS[name]: value for name, value in fields.items() if name in METADATA_FIELDS}})
+
+    if metadata_cache is not None:
+        static = {}
+        for ticker, fields in fetched.items():
+            fields = {name: fields[name] for name in STATIC_FIELDS if fields.get(name) is not None}
+            if ticker and fields:
+                static[ticker] = fields
+        metadata_cache.put_many(static)
+    return build_quote_frame(bars, records, tickers)
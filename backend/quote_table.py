@@ -0,0 +1,149 @@
+# backend/quote_table.py
+"""
+Server-side row model for the Quotes tab grid: the table is indexed once per snapshot
+and each rerun asks it for a single page with a sort order and text filter, so only that
+page is sent to the browser however large the universe is.
+
+Between refreshes, diff_quotes compares two snapshots row by row (keyed by ticker) and
+reports which rows were added, changed or removed.
+"""
+import math
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+
+@dataclass
+class QuoteDelta:
+    added: pd.DataFrame     # rows whose key is new in the current snapshot
+    updated: pd.DataFrame   # current version of rows with at least one changed cell
+    removed: list           # keys that disappeared
+    key: str = 'ticker'
+
+    def __len__(self):
+        return len(self.added) + len(self.updated) + len(self.removed)
+
+    @property
+    def empty(self):
+        return len(self) == 0
+
+
+def diff_quotes(previous, current, key='ticker', columns=None):
+    """
+    Rows added, changed or removed going from `previous` to `current`. Only `columns`
+    (default: all shared columns) are compared; NaN equals NaN, so a quote missing in
+    both snapshots is not reported as changed.
+    """
+    if previous is None or len(previous) == 0:
+        return QuoteDelta(added=current, updated=current.iloc[:0], removed=[], key=key)
+    if columns is None:
+        columns = [c for c in current.columns if c != key and c in previous.columns]
+
+    old_keys = pd.Index(previous[key].to_numpy(dtype=object))
+    positions = old_keys.get_indexer(current[key].to_numpy(dtype=object))
+    is_new = positions < 0
+    kept = np.flatnonzero(~is_new)
+    old_rows = positions[kept]
+
+    changed = np.zeros(len(kept), dtype=bool)
+    for column in columns:
+        new_values = current[column].to_numpy()[kept]
+        old_values = previous[column].to_numpy()[old_rows]
+        differs = new_values != old_values
+        if differs.any():
+            # Missing on both sides counts as unchanged
+            differs &= ~(pd.isna(new_values) & pd.isna(old_values))
+        changed |= differs
+
+    still_listed = np.zeros(len(old_keys), dtype=bool)
+    still_listed[old_rows] = True
+    removed = old_keys[~still_listed].tolist()
+    return QuoteDelta(
+        added=current.iloc[np.flatnonzero(is_new)],
+        updated=current.iloc[kept[changed]],
+        removed=removed,
+        key=key,
+    )
+
+
+@dataclass
+class QuotePage:
+    rows: pd.DataFrame
+    total: int      # rows matching the filter
+    page: int       # zero-based, clamped to the available pages
+    pages: int
+    page_size: int
+
+    @property
+    def first_row(self):
+        """One-based number of the first row on this page (0 when nothing matches)."""
+        return self.page * self.page_size + 1 if self.total else 0
+
+    @property
+    def last_row(self):
+        return self.page * self.page_size + len(self.rows)
+
+
+class QuoteTable:
+    """
+    Immutable quotes table with lazily built sort orders per (column, direction) and an LRU
+    of filter results per query. A page request then costs one boolean gather plus a slice.
+    """
+
+    def __init__(self, frame, text_columns=('ticker', 'name'), max_cached_queries=64):
+        self.frame = frame.reset_index(drop=True)
+        haystack = self.frame[text_columns[0]].astype(str).str.lower()
+        for column in text_columns[1:]:
+            haystack = haystack + "\n" + self.frame[column].fillna("").astype(str).str.lower()
+        self._haystack = haystack
+        self._orders = {}
+        self._matches = OrderedDict()
+        self.max_cached_queries = max_cached_queries
+        # Shared between sessions, so the lazily filled caches need a lock
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.frame)
+
+    def order(self, column, ascending=True):
+        """Row positions sorted by `column` (stable, missing values last either way)."""
+        key = (column, ascending)
+        with self._lock:
+            order = self._orders.get(key)
+        if order is None:
+            values = self.frame[column]
+            if pd.api.types.is_string_dtype(values) or values.dtype == object:
+                values = values.str.lower()
+            order = values.sort_values(ascending=ascending, kind='stable', na_position='last').index.to_numpy()
+            with self._lock:
+                self._orders[key] = order
+        return order
+
+    def matches(self, query):
+        """Boolean mask of rows whose ticker or name contains `query` (case-insensitive)."""
+        query = query.strip().lower()
+        with self._lock:
+            mask = self._matches.get(query)
+            if mask is not None:
+                self._matches.move_to_end(query)
+                return mask
+        mask = self._haystack.str.contains(query, regex=False).to_numpy()
+        with self._lock:
+            self._matches[query] = mask
+            if len(self._matches) > self.max_cached_queries:
+                self._matches.popitem(last=False)
+        return mask
+
+    def page(self, page=0, page_size=25, sort_by=None, ascending=True, query=None):
+        """Returns the QuotePage `page` (zero-based) of the filtered, sorted table."""
+        positions = self.order(sort_by, ascending) if sort_by else np.arange(len(self.frame))
+        if query and query.strip():
+            positions = positions[self.matches(query)[positions]]
+        total = len(positions)
+        pages = max(1, math.ceil(total / page_size))
+        page = min(max(page, 0), pages - 1)
+        rows = self.frame.take(positions[page * page_size:(page + 1) * page_size])
+        return QuotePage(rows=rows, total=total, page=page, pages=pages, page_size=page_size)
@@ -0,0 +1,110 @@
+# backend/risk.py
+"""
+Per-symbol risk metrics for a whole returns panel in one pass. The input is an aligned
+matrix of simple returns (rows are periods, columns are symbols); every metric is computed
+with column-wise NumPy operations, so 2,000 symbols cost a handful of array passes rather
+than 2,000 Python loops. Missing returns (NaN) are skipped per column.
+
+    metrics = risk_metrics(prices.pct_change().iloc[1:], confidence=0.95)
+    metrics.loc["AAPL", "var_historical"]
+"""
+from statistics import NormalDist
+
+import numpy as np
+import pandas as pd
+
+RISK_COLUMNS = [
+    'observations', 'mean', 'volatility', 'var_historical', 'cvar_historical', 'var_parametric',
+    'cvar_parametric', 'var_cornish_fisher', 'max_drawdown', 'skew', 'kurtosis',
+]
+
+
+def _as_matrix(returns):
+    if isinstance(returns, pd.DataFrame):
+        return returns.to_numpy(dtype=float), returns.columns
+    matrix = np.asarray(returns, dtype=float)
+    if matrix.ndim == 1:
+        matrix = matrix[:, None]
+    return matrix, pd.RangeIndex(matrix.shape[1])
+
+
+def historical_var_cvar(sorted_returns, counts, confidence):
+    """
+    Historical VaR and CVaR per column of returns already sorted ascending (NaNs last), with
+    `counts` finite values each: the return at position int((1 - confidence) * count) and the
+    mean of the returns up to and including it, as in backend.analytics.historical_var_cvar.
+    """
+    positions = np.minimum((1 - confidence) * counts, np.maximum(counts - 1, 0)).astype(int)
+    columns = np.arange(sorted_returns.shape[1])
+    var = sorted_returns[positions, columns]
+    # Only the head of each column is in the tail, so sum that instead of a full cumsum
+    head = sorted_returns[:positions.max(initial=0) + 1]
+    in_tail = np.arange(len(head))[:, None] <= positions
+    cvar = np.where(in_tail, head, 0.0).sum(axis=0) / (positions + 1)
+    empty = counts == 0
+    var[empty] = np.nan
+    cvar[empty] = np.nan
+    return var, cvar
+
+
+def max_drawdown(returns):
+    """Largest peak-to-trough fall of compounded wealth per column, as a negative fraction."""
+    matrix, _ = _as_matrix(returns)
+    wealth = np.cumprod(1 + np.nan_to_num(matrix), axis=0)
+    # Starting wealth of 1 is a peak too, so a fall on the first period counts
+    peaks = np.maximum(np.maximum.accumulate(wealth, axis=0), 1.0)
+    return np.min(wealth / peaks - 1, axis=0, initial=0.0)
+
+
+def risk_metrics(returns, confidence=0.95):
+    """
+    DataFrame indexed by symbol with RISK_COLUMNS, all as period returns (negative = loss):
+      volatility          population standard deviation (like np.std)
+      var/cvar_historical empirical quantile and the mean of the tail up to it
+      var/cvar_parametric normal distribution with the sample mean and volatility
+      var_cornish_fisher  normal quantile corrected for the sample skew and excess kurtosis
+      max_drawdown        worst peak-to-trough fall of compounded returns
+      skew, kurtosis      population skewness and excess kurtosis
+    """
+    matrix, symbols = _as_matrix(returns)
+    finite = np.isfinite(matrix)
+    counts = finite.sum(axis=0)
+    safe_counts = np.maximum(counts, 1)
+
+    mean = np.where(finite, matrix, 0.0).sum(axis=0) / safe_counts
+    centered = np.where(finite, matrix - mean, 0.0)
+    squared = centered * centered
+    m2 = squared.sum(axis=0) / safe_counts
+    m3 = (squared * centered).sum(axis=0) / safe_counts
+    m4 = (squared * squared).sum(axis=0) / safe_counts
+    volatility = np.sqrt(m2)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        skew = np.where(m2 > 0, m3 / m2 ** 1.5, 0.0)
+        kurtosis = np.where(m2 > 0, m4 / (m2 * m2) - 3.0, 0.0)
+
+    # np.sort puts NaNs last, so each column's finite returns come first, in order
+    var_historical, cvar_historical = historical_var_cvar(np.sort(matrix, axis=0), counts, confidence)
+
+    normal = NormalDist()
+    z = normal.inv_cdf(1 - confidence)
+    var_parametric = mean + z * volatility
+    cvar_parametric = mean - volatility * normal.pdf(z) / (1 - confidence)
+    z_cf = (z + (z * z - 1) * skew / 6 + (z ** 3 - 3 * z) * kurtosis / 24
+            - (2 * z ** 3 - 5 * z) * skew * skew / 36)
+    var_cornish_fisher = mean + z_cf * volatility
+
+    metrics = pd.DataFrame({
+        'observations': counts,
+        'mean': mean,
+        'volatility': volatility,
+        'var_historical': var_historical,
+        'cvar_historical': cvar_historical,
+        'var_parametric': var_parametric,
+        'cvar_parametric': cvar_parametric,
+        'var_cornish_fisher': var_cornish_fisher,
+        'max_drawdown': max_drawdown(matrix),
+        'skew': skew,
+        'kurtosis': kurtosis,
+    }, index=symbols)
+    metrics.loc[counts == 0, RISK_COLUMNS[1:]] = np.nan
+    return metrics[RISK_COLUMNS]
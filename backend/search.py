@@ -0,0 +1,191 @@
+# backend/search.py
+"""
+Symbol search. SymbolIndex is built once per symbol universe and answers ranked top-k
+queries on ticker, company name and prefixes without scanning every symbol: prefixes come
+from binary searches over sorted keys, typos from trigram postings whose candidates are
+then checked with a bounded edit distance.
+"""
+from bisect import bisect_left
+
+import numpy as np
+
+# Match tiers, best first
+EXACT_TICKER, TICKER_PREFIX, NAME_PREFIX, WORD_PREFIX, FUZZY = range(5)
+# Fuzzy candidates verified per query, most shared trigrams first
+MAX_FUZZY_CANDIDATES = 128
+
+
+def _trigrams(text):
+    padded = f"  {text} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def bounded_levenshtein(s1, s2, bound):
+    """Levenshtein distance between s1 and s2, or bound + 1 as soon as it must exceed `bound`."""
+    if abs(len(s1) - len(s2)) > bound:
+        return bound + 1
+    if len(s1) < len(s2):
+        s1, s2 = s2, s1
+    previous_row = list(range(len(s2) + 1))
+    for i, c1 in enumerate(s1):
+        current_row = [i + 1]
+        for j, c2 in enumerate(s2):
+            current_row.append(min(previous_row[j + 1] + 1, current_row[j] + 1, previous_row[j] + (c1 != c2)))
+        if min(current_row) > bound:
+            return bound + 1
+        previous_row = current_row
+    return previous_row[-1]
+
+
+def default_max_distance(query):
+    """Typos tolerated for a query: none below 3 characters, one up to 5, then two."""
+    return 0 if len(query) < 3 else 1 if len(query) < 6 else 2
+
+
+class _SortedKeys:
+    """Sorted keys with their numbers, supporting prefix-range lookups by bisection."""
+
+    def __init__(self, keys):
+        order = sorted(range(len(keys)), key=keys.__getitem__)
+        self.keys = [keys[i] for i in order]
+        self.numbers = np.asarray(order, dtype=np.int64)
+
+    def prefix(self, text):
+        """Numbers of the keys starting with `text`, in key order."""
+        start = bisect_left(self.keys, text)
+        end = bisect_left(self.keys, text + "\uffff", lo=start)
+        return self.numbers[start:end]
+
+
+class SymbolIndex:
+    """
+    Immutable search index over parallel ticker and name lists. `search` returns positions
+    into those lists, ranked: exact ticker, ticker prefix, name prefix, name-word prefix,
+    then tickers or name words within the edit-distance bound.
+
+    Tickers and distinct name words form one vocabulary of "terms"; typo matching works on
+    the vocabulary, so a word shared by thousands of names is verified once.
+    """
+
+    def __init__(self, tickers, names):
+        self.tickers = list(tickers)
+        self.names = [name or "" for name in names]
+        ticker_keys = [ticker.lower() for ticker in self.tickers]
+        self.ticker_lengths = np.array([len(ticker) for ticker in ticker_keys], dtype=np.int64)
+
+        self._exact = {}
+        for position, key in enumerate(ticker_keys):
+            self._exact.setdefault(key, position)
+        self._ticker_keys = _SortedKeys(ticker_keys)
+        self._name_keys = _SortedKeys([name.lower() for name in self.names])
+
+        word_positions = {}
+        for position, name in enumerate(self.names):
+            for word in set(name.lower().replace(",", " ").replace(".", " ").split()):
+                word_positions.setdefault(word, []).append(position)
+        words = list(word_positions)
+        self._word_keys = _SortedKeys(words)
+        # Positions per word, shortest ticker first, so prefix hits can be cut at k
+        self._word_positions = [
+            np.asarray(sorted(word_positions[word], key=self.ticker_lengths.__getitem__), dtype=np.int64)
+            for word in words
+        ]
+
+        # Term vocabulary: every ticker (term number = position) followed by every distinct word
+        self._terms = ticker_keys + words
+        self._term_lengths = np.array([len(term) for term in self._terms], dtype=np.int64)
+        postings = {}
+        for term_number, term in enumerate(self._terms):
+            for gram in _trigrams(term):
+                postings.setdefault(gram, []).append(term_number)
+        self._postings = {gram: np.asarray(numbers, dtype=np.int64) for gram, numbers in postings.items()}
+
+    @classmethod
+    def from_items(cls, items):
+        """Index for a list of {'ticker', 'name', ...} dicts."""
+        return cls([item["ticker"] for item in items], [item.get("name") for item in items])
+
+    def __len__(self):
+        return len(self.tickers)
+
+    def _shortest(self, positions, limit):
+        if len(positions) > limit:
+            # Prefer the shortest tickers (AAPL before AAPL.MX) among many prefix hits
+            positions = positions[np.argsort(self.ticker_lengths[positions], kind='stable')[:limit]]
+        return positions
+
+    def _term_positions(self, term_number, limit):
+        if term_number < len(self.tickers):
+            return [term_number]
+        return self._word_positions[term_number - len(self.tickers)][:limit]
+
+    def _word_prefix_positions(self, query, limit):
+        found = []
+        for word_number in self._word_keys.prefix(query)[:limit]:
+            found.extend(self._word_positions[word_number][:limit])
+            if len(found) >= limit * 4:
+                break
+        return self._shortest(np.unique(np.asarray(found, dtype=np.int64)), limit)
+
+    def _fuzzy_terms(self, query, max_distance):
+        """(distance, term number) for vocabulary terms within max_distance of the query."""
+        grams = [self._postings[gram] for gram in _trigrams(query) if gram in self._postings]
+        if not grams:
+            return []
+        # q-gram lemma: the padded query has len + 1 trigrams and each edit destroys at most 3
+        required = max(1, len(query) + 1 - 3 * max_distance)
+        numbers, shared = np.unique(np.concatenate(grams), return_counts=True)
+        keep = (shared >= required) & (np.abs(self._term_lengths[numbers] - len(query)) <= max_distance)
+        numbers, shared = numbers[keep], shared[keep]
+        if len(numbers) > MAX_FUZZY_CANDIDATES:
+            best = np.argsort(-shared, kind='stable')[:MAX_FUZZY_CANDIDATES]
+            numbers = numbers[best]
+        matches = []
+        for term_number in numbers:
+            distance = bounded_levenshtein(query, self._terms[term_number], max_distance)
+            if distance <= max_distance:
+                matches.append((distance, int(term_number)))
+        return matches
+
+    def search(self, query, k=20, max_distance=None):
+        """Positions of the top `k` matches for `query`, best first."""
+        query = query.strip().lower()
+        if not query:
+            return list(range(min(k, len(self.tickers))))
+        if max_distance is None:
+            max_distance = default_max_distance(query)
+
+        scores = {}
+
+        def offer(positions, tier, distance=0):
+            for position in positions:
+                position = int(position)
+                score = (tier, distance, int(self.ticker_lengths[position]), self.tickers[position])
+                if position not in scores or score < scores[position]:
+                    scores[position] = score
+
+        exact = self._exact.get(query)
+        if exact is not None:
+            offer([exact], EXACT_TICKER)
+        offer(self._shortest(self._ticker_keys.prefix(query), k), TICKER_PREFIX)
+        offer(self._shortest(self._name_keys.prefix(query), k), NAME_PREFIX)
+        if " " not in query:
+            offer(self._word_prefix_positions(query, k), WORD_PREFIX)
+        if max_distance > 0 and len(scores) < k:
+            for distance, term_number in sorted(self._fuzzy_terms(query, max_distance)):
+                offer(self._term_positions(term_number, k), FUZZY, distance)
+
+        return sorted(scores, key=scores.__getitem__)[:k]
+
+
+def fuzzy_search(query, items, threshold=2, index=None, limit=50):
+    """
+    Ranked matches for `query` among `items` ({'ticker', 'name'} dicts), tolerating up to
+    `threshold` typos. Pass a prebuilt SymbolIndex over the same items to skip indexing.
+    """
+    if not query:
+        return items
+    if index is None:
+        index = SymbolIndex.from_items(items)
+    max_distance = min(threshold, default_max_distance(query.strip()))
+    return [items[position] for position in index.search(query, k=limit, max_distance=max_distance)]
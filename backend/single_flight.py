@@ -0,0 +1,139 @@
+# backend/single_flight.py
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+
+
+class SingleFlight:
+    """
+    Collapses concurrent calls with the same key into one: the first caller runs the
+    function, everyone arriving while it runs waits for and shares its result (or
+    exception). Once it finishes, the next call for that key starts a new one.
+    """
+
+    def __init__(self, name="single-flight"):
+        self.name = name
+        self._calls = {}    # key -> Future of the running call
+        self._lock = threading.Lock()
+        self.calls = 0      # functions actually run
+        self.shared = 0     # callers that joined a running call instead
+
+    def _join_or_lead(self, key):
+        with self._lock:
+            future = self._calls.get(key)
+            if future is not None:
+                self.shared += 1
+                return future, False
+            future = self._calls[key] = Future()
+            self.calls += 1
+            return future, True
+
+    def _run(self, key, future, fn):
+        try:
+            result = fn()
+        except BaseException as e:
+            with self._lock:
+                del self._calls[key]
+            future.set_exception(e)
+            raise
+        with self._lock:
+            del self._calls[key]
+        future.set_result(result)
+        return result
+
+    def do(self, key, fn):
+        """Returns fn(), or the result of the identical call already in flight."""
+        future, leader = self._join_or_lead(key)
+        if not leader:
+            return future.result()
+        return self._run(key, future, fn)
+
+    def do_async(self, key, fn):
+        """
+        Runs fn() on a daemon thread unless a call for `key` is already in flight.
+        Returns the Future of whichever call is running.
+        """
+        future, leader = self._join_or_lead(key)
+        if leader:
+            def run():
+                try:
+                    self._run(key, future, fn)
+                except Exception:
+                    pass  # delivered through the future
+            threading.Thread(target=run, name=f"{self.name}-{key}", daemon=True).start()
+        return future
+
+    def in_flight(self, key):
+        with self._lock:
+            return key in self._calls
+
+
+class StaleWhileRevalidate:
+    """
+    Small in-memory cache in front of a SingleFlight. Values younger than `ttl` seconds are
+    returned as is. Older ones, up to `ttl + max_stale`, are still returned immediately
+    while a single background call refreshes them; only missing or too-old entries make
+    the caller wait, and then concurrent callers share one call. If a background refresh
+    fails, the stale value keeps being served and the error is counted.
+    """
+
+    def __init__(self, ttl, max_stale=300.0, max_entries=256, name="swr"):
+        self.ttl = ttl
+        self.max_stale = max_stale
+        self.max_entries = max_entries
+        self.flight = SingleFlight(name)
+        self._entries = OrderedDict()   # key -> (value, monotonic time fetched)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.errors = 0
+
+    def _fetch(self, key, fetch):
+        try:
+            value = fetch()
+        except Exception:
+            with self._lock:
+                self.errors += 1
+            raise
+        with self._lock:
+            self._entries[key] = (value, time.monotonic())
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return value
+
+    def get(self, key, fetch):
+        """Cached value for `key`, calling fetch() (at most once at a time per key) as needed."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+        if entry is not None:
+            value, fetched = entry
+            age = time.monotonic() - fetched
+            if age < self.ttl:
+                with self._lock:
+                    self.hits += 1
+                return value
+            if age < self.ttl + self.max_stale:
+                with self._lock:
+                    self.stale_hits += 1
+                self.flight.do_async(key, lambda: self._fetch(key, fetch))
+                return value
+        with self._lock:
+            self.misses += 1
+        return self.flight.do(key, lambda: self._fetch(key, fetch))
+
+    def stats(self):
+        with self._lock:
+            return {
+                'entries': len(self._entries),
+                'hits': self.hits,
+                'stale_hits': self.stale_hits,
+                'misses': self.misses,
+                'errors': self.errors,
+                'upstream_calls': self.flight.calls,
+                'shared_calls': self.flight.shared,
+            }
@@ -0,0 +1,294 @@
+# backend/streaming_indicators.py
+"""
+Incremental versions of the Charts tab indicators. Each object keeps only the rolling
+state it needs, so feeding it one more bar costs O(1) regardless of how long the series
+already is. Outputs match the full recomputations in backend.indicators.
+
+    sma = StreamingSMA(20)
+    sma.update(closes)      # batch: returns an array with one value per bar
+    sma.update(101.5)       # single bar: returns a float
+"""
+from collections import deque
+
+import numpy as np
+
+# Running sums are rebuilt from the window this often to stop floating-point drift
+RESYNC_EVERY = 1024
+
+
+class StreamingIndicator:
+    """Base class: subclasses implement `_step` for one bar and return its value (NaN while warming up)."""
+
+    def update(self, *columns):
+        """Feeds one bar (scalars) or a batch of bars (equal-length sequences) and returns the new values."""
+        if np.ndim(columns[0]) == 0:
+            return self._step(*(float(value) for value in columns))
+        arrays = [np.asarray(column, dtype=float) for column in columns]
+        return np.array([self._step(*values) for values in zip(*arrays)], dtype=float)
+
+    def _step(self, *values):
+        raise NotImplementedError
+
+
+class _RollingSum:
+    """
+    Sum over the last `period` values, with periodic exact resyncs. Missing values (NaN or
+    inf) make `total` NaN only while they are in the window, like rolling().sum():
+    `finite_total` adds them as zero, so the sum is right again as soon as they leave.
+    """
+
+    def __init__(self, period):
+        self.period = period
+        self.window = deque(maxlen=period)
+        self.finite_total = 0.0
+        self.missing = 0       # non-finite values in the window
+        self.steps = 0         # values pushed so far
+        self.resynced = False  # whether the last push rebuilt the sum from the window
+
+    def push(self, value):
+        if len(self.window) == self.period:
+            leaving = self.window[0]
+            if np.isfinite(leaving):
+                self.finite_total -= leaving
+            else:
+                self.missing -= 1
+        self.window.append(value)
+        if np.isfinite(value):
+            self.finite_total += value
+        else:
+            self.missing += 1
+        self.steps += 1
+        self.resynced = self.steps % RESYNC_EVERY == 0
+        if self.resynced:
+            self.finite_total = float(sum(v for v in self.window if np.isfinite(v)))
+
+    @property
+    def total(self):
+        return self.finite_total if self.missing == 0 else np.nan
+
+    @property
+    def full(self):
+        return len(self.window) == self.period
+
+
+class _RollingExtreme:
+    """
+    Rolling min or max over the last `period` values using a monotonic deque (amortized O(1)).
+    NaN while a NaN is in the window, like rolling().min()/max().
+    """
+
+    def __init__(self, period, compare):
+        self.period = period
+        self.compare = compare
+        self.candidates = deque()  # (position, value), values monotonic
+        self.position = 0
+        self.last_missing = None   # position of the newest NaN pushed
+
+    def push(self, value):
+        if np.isnan(value):
+            self.last_missing = self.position
+        else:
+            while self.candidates and not self.compare(self.candidates[-1][1], value):
+                self.candidates.pop()
+            self.candidates.append((self.position, value))
+        while self.candidates and self.candidates[0][0] <= self.position - self.period:
+            self.candidates.popleft()
+        self.position += 1
+
+    @property
+    def full(self):
+        return self.position >= self.period
+
+    @property
+    def value(self):
+        if self.last_missing is not None and self.last_missing > self.position - 1 - self.period:
+            return np.nan
+        return self.candidates[0][1]
+
+
+class StreamingSMA(StreamingIndicator):
+    def __init__(self, period):
+        self.sum = _RollingSum(period)
+
+    def _step(self, close):
+        self.sum.push(close)
+        return self.sum.total / self.sum.period if self.sum.full else np.nan
+
+
+class StreamingEMA(StreamingIndicator):
+    """
+    Same weighting as pandas' ewm(span=period).mean() (adjust=True). A missing close still
+    ages the earlier weights but adds nothing, so that bar repeats the last value.
+    """
+
+    def __init__(self, period):
+        self.decay = 1 - 2 / (period + 1)
+        self.numerator = 0.0
+        self.denominator = 0.0
+
+    def _step(self, close):
+        self.numerator *= self.decay
+        self.denominator *= self.decay
+        if np.isfinite(close):
+            self.numerator += close
+            self.denominator += 1
+        return self.numerator / self.denominator if self.denominator else np.nan
+
+
+class StreamingWMA(StreamingIndicator):
+    """
+    Linearly weighted moving average (newest bar weight `period`). Sliding the window lowers
+    every weight by one, so the weighted sum updates as weighted - window_sum + period * new.
+    """
+
+    def __init__(self, period):
+        self.period = period
+        self.sum = _RollingSum(period)
+        self.weighted = 0.0
+        self.divisor = period * (period + 1) / 2
+
+    def _step(self, close):
+        # Missing closes count as zero in the running sums and make the output NaN until they leave
+        value = close if np.isfinite(close) else 0.0
+        if self.sum.full:
+            self.weighted += self.period * value - self.sum.finite_total
+        else:
+            self.weighted += (len(self.sum.window) + 1) * value
+        self.sum.push(close)
+        if self.sum.resynced:
+            window = np.array(self.sum.window)
+            self.weighted = float(np.dot(np.arange(1, len(window) + 1), np.where(np.isfinite(window), window, 0.0)))
+        return self.weighted / self.divisor if self.sum.full and not self.sum.missing else np.nan
+
+
+class StreamingRSI(StreamingIndicator):
+    """
+    Wilder's RSI: the first averages are simple means over `period` changes, then Wilder
+    smoothing. Like the batch ewm(adjust=False), a missing change leaves the averages alone
+    (that bar repeats the last RSI) and only ages their weight against the next change.
+    """
+
+    def __init__(self, period=14):
+        self.period = period
+        self.previous_close = None
+        self.count = 0
+        self.seed_count = 0    # finite changes in the seed window
+        self.weight = 1.0      # weight of the averages against the next change
+        self.average_gain = 0.0
+        self.average_loss = 0.0
+
+    def _step(self, close):
+        if self.previous_close is None:
+            self.previous_close = close
+            return np.nan
+        change = close - self.previous_close
+        self.previous_close = close
+        finite = np.isfinite(change)
+        gain, loss = max(change, 0.0), max(-change, 0.0)
+        self.count += 1
+        if self.count <= self.period:
+            # Accumulate the seed averages over the changes that aren't missing
+            if finite:
+                self.seed_count += 1
+                self.average_gain += (gain - self.average_gain) / self.seed_count
+                self.average_loss += (loss - self.average_loss) / self.seed_count
+            if self.count == self.period and not self.seed_count:
+                # No seed at all: the averages start from the first change that comes
+                self.weight = 0.0
+            if self.count < self.period or not self.seed_count:
+                return np.nan
+        else:
+            alpha = 1 / self.period
+            self.weight *= 1 - alpha
+            if finite:
+                self.average_gain = (self.weight * self.average_gain + alpha * gain) / (self.weight + alpha)
+                self.average_loss = (self.weight * self.average_loss + alpha * loss) / (self.weight + alpha)
+                self.weight = 1.0
+            elif not self.weight:
+                return np.nan
+        if self.average_loss == 0:
+            return 100.0 if self.average_gain > 0 else np.nan
+        return 100 - 100 / (1 + self.average_gain / self.average_loss)
+
+
+class StreamingMACD(StreamingIndicator):
+    """Returns (macd_line, signal_line, histogram) per bar."""
+
+    def __init__(self, fast=12, slow=26, signal=9):
+        self.fast = StreamingEMA(fast)
+        self.slow = StreamingEMA(slow)
+        self.signal = StreamingEMA(signal)
+
+    def update(self, close):
+        if np.ndim(close) == 0:
+            return self._step(float(close))
+        values = [self._step(value) for value in np.asarray(close, dtype=float)]
+        return tuple(np.array(column, dtype=float) for column in zip(*values)) if values else (np.array([]),) * 3
+
+    def _step(self, close):
+        macd_line = self.fast._step(close) - self.slow._step(close)
+        signal_line = self.signal._step(macd_line)
+        return macd_line, signal_line, macd_line - signal_line
+
+
+class StreamingATR(StreamingIndicator):
+    """Simple rolling mean of the true range, like backend.indicators.atr."""
+
+    def __init__(self, period=14):
+        self.sum = _RollingSum(period)
+        self.previous_close = None
+
+    def _step(self, high, low, close):
+        ranges = [high - low]
+        if self.previous_close is not None:
+            ranges += [abs(high - self.previous_close), abs(low - self.previous_close)]
+        # Like the batch max(axis=1), skip the candidates a missing price made NaN
+        ranges = [value for value in ranges if not np.isnan(value)]
+        true_range = max(ranges) if ranges else np.nan
+        self.previous_close = close
+        self.sum.push(true_range)
+        return self.sum.total / self.sum.period if self.sum.full else np.nan
+
+
+class StreamingStochastic(StreamingIndicator):
+    """Returns (%K, %D) per bar."""
+
+    def __init__(self, k_period=14, d_period=3):
+        self.highest = _RollingExtreme(k_period, lambda kept, new: kept > new)
+        self.lowest = _RollingExtreme(k_period, lambda kept, new: kept < new)
+        self.d_sum = _RollingSum(d_period)
+        self.d_valid = 0
+
+    def update(self, high, low, close):
+        if np.ndim(close) == 0:
+            return self._step(float(high), float(low), float(close))
+        arrays = [np.asarray(column, dtype=float) for column in (high, low, close)]
+        values = [self._step(*bar) for bar in zip(*arrays)]
+        return tuple(np.array(column, dtype=float) for column in zip(*values)) if values else (np.array([]),) * 2
+
+    def _step(self, high, low, close):
+        self.highest.push(high)
+        self.lowest.push(low)
+        if not self.highest.full:
+            return np.nan, np.nan
+        value_range = self.highest.value - self.lowest.value
+        k_percent = 100 * (close - self.lowest.value) / value_range if value_range else np.nan
+        # %D averages the last d_period %K values and is NaN if any of them is
+        self.d_valid = self.d_valid + 1 if not np.isnan(k_percent) else 0
+        self.d_sum.push(0.0 if np.isnan(k_percent) else k_percent)
+        d_percent = self.d_sum.total / self.d_sum.period if self.d_valid >= self.d_sum.period else np.nan
+        return k_percent, d_percent
+
+
+class StreamingVWAP(StreamingIndicator):
+    """Cumulative VWAP of the (O + H + L + C) / 4 price."""
+
+    def __init__(self):
+        self.cumulative_tpv = 0.0
+        self.cumulative_volume = 0.0
+
+    def _step(self, open_, high, low, close, volume):
+        typical = (open_ + high + low + close) / 4
+        self.cumulative_tpv += typical * volume
+        self.cumulative_volume += volume
+        return self.cumulative_tpv / self.cumulative_volume if self.cumulative_volume > 0 else typical
@@ -0,0 +1,150 @@
+# backend/symbol_catalog.py
+"""
+The symbol universe every tab draws from, loaded from a local CSV (data/symbols.csv, or
+SYMBOL_CATALOG_PATH for a full exchange dump). Reference columns are stored as pandas
+categoricals, so tens of thousands of rows cost a few bytes per cell; lookups by ticker
+go through a dict of row positions and attribute filters are boolean masks over the
+category codes.
+
+Tags (space-separated in the file) name the universes the tabs use: top_quotes, charts,
+analytics and country_index.
+"""
+import os
+import threading
+
+import numpy as np
+import pandas as pd
+
+from backend.search import SymbolIndex
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_CATALOG_PATH = os.environ.get("SYMBOL_CATALOG_PATH", os.path.join(ROOT_DIR, "data", "symbols.csv"))
+
+CATALOG_COLUMNS = ['ticker', 'name', 'exchange', 'country', 'asset_class', 'sector', 'currency', 'market_cap', 'tags']
+# Low-cardinality columns kept as categoricals
+CATEGORY_COLUMNS = ['exchange', 'country', 'asset_class', 'sector', 'currency']
+
+
+class SymbolCatalog:
+    """
+    Immutable table of instruments in file order. `filter` returns another SymbolCatalog
+    over the matching rows; results are memoized, so repeated filters in a rerun are free.
+    """
+
+    def __init__(self, frame):
+        self.frame = frame.reset_index(drop=True)
+        self.tickers = tuple(self.frame['ticker'].tolist())
+        self.names = tuple(self.frame['name'].tolist())
+        # Per-column (codes, categories) or plain arrays, so single-row reads skip pandas indexing
+        self._columns = {
+            name: (column.cat.codes.to_numpy(), column.cat.categories.to_numpy())
+            if isinstance(column.dtype, pd.CategoricalDtype) else column.to_numpy()
+            for name, column in self.frame.items()
+        }
+        self._positions = {ticker: position for position, ticker in enumerate(self.tickers)}
+        self._tags = None
+        self._views = {}
+        self._index = None
+        self._lock = threading.Lock()
+
+    @classmethod
+    def load(cls, path=DEFAULT_CATALOG_PATH):
+        frame = pd.read_csv(
+            path,
+            dtype={column: 'category' for column in CATEGORY_COLUMNS} | {'ticker': str, 'name': str, 'tags': str},
+            keep_default_na=False,
+            na_values={'market_cap': ['']},
+        )
+        frame = frame.reindex(columns=CATALOG_COLUMNS)
+        frame['name'] = frame['name'].where(frame['name'] != '', frame['ticker'])
+        return cls(frame.drop_duplicates('ticker', keep='first'))
+
+    def __len__(self):
+        return len(self.tickers)
+
+    def __contains__(self, ticker):
+        return ticker in self._positions
+
+    def __iter__(self):
+        return iter(self.records())
+
+    def get(self, ticker, default=None):
+        """The row for `ticker` as a dict, or `default`."""
+        position = self._positions.get(ticker)
+        if position is None:
+            return default
+        return self._record(position)
+
+    def _record(self, position):
+        record = {}
+        for name, column in self._columns.items():
+            if isinstance(column, tuple):
+                codes, categories = column
+                record[name] = categories[codes[position]] if codes[position] >= 0 else None
+            else:
+                record[name] = column[position]
+        if pd.isna(record['market_cap']):
+            record['market_cap'] = None
+        return record
+
+    def records(self):
+        """All rows as a list of dicts, in file order."""
+        records = self.frame.to_dict('records')
+        for record in records:
+            if pd.isna(record['market_cap']):
+                record['market_cap'] = None
+        return records
+
+    def _tag_masks(self):
+        if self._tags is None:
+            masks = {}
+            tags = self._columns['tags']
+            # Most rows carry no tag, so only the tagged ones are split
+            for position in np.flatnonzero(tags != ''):
+                for tag in tags[position].split():
+                    masks.setdefault(tag, np.zeros(len(self), dtype=bool))[position] = True
+            self._tags = masks
+        return self._tags
+
+    def filter(self, tag=None, **attributes):
+        """
+        Rows carrying `tag` whose columns equal the given values, e.g.
+        filter(tag='charts') or filter(asset_class='Equity', country='USA').
+        A list value matches any of its entries.
+        """
+        key = (tag, tuple(sorted((name, tuple(value) if isinstance(value, list) else value) for name, value in attributes.items())))
+        with self._lock:
+            view = self._views.get(key)
+        if view is not None:
+            return view
+
+        mask = np.ones(len(self), dtype=bool)
+        if tag is not None:
+            mask &= self._tag_masks().get(tag, np.zeros(len(self), dtype=bool))
+        for name, value in attributes.items():
+            column = self.frame[name]
+            if isinstance(value, list):
+                mask &= column.isin(value).to_numpy()
+            elif isinstance(column.dtype, pd.CategoricalDtype):
+                # Compare category codes rather than strings; an unknown value matches nothing
+                code = column.cat.categories.get_indexer([value])[0]
+                mask &= (column.cat.codes.to_numpy() == code) & (code >= 0)
+            else:
+                mask &= (column == value).to_numpy()
+
+        view = SymbolCatalog(self.frame[mask])
+        with self._lock:
+            self._views[key] = view
+        return view
+
+    @property
+    def search_index(self):
+        """SymbolIndex over this catalog's tickers and names, built on first use."""
+        with self._lock:
+            if self._index is None:
+                self._index = SymbolIndex(self.tickers, self.names)
+            return self._index
+
+    def memory_usage(self):
+        """Bytes held by the table itself (deep, including strings)."""
+        return int(self.frame.memory_usage(index=True, deep=True).sum())
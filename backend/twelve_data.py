@@ -0,0 +1,280 @@
+# backend/twelve_data.py
+"""
+Client for the Twelve Data /quote and /time_series endpoints: one pooled keep-alive session per client,
+a token bucket that keeps requests inside the plan's per-minute credit budget, symbol
+lists split into chunks that fit the URL and the budget, and responses parsed straight
+into the quotes frame (QUOTE_COLUMNS) the rest of the app uses.
+
+Each symbol in a /quote request costs one credit, as does a time_series request.
+"""
+import os
+import threading
+import time
+from email.utils import parsedate_to_datetime
+
+import numpy as np
+import pandas as pd
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from backend.quote_snapshot import QUOTE_COLUMNS
+
+TWELVE_DATA_URL = os.environ.get("TWELVE_DATA_URL", "https://api.twelvedata.com")
+# Credits per minute on the account's plan (8 on the free plan)
+CREDITS_PER_MINUTE = int(os.environ.get("TWELVE_DATA_CREDITS_PER_MINUTE", 8))
+# The provider accepts at most 120 symbols per batch; the URL stays well under 8 KB with this
+MAX_SYMBOLS_PER_REQUEST = 120
+MAX_SYMBOL_CHARS = 2000
+
+# yfinance-style interval -> Twelve Data interval
+TWELVE_DATA_INTERVALS = {
+    '1m': '1min', '5m': '5min', '15m': '15min', '30m': '30min', '60m': '1h', '1h': '1h',
+    '1d': '1day', '1wk': '1week', '1mo': '1month',
+}
+# Most bars a single time_series request returns
+MAX_OUTPUT_SIZE = 5000
+
+# Our column name -> field in a Twelve Data quote
+TWELVE_DATA_FIELDS = {
+    'name': 'name',
+    'last_price': 'close',
+    'day_high': 'high',
+    'day_low': 'low',
+    'open': 'open',
+    'volume': 'volume',
+    'change': 'change',
+    'change_pct': 'percent_change',
+    'currency': 'currency',
+}
+
+
+class RateLimited(Exception):
+    """The provider answered that the credit budget is used up."""
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket holding up to `capacity` tokens, refilled at `rate` per second.
+    acquire() reserves tokens immediately and sleeps off any deficit, so waiting callers are
+    served in arrival order rather than racing each other for the next refill.
+    """
+
+    def __init__(self, rate, capacity, clock=time.monotonic, sleep=time.sleep):
+        self.rate = rate
+        self.capacity = capacity
+        self.clock = clock
+        self.sleep = sleep
+        self._tokens = capacity
+        self._updated = clock()
+        self._lock = threading.Lock()
+        self.waited = 0.0
+
+    def _refill(self, now):
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def acquire(self, tokens=1, timeout=None):
+        """Takes `tokens`, blocking until they are available. Returns the seconds waited."""
+        if tokens > self.capacity:
+            raise ValueError(f"cannot take {tokens} tokens from a bucket of {self.capacity}")
+        with self._lock:
+            now = self.clock()
+            self._refill(now)
+            wait = max(0.0, (tokens - self._tokens) / self.rate)
+            if timeout is not None and wait > timeout:
+                raise TimeoutError(f"{tokens} tokens not available within {timeout}s")
+            self._tokens -= tokens
+            self.waited += wait
+        if wait:
+            self.sleep(wait)
+        return wait
+
+    def pause(self, seconds):
+        """Hands out nothing for `seconds` (e.g. after the provider reported the budget spent)."""
+        with self._lock:
+            self._refill(self.clock())
+            self._tokens = min(self._tokens, 0) - seconds * self.rate
+
+
+def make_session(pool_size=8, retries=3, backoff=0.5):
+    """Keep-alive session that retries connection errors and 5xx answers with backoff."""
+    retry = Retry(
+        total=retries, connect=retries, read=retries, backoff_factor=backoff,
+        status_forcelist=[500, 502, 503, 504], allowed_methods=["GET"], raise_on_status=False,
+    )
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry)
+    session = requests.Session()
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+def chunk_symbols(symbols, max_symbols, max_chars=MAX_SYMBOL_CHARS):
+    """Splits `symbols` into consecutive lists of at most `max_symbols` and `max_chars` (joined)."""
+    chunks, chunk, chars = [], [], 0
+    for symbol in symbols:
+        if chunk and (len(chunk) == max_symbols or chars + 1 + len(symbol) > max_chars):
+            chunks.append(chunk)
+            chunk, chars = [], 0
+        chunk.append(symbol)
+        chars += len(symbol) + (1 if chars else 0)
+    if chunk:
+        chunks.append(chunk)
+    return chunks
+
+
+def quote_records(payload, symbols):
+    """
+    Raw quote dicts keyed by symbol. A one-symbol request comes back as the quote itself,
+    a batch as {symbol: quote}; per-symbol errors are dropped.
+    """
+    if not isinstance(payload, dict):
+        return {}
+    if 'symbol' in payload and len(symbols) == 1:
+        payload = {symbols[0]: payload}
+    return {
+        symbol: record for symbol, record in payload.items()
+        if isinstance(record, dict) and record.get('status') != 'error'
+    }
+
+
+def parse_quotes(records, symbols):
+    """Builds the quotes frame for `symbols` from raw Twelve Data quotes; missing ones stay NaN."""
+    symbols = list(symbols)
+    rows = [records.get(symbol) or {} for symbol in symbols]
+
+    def numeric(values):
+        return pd.to_numeric(pd.Series(values, dtype=object), errors='coerce').astype(float).to_numpy()
+
+    columns = {name: [row.get(key) for row in rows] for name, key in TWELVE_DATA_FIELDS.items()}
+    year = [row.get('fifty_two_week') or {} for row in rows]
+    volume = numeric(columns['volume'])
+    quotes = pd.DataFrame({
+        'ticker': symbols,
+        'name': [name or symbol for name, symbol in zip(columns['name'], symbols)],
+        'last_price': numeric(columns['last_price']),
+        'day_high': numeric(columns['day_high']),
+        'day_low': numeric(columns['day_low']),
+        'open': numeric(columns['open']),
+        'volume': volume.astype('int64') if not np.isnan(volume).any() else volume,
+        'change': numeric(columns['change']),
+        'change_pct': numeric(columns['change_pct']),
+        'currency': columns['currency'],
+        'bid': np.nan,
+        'ask': np.nan,
+        'year_high': numeric([y.get('high') for y in year]),
+        'year_low': numeric([y.get('low') for y in year]),
+        'market_cap': np.nan,
+    })
+    return quotes[QUOTE_COLUMNS]
+
+
+def parse_time_series(payload):
+    """OHLCV frame (oldest bar first, like yfinance) from a Twelve Data time_series response."""
+    values = payload.get('values') or []
+    frame = pd.DataFrame.from_records(values, columns=['datetime', 'open', 'high', 'low', 'close', 'volume'])
+    index = pd.DatetimeIndex(pd.to_datetime(frame.pop('datetime')), name='Datetime')
+    timezone = (payload.get('meta') or {}).get('exchange_timezone')
+    if timezone and len(index):
+        index = index.tz_localize(timezone, ambiguous='NaT', nonexistent='shift_forward')
+    bars = frame.apply(pd.to_numeric, errors='coerce').set_axis(index)
+    bars.columns = ['Open', 'High', 'Low', 'Close', 'Volume']
+    return bars.sort_index()
+
+
+def parse_retry_after(value, default):
+    """
+    Seconds to wait from a Retry-After header, which HTTP allows as either a number of
+    seconds or an HTTP-date; `default` if it is missing or neither.
+    """
+    if not value:
+        return default
+    try:
+        return max(0.0, float(value))
+    except (TypeError, ValueError):
+        pass
+    try:
+        until = parsedate_to_datetime(value)
+    except (TypeError, ValueError, IndexError):
+        return default
+    if until is None or until.tzinfo is None:
+        return default
+    return max(0.0, until.timestamp() - time.time())
+
+
+class TwelveDataClient:
+    """
+    Shared, thread-safe Twelve Data client.
+
+    The bucket holds an eighth of the credit budget and refills at the other seven eighths
+    per window: whatever the provider's window alignment, no `window` seconds ever spend more
+    than `credits_per_window`. Requests are chunked so one never costs more than the bucket
+    holds. If the provider still reports the budget spent (another process on the same key),
+    the bucket pauses for a window and the chunk is retried.
+    """
+
+    def __init__(self, api_key=None, base_url=TWELVE_DATA_URL, credits_per_window=CREDITS_PER_MINUTE, window=60.0,
+                 timeout=(3.05, 10.0), pool_size=8, retries=3, session=None):
+        self.api_key = api_key or os.environ.get("TWELVE_DATA_API_KEY")
+        self.base_url = base_url.rstrip("/")
+        self.window = window
+        self.timeout = timeout
+        self.retries = retries
+        burst = max(1, credits_per_window // 8)
+        self.limiter = TokenBucket(rate=(credits_per_window - burst) / window, capacity=burst)
+        self.chunk_size = min(MAX_SYMBOLS_PER_REQUEST, burst)
+        self.session = session or make_session(pool_size, retries)
+        # Several threads share one client, so the counters are only touched under this lock
+        self._counter_lock = threading.Lock()
+        self.requests = 0
+        self.rate_limited = 0
+
+    def _get(self, path, params):
+        response = self.session.get(f"{self.base_url}{path}", params={**params, 'apikey': self.api_key}, timeout=self.timeout)
+        if response.status_code == 429:
+            raise RateLimited(response.headers.get('Retry-After'))
+        response.raise_for_status()
+        payload = response.json()
+        if isinstance(payload, dict) and payload.get('status') == 'error' and payload.get('code') == 429:
+            raise RateLimited(None)
+        if isinstance(payload, dict) and payload.get('status') == 'error':
+            raise requests.HTTPError(f"{payload.get('code')}: {payload.get('message')}")
+        return payload
+
+    def _request(self, path, params, credits):
+        """GET `path` once `credits` are available, backing off and retrying when rate limited."""
+        for attempt in range(self.retries + 1):
+            self.limiter.acquire(credits)
+            with self._counter_lock:
+                self.requests += 1
+            try:
+                return self._get(path, params)
+            except RateLimited as e:
+                with self._counter_lock:
+                    self.rate_limited += 1
+                if attempt == self.retries:
+                    raise
+                self.limiter.pause(parse_retry_after(e.args[0] if e.args else None, self.window))
+
+    def quote_chunk(self, symbols):
+        """Raw quotes for one chunk of symbols."""
+        return quote_records(self._request("/quote", {'symbol': ",".join(symbols)}, len(symbols)), symbols)
+
+    def time_series(self, symbol, interval, start=None, outputsize=MAX_OUTPUT_SIZE):
+        """OHLCV bars for `symbol`, from `start` if given, else the latest `outputsize`."""
+        params = {'symbol': symbol, 'interval': TWELVE_DATA_INTERVALS.get(interval, interval), 'outputsize': outputsize}
+        if start is not None:
+            params['start_date'] = pd.Timestamp(start).strftime('%Y-%m-%d %H:%M:%S')
+        return parse_time_series(self._request("/time_series", params, 1))
+
+    def quotes(self, symbols):
+        """The quotes frame for `symbols`, fetched in budget-sized chunks."""
+        symbols = list(symbols)
+        records = {}
+        for chunk in chunk_symbols(symbols, self.chunk_size):
+            records.update(self.quote_chunk(chunk))
+        return parse_quotes(records, symbols)
+
+    def close(self):
+        self.session.close()
@@ -0,0 +1,146 @@
+# benchmarks/bench_async_provider.py
+# Run from the repo root: python -m benchmarks.bench_async_provider [--rtt 0.15]
+"""
+Times the Overview tab's 14 index quotes plus their exchange rates, and the Quotes tab's
+32-ticker snapshot, against stub provider calls that each take one round trip (--rtt):
+blocking calls one after another, as before, versus YahooAsyncProvider gathered on one
+event loop through SyncProvider. Checks both paths build the same quotes frame and that
+the async ones finish in about one round trip, and that a snapshot whose per-ticker fallback
+meets a hanging ticker, or more slow tickers than fit in its deadline, still returns the
+rows it has within that deadline.
+"""
+import argparse
+import time
+
+import pandas as pd
+
+from backend.async_provider import SyncProvider, YahooAsyncProvider
+from backend.market_sim import simulate_ohlcv
+from backend.quote_snapshot import BAR_FIELDS, fetch_quote_snapshot
+from backend.symbol_catalog import SymbolCatalog
+
+
+class StubYahoo:
+    """Blocking stand-ins for the Yahoo calls; each sleeps one round trip."""
+
+    def __init__(self, rtt):
+        self.rtt = rtt
+        self.calls = 0
+
+    def download(self, tickers):
+        self.calls += 1
+        time.sleep(self.rtt)
+        bars = simulate_ohlcv(len(tickers), seed=len(tickers)).to_numpy().reshape(1, -1)
+        columns = pd.MultiIndex.from_product([tickers, BAR_FIELDS])
+        return pd.DataFrame(bars, index=pd.DatetimeIndex(["2024-01-02"], name="Date"), columns=columns)
+
+    def quotes(self, tickers):
+        self.calls += 1
+        time.sleep(self.rtt)
+        return [{'symbol': t, 'shortName': f"{t} name", 'currency': "USD", 'bid': 1.0, 'ask': 1.1,
+                 'fiftyTwoWeekHigh': 2.0, 'fiftyTwoWeekLow': 0.5, 'marketCap': 1e9} for t in tickers]
+
+    def info(self, ticker):
+        self.calls += 1
+        time.sleep(self.rtt)
+        return {'name': f"{ticker} name"}
+
+    def rate(self, base, quote="USD"):
+        self.calls += 1
+        time.sleep(self.rtt)
+        return {'rate': 1.0 + len(base) / 100, 'change_pct': -0.1}
+
+
+def timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return time.perf_counter() - start, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rtt", type=float, default=0.15, help="seconds per stub provider call")
+    args = parser.parse_args()
+
+    catalog = SymbolCatalog.load()
+    indices = catalog.filter(tag='country_index')
+    index_tickers = list(indices.tickers)
+    currencies = sorted(set(indices.frame['currency'].dropna()) - {'USD'})
+    top_quotes = list(catalog.filter(tag='top_quotes').tickers)
+
+    stub = StubYahoo(args.rtt)
+    snapshot_stubs = dict(download=stub.download, fetch_metadata=stub.quotes, fetch_missing=None)
+
+    def blocking_overview():
+        quotes = fetch_quote_snapshot(index_tickers, **snapshot_stubs)
+        return quotes, {base: stub.rate(base) for base in currencies}
+
+    provider = YahooAsyncProvider(download=stub.download, fetch_quotes=stub.quotes, fetch_info=stub.info, fetch_rate=stub.rate)
+    facade = SyncProvider(provider)
+
+    def async_overview():
+        return tuple(facade.gather(provider.quote_snapshot(index_tickers), provider.exchange_rates(currencies)))
+
+    rows = [
+        (f"Overview: {len(index_tickers)} indices + {len(currencies)} FX rates", blocking_overview, async_overview),
+        (f"Quotes: {len(top_quotes)} tickers",
+         lambda: (fetch_quote_snapshot(top_quotes, **snapshot_stubs), None),
+         lambda: (facade.quote_snapshot(top_quotes), None)),
+        (f"Metadata: {len(top_quotes)} tickers one by one",
+         lambda: (None, {t: stub.info(t) for t in top_quotes}),
+         lambda: (None, facade.metadata(top_quotes))),
+    ]
+    for label, blocking, concurrent in rows:
+        blocking_time, expected = timed(blocking)
+        async_time, result = timed(concurrent)
+        print(f"{label:42s} blocking {blocking_time:5.2f} s   async {async_time:5.2f} s   "
+              f"({async_time / args.rtt:4.1f} round trips)")
+        if expected[0] is not None:
+            pd.testing.assert_frame_equal(result[0], expected[0])
+        assert result[1] == expected[1]
+        assert async_time < 1.5 * args.rtt + 0.05, f"{label}: more than about one round trip"
+    facade.close()
+    print("Async results match the blocking ones")
+
+    # The batched quote request fails and one ticker's metadata hangs: the per-ticker fallback
+    # gives up on it after its retries, and the snapshot still has every other ticker's row
+    def failing_quotes(tickers):
+        raise ConnectionError("quote endpoint down")
+
+    def hanging_info(ticker):
+        if ticker == "HANG":
+            time.sleep(5.0)
+        return stub.info(ticker)
+
+    slow = YahooAsyncProvider(timeout=0.5, download=stub.download, fetch_quotes=failing_quotes, fetch_info=hanging_info)
+    facade = SyncProvider(slow)
+    elapsed, partial = timed(lambda: facade.quote_snapshot(["AAPL", "MSFT", "HANG"]))
+    facade.close()
+    print(f"Snapshot with a hanging ticker: {elapsed:.2f} s (fallback stops after {slow.fallback_timeout:.2f} s)")
+    names = partial.set_index('ticker')['name']
+    assert list(names.index) == ["AAPL", "MSFT", "HANG"], names
+    assert names[["AAPL", "MSFT"]].tolist() == ["AAPL name", "MSFT name"]
+    assert names["HANG"] == "HANG", "a ticker without metadata falls back to its symbol as the name"
+    assert elapsed < slow.fallback_timeout + slow.timeout, elapsed
+
+    # Many slow tickers: the fallback's deadline doesn't grow with their number, so the
+    # snapshot returns the rows it has and leaves the rest without metadata
+    def slow_info(ticker):
+        time.sleep(0.3)
+        return stub.info(ticker)
+
+    many = [f"T{i:03d}" for i in range(96)]
+    slow = YahooAsyncProvider(timeout=0.5, download=stub.download, fetch_quotes=failing_quotes, fetch_info=slow_info)
+    facade = SyncProvider(slow)
+    elapsed, partial = timed(lambda: facade.quote_snapshot(many))
+    facade.close()
+    filled = (partial['name'] != partial['ticker']).sum()
+    print(f"Snapshot of {len(many)} slow tickers: {elapsed:.2f} s, {filled} with metadata "
+          f"(one at a time per worker would take {len(many) / slow.fallback_workers * 0.3:.1f} s)")
+    assert partial['ticker'].tolist() == many
+    assert 0 < filled < len(many)
+    assert elapsed < slow.fallback_timeout + slow.timeout, elapsed
+
+
+if __name__ == "__main__":
+    main()
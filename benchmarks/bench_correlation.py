@@ -0,0 +1,79 @@
+# benchmarks/bench_correlation.py
+# Run from the repo root: python -m benchmarks.bench_correlation [--symbols 500] [--periods 1260] [--moves 50]
+"""
+Simulates a user dragging the Analytics tab's lookback slider over a returns panel of
+--symbols symbols and compares, per slider position:
+  - DataFrame.corr() over the last `lookback` rows (a full O(T * N^2) recompute),
+  - RollingCorrelation.correlation(lookback), which only adds or removes the rows between
+    the previous and the new lookback.
+Checks the matrices against pandas (also with missing returns) and the pairwise rolling
+series against Series.rolling().corr().
+"""
+import argparse
+import time
+
+import numpy as np
+
+from backend import analytics, market_sim
+from backend.correlation import RollingCorrelation
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--symbols", type=int, default=500)
+    parser.add_argument("--periods", type=int, default=1260)
+    parser.add_argument("--moves", type=int, default=50)
+    args = parser.parse_args()
+
+    names = [f"S{i:04d}" for i in range(args.symbols)]
+    returns = analytics.returns_frame(market_sim.simulate_prices(names, args.periods + 1, seed=5, correlation=0.3))
+    rng = np.random.default_rng(0)
+    # A slider drag: small steps between 10 and 365 periods
+    lookbacks = np.clip(120 + np.cumsum(rng.integers(-10, 11, args.moves)), 10, 365)
+
+    start = time.perf_counter()
+    for lookback in lookbacks[:10]:
+        expected = returns.iloc[-lookback:].corr()
+    pandas_time = (time.perf_counter() - start) / 10
+
+    start = time.perf_counter()
+    engine = RollingCorrelation(returns)
+    setup_time = time.perf_counter() - start
+    start = time.perf_counter()
+    for lookback in lookbacks:
+        actual = engine.correlation(int(lookback))
+    engine_time = (time.perf_counter() - start) / len(lookbacks)
+
+    print(f"{args.symbols} symbols x {args.periods} periods, {len(lookbacks)} slider positions")
+    print(f"DataFrame.corr() per position:        {pandas_time * 1000:8.2f} ms")
+    print(f"RollingCorrelation per position:      {engine_time * 1000:8.2f} ms   (setup {setup_time * 1000:.1f} ms)")
+    assert np.allclose(actual.to_numpy(), returns.iloc[-int(lookbacks[-1]):].corr().to_numpy(), atol=1e-10)
+    assert engine_time < 0.1, "a slider move should update the matrix interactively"
+
+    for lookback in [10, 250, 30, 1000, 365]:
+        assert np.allclose(engine.correlation(lookback).to_numpy(), returns.iloc[-lookback:].corr().to_numpy(), atol=1e-10)
+        assert np.allclose(engine.covariance(lookback).to_numpy(), returns.iloc[-lookback:].cov().to_numpy(), atol=1e-12)
+    assert np.allclose(engine.correlation(60, end=500).to_numpy(), returns.iloc[440:500].corr().to_numpy(), atol=1e-10)
+
+    sparse = returns.iloc[:, :40].copy()
+    sparse.iloc[:200, 1] = np.nan
+    sparse.iloc[::5, 2] = np.nan
+    sparse_engine = RollingCorrelation(sparse)
+    for lookback in [300, 120, 60, 1100]:
+        assert np.allclose(sparse_engine.correlation(lookback).to_numpy(), sparse.iloc[-lookback:].corr().to_numpy(),
+                           atol=1e-10, equal_nan=True)
+    print("matrices match DataFrame.corr()/cov() for every lookback, with and without missing returns")
+
+    start = time.perf_counter()
+    series = engine.pair_series(names[0], names[1], 60)
+    pair_time = time.perf_counter() - start
+    reference = returns[names[0]].rolling(60).corr(returns[names[1]])
+    assert np.allclose(series.to_numpy(), reference.to_numpy(), atol=1e-10, equal_nan=True)
+    sparse_series = sparse_engine.pair_series(names[1], names[2], 60, min_periods=30)
+    sparse_reference = sparse[names[1]].rolling(60, min_periods=30).corr(sparse[names[2]])
+    assert np.allclose(sparse_series.to_numpy(), sparse_reference.to_numpy(), atol=1e-10, equal_nan=True)
+    print(f"pair_series over {args.periods} periods: {pair_time * 1000:.2f} ms, matches Series.rolling().corr()")
+
+
+if __name__ == "__main__":
+    main()
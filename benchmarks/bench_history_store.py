@@ -0,0 +1,131 @@
+# benchmarks/bench_history_store.py
+# Run from the repo root: python -m benchmarks.bench_history_store [--weeks 6] [--repeat 5]
+"""
+Compares reading cached 1-minute history from the memory-mapped Arrow store with the
+in-memory pandas paths it replaces (a pickled frame, as st.cache_data keeps it, and the
+CSV export). Each path answers the same question: the OHLCV columns for the last 5
+sessions, and the Close column for the last session. Then refreshes one symbol for
+different periods from several threads at once and checks that no write fails and no
+thread's bars are lost.
+"""
+import argparse
+import os
+import tempfile
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+
+from backend.history_store import BAR_COLUMNS, HistoryStore, period_window
+
+
+def synthetic_minute_bars(weeks, seed=0):
+    rng = np.random.default_rng(seed)
+    index = pd.date_range("2024-01-01", periods=weeks * 7 * 24 * 60, freq="1min", tz="America/New_York", name="Datetime")
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.0005, len(index))))
+    spread = np.abs(rng.normal(0, 0.0008, len(index))) * close
+    return pd.DataFrame({
+        'Open': np.roll(close, 1),
+        'High': close + spread,
+        'Low': close - spread,
+        'Close': close,
+        'Volume': rng.integers(100, 10_000, len(index)),
+        'Dividends': 0.0,
+        'Stock Splits': 0.0,
+    }, index=index)
+
+
+def read_csv_bars(path, tz):
+    frame = pd.read_csv(path, index_col=0)
+    frame.index = pd.to_datetime(frame.index, utc=True).tz_convert(tz)
+    return frame
+
+
+def best_of(fn, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        timings.append(time.perf_counter() - start)
+    return min(timings), result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--weeks", type=int, default=6)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    bars = synthetic_minute_bars(args.weeks)
+    bars.attrs['period'] = 'max'
+    workdir = tempfile.mkdtemp()
+    store = HistoryStore(root=workdir)
+    # "raw" has no RETENTION entry, so the store keeps every bar like the pickle does
+    store.write("SYN", "raw", bars)
+    pickle_path = os.path.join(workdir, "SYN.pkl")
+    csv_path = os.path.join(workdir, "SYN.csv")
+    bars.to_pickle(pickle_path)
+    bars.to_csv(csv_path)
+
+    cases = [
+        ("pickle, OHLCV last 5d", lambda: period_window(pd.read_pickle(pickle_path), '5d')[BAR_COLUMNS]),
+        ("csv, OHLCV last 5d", lambda: period_window(read_csv_bars(csv_path, bars.index.tz), '5d')[BAR_COLUMNS]),
+        ("arrow mmap, OHLCV last 5d", lambda: store.read("SYN", "raw", columns=BAR_COLUMNS, period='5d')),
+        ("pickle, Close last 1d", lambda: period_window(pd.read_pickle(pickle_path), '1d')[['Close']]),
+        ("arrow mmap, Close last 1d", lambda: store.read("SYN", "raw", columns=['Close'], period='1d')),
+    ]
+
+    print(f"{len(bars):,} one-minute bars, {len(bars.columns)} columns")
+    print(f"on disk: pickle {os.path.getsize(pickle_path) / 1e6:.1f} MB, csv {os.path.getsize(csv_path) / 1e6:.1f} MB, "
+          f"arrow {os.path.getsize(store.path('SYN', 'raw')) / 1e6:.1f} MB")
+    for label, fn in cases:
+        repeat = 1 if label.startswith("csv") else args.repeat
+        elapsed, result = best_of(fn, repeat)
+        print(f"{label:28s} {elapsed * 1000:9.2f} ms  {len(result):>7,} rows  "
+              f"{result.memory_usage(deep=True).sum() / 1e6:6.2f} MB returned")
+
+    check_concurrent_refresh(workdir)
+
+
+def check_concurrent_refresh(workdir, threads=4, trials=20):
+    """
+    refresh() for different periods isn't coalesced by the SingleFlight, so these threads
+    all update the same file at once; each fetch adds bars no other thread returns.
+    """
+    full = synthetic_minute_bars(1, seed=1)
+    errors = []
+    for trial in range(trials):
+        calls = []
+        lock = threading.Lock()
+
+        def fetch(symbol, interval, period=None, start=None):
+            # Every call returns its own slice of the week, so a lost update loses bars
+            with lock:
+                calls.append(period or start)
+                part = len(calls)
+            time.sleep(0.005)
+            return full.iloc[part * 60:(part + 1) * 60].copy()
+
+        store = HistoryStore(root=os.path.join(workdir, f"race{trial}"), fetch=fetch)
+
+        def refresh(period):
+            try:
+                store.refresh("AAPL", "1m", period)
+            except Exception as e:
+                errors.append(e)
+
+        workers = [threading.Thread(target=refresh, args=(f"{day + 1}d",)) for day in range(threads)]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+        stored = store.read("AAPL", "1m")
+        assert len(stored) == 60 * len(calls), f"lost an update: {len(stored)} bars from {len(calls)} fetches"
+        assert not [name for name in os.listdir(os.path.dirname(store.path("AAPL", "1m"))) if name.endswith(".tmp")]
+    assert not errors, errors[:3]
+    print(f"{trials} x {threads} concurrent refreshes of one file: no failed writes, no lost bars")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,143 @@
+# benchmarks/bench_indicators.py
+# Run from the repo root: python -m benchmarks.bench_indicators [--bars 7200] [--period 200]
+"""
+Checks backend.indicators against the loop implementations the Charts tab used before
+(golden values on a fixed seed) and times both.
+
+Two reference loops differ from the old inline code on purpose: WMA/HMA weight the
+newest bar highest (the old loop weighted the oldest bar highest), and Bollinger bands
+use num_std * std (the old code shadowed the "BB Std Dev" input and used std ** 2).
+"""
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from backend import indicators
+
+
+def reference_wma(closes, period):
+    values = []
+    for i in range(len(closes)):
+        if i < period - 1 or any(pd.isna(closes[i - j]) for j in range(period)):
+            values.append(np.nan)
+        else:
+            weights = list(range(1, period + 1))
+            weighted_sum = sum(closes[i - j] * weights[period - 1 - j] for j in range(period))
+            values.append(weighted_sum / sum(weights))
+    return values
+
+
+def reference_hma(closes, period):
+    wma_half = reference_wma(closes, period // 2)
+    wma_full = reference_wma(closes, period)
+    raw = [2 * h - f if not (pd.isna(h) or pd.isna(f)) else np.nan for h, f in zip(wma_half, wma_full)]
+    return reference_wma(raw, int(np.sqrt(period)))
+
+
+def reference_vwap(opens, highs, lows, closes, volumes):
+    typical_prices = [(opens[i] + highs[i] + lows[i] + closes[i]) / 4 for i in range(len(opens))]
+    values = []
+    cumulative_tpv = 0
+    cumulative_volume = 0
+    for i in range(len(typical_prices)):
+        cumulative_tpv += typical_prices[i] * volumes[i]
+        cumulative_volume += volumes[i]
+        values.append(cumulative_tpv / cumulative_volume if cumulative_volume > 0 else typical_prices[i])
+    return values
+
+
+def reference_rsi(closes, period):
+    delta = pd.Series(closes).diff()
+    gain = (delta.where(delta > 0, 0)).rolling(window=period).mean()
+    loss = (-delta.where(delta < 0, 0)).rolling(window=period).mean()
+    return 100 - (100 / (1 + gain / loss))
+
+
+def reference_atr(highs, lows, closes, period):
+    high_low = pd.Series(highs) - pd.Series(lows)
+    high_close = abs(pd.Series(highs) - pd.Series(closes).shift(1))
+    low_close = abs(pd.Series(lows) - pd.Series(closes).shift(1))
+    return pd.concat([high_low, high_close, low_close], axis=1).max(axis=1).rolling(window=period).mean()
+
+
+def reference_stochastic(highs, lows, closes, k, d):
+    lowest_low = pd.Series(lows).rolling(window=k).min()
+    highest_high = pd.Series(highs).rolling(window=k).max()
+    k_percent = 100 * ((pd.Series(closes) - lowest_low) / (highest_high - lowest_low))
+    return k_percent, k_percent.rolling(window=d).mean()
+
+
+def reference_williams_r(highs, lows, closes, period):
+    highest_high = pd.Series(highs).rolling(window=period).max()
+    lowest_low = pd.Series(lows).rolling(window=period).min()
+    return -100 * ((highest_high - pd.Series(closes)) / (highest_high - lowest_low))
+
+
+def reference_macd(closes, fast, slow, signal):
+    macd_line = pd.Series(closes).ewm(span=fast).mean() - pd.Series(closes).ewm(span=slow).mean()
+    signal_line = macd_line.ewm(span=signal).mean()
+    return macd_line, signal_line, macd_line - signal_line
+
+
+def reference_bollinger(closes, period, num_std):
+    middle = pd.Series(closes).rolling(window=period).mean()
+    std = pd.Series(closes).rolling(window=period).std()
+    return middle + num_std * std, middle, middle - num_std * std
+
+
+def sample_bars(n, seed=42):
+    """Random-walk OHLCV lists shaped like the Charts tab's sample data."""
+    rng = np.random.default_rng(seed)
+    base_price = 500.0
+    closes = base_price + np.cumsum(rng.normal(0, base_price * 0.02, n))
+    opens = np.roll(closes, 1)
+    opens[0] = base_price
+    highs = np.maximum(opens, closes) + np.abs(rng.normal(0, base_price * 0.01, n))
+    lows = np.minimum(opens, closes) - np.abs(rng.normal(0, base_price * 0.01, n))
+    volumes = rng.integers(100000, 1000000, n)
+    return opens.tolist(), highs.tolist(), lows.tolist(), closes.tolist(), volumes.tolist()
+
+
+def timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return time.perf_counter() - start, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--bars", type=int, default=7200)
+    parser.add_argument("--period", type=int, default=200)
+    args = parser.parse_args()
+
+    o, h, l, c, v = sample_bars(args.bars)
+    p = args.period
+    cases = [
+        ("SMA", lambda: pd.Series(c).rolling(window=p).mean(), lambda: indicators.sma(c, p)),
+        ("EMA", lambda: pd.Series(c).ewm(span=p).mean(), lambda: indicators.ema(c, p)),
+        ("WMA", lambda: reference_wma(c, p), lambda: indicators.wma(c, p)),
+        ("HMA", lambda: reference_hma(c, p), lambda: indicators.hma(c, p)),
+        ("VWAP", lambda: reference_vwap(o, h, l, c, v), lambda: indicators.vwap(o, h, l, c, v)),
+        ("Bollinger", lambda: reference_bollinger(c, p, 2.0), lambda: indicators.bollinger(c, p, 2.0)),
+        ("RSI", lambda: reference_rsi(c, 14), lambda: indicators.rsi(c, 14)),
+        ("MACD", lambda: reference_macd(c, 12, 26, 9), lambda: indicators.macd(c, 12, 26, 9)),
+        ("Stochastic", lambda: reference_stochastic(h, l, c, 14, 3), lambda: indicators.stochastic(h, l, c, 14, 3)),
+        ("Williams %R", lambda: reference_williams_r(h, l, c, 14), lambda: indicators.williams_r(h, l, c, 14)),
+        ("ATR", lambda: reference_atr(h, l, c, 14), lambda: indicators.atr(h, l, c, 14)),
+    ]
+
+    print(f"{args.bars} bars, period {p}")
+    for name, reference, vectorized in cases:
+        reference_time, expected = timed(reference)
+        vectorized_time, actual = timed(vectorized)
+        if not isinstance(expected, tuple):
+            expected, actual = (expected,), (actual,)
+        for e, a in zip(expected, actual):
+            np.testing.assert_allclose(np.asarray(a, dtype=float), np.asarray(e, dtype=float), rtol=1e-9, atol=1e-9, equal_nan=True)
+        print(f"{name:12s} reference {reference_time * 1000:9.2f} ms   vectorized {vectorized_time * 1000:7.2f} ms   golden values match")
+
+
+if __name__ == "__main__":
+    main()
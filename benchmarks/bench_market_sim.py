@@ -0,0 +1,85 @@
+# benchmarks/bench_market_sim.py
+# Run from the repo root: python -m benchmarks.bench_market_sim [--bars 7200] [--symbols 2000]
+"""
+Times backend.market_sim against the per-bar loop the Charts tab used before, checks the
+generated bars are well-formed and reproducible from a seed, and that the return panel
+has the requested correlation, then scales both up to load-test sizes.
+"""
+import argparse
+import time
+
+import numpy as np
+
+from backend import market_sim
+
+
+def legacy_ohlcv(periods):
+    base_price = 100.0 + np.random.randint(0, 900)
+    opens, highs, lows, closes, volumes = [], [], [], [], []
+    current_price = base_price
+    for i in range(periods):
+        current_price += np.random.normal(0, base_price * 0.02)
+        open_price = current_price
+        high_price = open_price + abs(np.random.normal(0, base_price * 0.01))
+        low_price = open_price - abs(np.random.normal(0, base_price * 0.01))
+        close_price = open_price + np.random.normal(0, base_price * 0.005)
+        opens.append(open_price)
+        highs.append(max(high_price, open_price, close_price))
+        lows.append(min(low_price, open_price, close_price))
+        closes.append(close_price)
+        volumes.append(np.random.randint(100000, 1000000))
+        current_price = close_price
+    return opens, highs, lows, closes, volumes
+
+
+def timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return time.perf_counter() - start, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--bars", type=int, default=7200)
+    parser.add_argument("--symbols", type=int, default=2000)
+    parser.add_argument("--large-bars", type=int, default=5_000_000)
+    args = parser.parse_args()
+
+    legacy_time, _ = timed(lambda: legacy_ohlcv(args.bars))
+    vectorized_time, bars = timed(lambda: market_sim.simulate_ohlcv(args.bars, seed=7))
+    print(f"OHLCV {args.bars:,} bars   per-bar loop {legacy_time * 1000:8.2f} ms   vectorized {vectorized_time * 1000:6.2f} ms")
+
+    assert bars.equals(market_sim.simulate_ohlcv(args.bars, seed=7)), "same seed must give the same bars"
+    assert not bars.equals(market_sim.simulate_ohlcv(args.bars, seed=8))
+    assert (bars['High'] >= bars[['Open', 'Close']].max(axis=1)).all()
+    assert (bars['Low'] <= bars[['Open', 'Close']].min(axis=1)).all()
+    # Each bar opens one N(0, 2% of base) gap away from the previous close
+    fixed = market_sim.simulate_ohlcv(100_000, seed=7, base_price=500.0)
+    gaps = fixed['Open'].to_numpy()[1:] - fixed['Close'].to_numpy()[:-1]
+    assert abs(np.std(gaps) - 10.0) < 0.2
+
+    large_time, large = timed(lambda: market_sim.simulate_ohlcv(args.large_bars, seed=1))
+    print(f"OHLCV {args.large_bars:,} bars   {large_time * 1000:8.2f} ms   {large.memory_usage().sum() / 2**20:.0f} MB")
+
+    symbols = [f"SYM{i:05d}" for i in range(args.symbols)]
+    panel_time, panel = timed(lambda: market_sim.simulate_returns(symbols, 2520, seed=3, correlation=0.4))
+    off_diagonal = panel.corr().to_numpy()[~np.eye(len(symbols), dtype=bool)]
+    print(f"Returns {len(symbols):,} symbols x 2520   {panel_time * 1000:8.2f} ms   mean pairwise corr {off_diagonal.mean():.3f} (target 0.400)")
+    assert abs(off_diagonal.mean() - 0.4) < 0.05
+
+    # Adding symbols must not change the series of the ones already selected
+    subset = market_sim.simulate_returns(symbols[:5], 2520, seed=3, correlation=0.4)
+    np.testing.assert_array_equal(subset.to_numpy(), panel[symbols[:5]].to_numpy())
+
+    target = np.array([[1.0, 0.8, -0.3], [0.8, 1.0, -0.1], [-0.3, -0.1, 1.0]])
+    matrix_panel = market_sim.simulate_returns(["A", "B", "C"], 200_000, seed=5, correlation=target)
+    np.testing.assert_allclose(matrix_panel.corr().to_numpy(), target, atol=0.01)
+    print("Correlation-matrix panel matches the target within 0.01")
+
+    prices = market_sim.simulate_prices(symbols[:50], 365, seed=9)
+    assert (prices > 0).all().all()
+    print("All checks passed")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,142 @@
+# benchmarks/bench_metadata_cache.py
+# Run from the repo root: python -m benchmarks.bench_metadata_cache [--tickers 5000]
+"""
+Checks backend.metadata_cache.MetadataCache on a temporary SQLite file with a fake clock:
+  - each tier expires on its own TTL (memory first, then disk), and disk hits are promoted,
+  - the memory tier evicts the least recently used ticker once it holds `memory_size`,
+  - put_many merges new fields into stored ones, and entries survive a new instance,
+  - export_seed -> load_seed round-trips every entry, and a seed never replaces fresh rows,
+then times get_many for --tickers tickers from disk and from memory.
+"""
+import argparse
+import json
+import os
+import tempfile
+import time
+
+from backend.metadata_cache import MetadataCache
+
+
+class FakeClock:
+    def __init__(self, now=1_000_000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+def check_ttls(root):
+    clock = FakeClock()
+    cache = MetadataCache(os.path.join(root, "ttl.sqlite"), memory_ttl=10, disk_ttl=100, clock=clock)
+    cache.put("AAPL", {'name': "Apple"})
+    start = clock.now
+
+    clock.now = start + 10
+    assert cache.get("AAPL") == {'name': "Apple"} and cache.hits == {'memory': 1, 'disk': 0}
+    clock.now = start + 11
+    assert cache.get("AAPL") == {'name': "Apple"} and cache.hits == {'memory': 1, 'disk': 1}
+    # Promoted at +11, so memory serves it again until +21
+    clock.now = start + 21
+    assert cache.get("AAPL") == {'name': "Apple"} and cache.hits == {'memory': 2, 'disk': 1}
+    clock.now = start + 100
+    assert cache.get("AAPL") == {'name': "Apple"} and cache.hits == {'memory': 2, 'disk': 2}
+    clock.now = start + 111
+    assert cache.get("AAPL") is None and cache.misses == 1
+    print("memory and disk entries expire on their own TTLs; disk hits are promoted")
+
+
+def check_eviction(root):
+    cache = MetadataCache(os.path.join(root, "lru.sqlite"), memory_size=3, clock=FakeClock())
+    for ticker in ["A", "B", "C"]:
+        cache.put(ticker, {'name': ticker})
+    cache.get("A")   # B is now the least recently used
+    cache.put("D", {'name': "D"})
+    assert list(cache._memory) == ["C", "A", "D"]
+    before = dict(cache.hits)
+    assert cache.get_many(["A", "C", "D"]) == {t: {'name': t} for t in "ACD"}
+    assert cache.hits['memory'] == before['memory'] + 3
+    # The evicted ticker comes back from disk and pushes out the next least recently used (A)
+    assert cache.get("B") == {'name': "B"} and cache.hits['disk'] == before['disk'] + 1
+    assert list(cache._memory) == ["C", "D", "B"]
+    print("memory tier evicts the least recently used ticker at memory_size")
+
+
+def check_merge_and_persistence(root):
+    clock = FakeClock()
+    path = os.path.join(root, "merge.sqlite")
+    cache = MetadataCache(path, clock=clock)
+    cache.put_many({"AAPL": {'name': "Apple"}, "MSFT": {'name': "Microsoft", 'currency': "USD"}})
+    cache.put_many({"AAPL": {'currency': "USD"}, "MSFT": {'name': "Microsoft Corp"}})
+    expected = {"AAPL": {'name': "Apple", 'currency': "USD"}, "MSFT": {'name': "Microsoft Corp", 'currency': "USD"}}
+    assert cache.get_many(["AAPL", "MSFT", "NONE"]) == expected
+
+    reopened = MetadataCache(path, clock=clock)
+    assert reopened.get_many(["AAPL", "MSFT"]) == expected
+    assert reopened.hits == {'memory': 0, 'disk': 2}
+    # A fresh instance merges into what the first one wrote, not into an empty memory tier
+    reopened.put("AAPL", {'year_high': 200.0})
+    assert MetadataCache(path, clock=clock).get("AAPL") == {**expected["AAPL"], 'year_high': 200.0}
+    print("put_many merges fields, and entries persist across instances")
+
+
+def check_seed_round_trip(root):
+    clock = FakeClock()
+    entries = {f"T{i:03d}": {'name': f"Ticker {i}", 'currency': "USD" if i % 2 else "EUR"} for i in range(50)}
+    source = MetadataCache(os.path.join(root, "source.sqlite"), clock=clock)
+    source.put_many(entries)
+    seed_path = os.path.join(root, "seed.json")
+    assert source.export_seed(seed_path) == len(entries)
+    with open(seed_path) as f:
+        assert json.load(f) == entries
+
+    target = MetadataCache(os.path.join(root, "target.sqlite"), clock=clock)
+    target.put("T000", {'name': "Fresher name"})
+    # Every seed row is written except the one the target already has fresh
+    assert target.load_seed(seed_path) == len(entries) - 1
+    assert target.get("T000") == {'name': "Fresher name"}
+    copy_path = os.path.join(root, "copy.json")
+    target.export_seed(copy_path)
+    with open(copy_path) as f:
+        assert json.load(f) == {**entries, "T000": {'name': "Fresher name"}}
+
+    # Once the target's row has expired, the seed replaces it
+    clock.now += target.disk_ttl + 1
+    assert target.load_seed(seed_path) == len(entries)
+    assert target.get_many(list(entries)) == entries
+    print("export_seed -> load_seed round-trips every entry, and fresh rows beat the seed")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--tickers", type=int, default=5000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as root:
+        check_ttls(root)
+        check_eviction(root)
+        check_merge_and_persistence(root)
+        check_seed_round_trip(root)
+
+        tickers = [f"S{i:05d}" for i in range(args.tickers)]
+        path = os.path.join(root, "timing.sqlite")
+        start = time.perf_counter()
+        MetadataCache(path).put_many({ticker: {'name': ticker, 'currency': "USD"} for ticker in tickers})
+        put_time = time.perf_counter() - start
+
+        cache = MetadataCache(path, memory_size=args.tickers)
+        start = time.perf_counter()
+        assert len(cache.get_many(tickers)) == args.tickers
+        disk_time = time.perf_counter() - start
+        start = time.perf_counter()
+        assert len(cache.get_many(tickers)) == args.tickers
+        memory_time = time.perf_counter() - start
+        assert cache.hits == {'memory': args.tickers, 'disk': args.tickers}
+
+    print(f"\n{args.tickers} tickers")
+    print(f"put_many:             {put_time * 1000:8.1f} ms")
+    print(f"get_many from disk:   {disk_time * 1000:8.1f} ms")
+    print(f"get_many from memory: {memory_time * 1000:8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
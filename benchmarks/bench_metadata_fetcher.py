@@ -0,0 +1,121 @@
+# benchmarks/bench_metadata_fetcher.py
+# Run from the repo root: python -m benchmarks.bench_metadata_fetcher [--tickers 32] [--workers 8]
+"""
+Runs the concurrent metadata fetcher against a local fake provider that injects
+latency, transient errors, partial responses and hanging requests, and compares
+the wall time with what the old one-ticker-after-another loop would have taken. Then
+checks that tickers whose requests never return fail on their own, without timing out
+the healthy tickers queued behind them.
+"""
+import argparse
+import random
+import threading
+import time
+
+from backend.metadata_fetcher import METADATA_FIELDS, fetch_metadata_concurrently
+
+
+class FakeMetadataProvider:
+    """Per-ticker behaviour is drawn once from `seed`, so runs are reproducible."""
+
+    def __init__(self, tickers, seed=0, error_rate=0.15, partial_rate=0.1, hang_rate=0.05, hang_seconds=3.0):
+        rng = random.Random(seed)
+        self.hang_seconds = hang_seconds
+        self.plan = {}
+        for ticker in tickers:
+            roll = rng.random()
+            if roll < hang_rate:
+                kind = "hang"
+            elif roll < hang_rate + error_rate:
+                kind = "flaky"
+            elif roll < hang_rate + error_rate + partial_rate:
+                kind = "partial"
+            else:
+                kind = "ok"
+            self.plan[ticker] = (kind, rng.uniform(0.05, 0.4))
+        self.calls = {ticker: 0 for ticker in tickers}
+        self._lock = threading.Lock()
+
+    def serial_cost(self):
+        """Seconds the sequential loop would spend, assuming every request eventually returns."""
+        return sum(self.hang_seconds if kind == "hang" else latency for kind, latency in self.plan.values())
+
+    def __call__(self, ticker):
+        with self._lock:
+            self.calls[ticker] += 1
+            call = self.calls[ticker]
+        kind, latency = self.plan[ticker]
+        if kind == "hang":
+            time.sleep(self.hang_seconds)
+        time.sleep(latency)
+        if kind == "flaky" and call == 1:
+            raise ConnectionError("injected transient error")
+        fields = {name: f"{ticker}:{name}" for name in METADATA_FIELDS}
+        if kind == "partial":
+            fields = {name: fields[name] for name in ('name', 'currency')}
+        return fields
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--tickers", type=int, default=32)
+    parser.add_argument("--workers", type=int, default=8)
+    parser.add_argument("--timeout", type=float, default=1.0)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    tickers = [f"T{i:04d}" for i in range(args.tickers)]
+    provider = FakeMetadataProvider(tickers, seed=args.seed, hang_seconds=2 * args.timeout)
+
+    start = time.perf_counter()
+    results = fetch_metadata_concurrently(tickers, fetch_one=provider, max_workers=args.workers, timeout=args.timeout, retries=1, backoff=0.1)
+    elapsed = time.perf_counter() - start
+
+    complete = sum(r.complete for r in results.values())
+    partial = sum(r.ok and not r.complete for r in results.values())
+    failed = [r for r in results.values() if not r.ok]
+    slowest = max(latency for kind, latency in provider.plan.values() if kind != "hang")
+
+    print(f"{args.tickers} tickers, {args.workers} workers, {args.timeout}s timeout")
+    print(f"sequential estimate: {provider.serial_cost():7.2f} s")
+    print(f"concurrent fetch:    {elapsed:7.2f} s  (slowest single request {slowest:.2f} s)")
+    print(f"complete: {complete}  partial: {partial}  failed: {len(failed)}")
+    for result in failed:
+        print(f"  {result.ticker}: {result.error} after {result.attempts} attempts")
+
+    check_hung_tickers()
+
+
+def check_hung_tickers(count=32, hung=(0, 1, 2, 3), workers=8, timeout=0.5):
+    """
+    Hung requests hold their threads for longer than the whole fetch; every retry of them
+    hangs too. Only the hung tickers may fail, and the fetch still ends within their attempts.
+    """
+    release = threading.Event()
+    tickers = [f"T{i}" for i in range(count)]
+    hung = {tickers[i] for i in hung}
+
+    def fetch_one(ticker):
+        if ticker in hung:
+            release.wait()
+        # Healthy requests are slow but well inside the timeout
+        time.sleep(0.8 * timeout)
+        return {name: f"{ticker}:{name}" for name in METADATA_FIELDS}
+
+    start = time.perf_counter()
+    try:
+        results = fetch_metadata_concurrently(tickers, fetch_one=fetch_one, max_workers=workers, timeout=timeout, retries=2, backoff=0.25)
+    finally:
+        release.set()
+    elapsed = time.perf_counter() - start
+    failed = {ticker for ticker, result in results.items() if not result.ok}
+    assert failed == hung, sorted(failed ^ hung)
+    assert all(results[ticker].attempts == 3 for ticker in hung)
+    # Hung attempts hold a slot for one timeout each, so the healthy tickers share what's left
+    # of the pool; nothing waits for the hung threads themselves
+    assert elapsed < 8 * timeout, elapsed
+    print(f"{len(hung)} hung tickers of {count}: only they failed, in {elapsed:.2f} s")
+
+
+if __name__ == "__main__":
+    main()
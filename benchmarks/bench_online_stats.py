@@ -0,0 +1,102 @@
+# benchmarks/bench_online_stats.py
+# Run from the repo root: python -m benchmarks.bench_online_stats [--points 1000000] [--window 30]
+"""
+Checks backend.online_stats against NumPy/SciPy and times it on a --points long return
+series:
+  - expanding mean/std/skew/min/max/drawdown against np.mean/np.std/scipy.stats.skew of
+    every prefix (on a short series, where the O(n^2) reference is affordable) and at
+    sampled prefixes of the long one,
+  - rolling mean/std/skew against sliding_window_view reductions, also with missing returns,
+then times the expanding and rolling passes against the list comprehension the Small
+Multiples "Volatility" metric used to run and against sliding_window_view(...).std().
+"""
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+from scipy import stats
+
+from backend import market_sim
+from backend.online_stats import expanding_stats, rolling_moments
+
+
+def reference_drawdown(returns):
+    peak, wealth, worst, drawdowns = 1.0, 1.0, 0.0, []
+    for r in returns:
+        wealth *= 1 + r
+        peak = max(peak, wealth)
+        worst = min(worst, wealth / peak - 1)
+        drawdowns.append(worst)
+    return np.array(drawdowns)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--points", type=int, default=1_000_000)
+    parser.add_argument("--window", type=int, default=30)
+    args = parser.parse_args()
+
+    short = market_sim.simulate_returns(["A", "B", "C"], 400, seed=3, correlation=0.2).to_numpy()
+    expanding = expanding_stats(short)
+    for column in range(short.shape[1]):
+        series = short[:, column]
+        prefixes = [series[:i + 1] for i in range(len(series))]
+        assert np.allclose(expanding['mean'][:, column], [np.mean(p) for p in prefixes], rtol=0, atol=1e-15)
+        assert np.allclose(expanding['std'][:, column], [np.std(p) for p in prefixes], rtol=0, atol=1e-15)
+        assert np.allclose(expanding['skew'][2:, column], [stats.skew(p) for p in prefixes[2:]], atol=1e-10)
+        assert np.array_equal(expanding['min'][:, column], [np.min(p) for p in prefixes])
+        assert np.array_equal(expanding['max'][:, column], [np.max(p) for p in prefixes])
+        assert np.allclose(expanding['max_drawdown'][:, column], reference_drawdown(series), atol=1e-12)
+    for window in [2, 5, 30, 250]:
+        rolling = rolling_moments(short, window)
+        windows = np.lib.stride_tricks.sliding_window_view(short, window, axis=0)
+        assert np.allclose(rolling['mean'], windows.mean(axis=-1), rtol=0, atol=1e-15)
+        # Sliding updates lose a few digits when a window has almost no spread, so allow an
+        # absolute error far below anything a return could show
+        assert np.allclose(rolling['std'], windows.std(axis=-1), rtol=1e-9, atol=1e-12)
+        if window > 2:
+            assert np.allclose(rolling['skew'], stats.skew(windows, axis=-1), atol=1e-8)
+
+    gappy = pd.DataFrame(short)
+    gappy.iloc[[0, 57, 58, 300], 0] = np.nan
+    gappy.iloc[100:130, 1] = np.nan
+    assert np.allclose(rolling_moments(gappy, 20)['std'], gappy.rolling(20).std(ddof=0).iloc[19:], equal_nan=True, atol=1e-15)
+    gappy_stats = expanding_stats(gappy)
+    assert np.allclose(gappy_stats['std'], gappy.expanding().std(ddof=0), equal_nan=True, atol=1e-15)
+    assert np.allclose(gappy_stats['min'], gappy.expanding().min(), equal_nan=True)
+    print("expanding and rolling statistics match NumPy/SciPy, with and without missing returns")
+
+    returns = market_sim.simulate_returns(["X"], args.points, seed=9)["X"].to_numpy()
+    start = time.perf_counter()
+    long_stats = expanding_stats(returns)
+    expanding_time = time.perf_counter() - start
+    for i in [0, 1, 999, args.points // 2, args.points - 1]:
+        assert abs(long_stats['std'][i] - np.std(returns[:i + 1])) < 1e-14
+        assert abs(long_stats['mean'][i] - np.mean(returns[:i + 1])) < 1e-14
+        assert abs(long_stats['skew'][i] - (stats.skew(returns[:i + 1]) if i > 1 else 0.0)) < 1e-9
+
+    # The old per-prefix np.std is quadratic: time a slice and scale by (n / slice)^2
+    sample = min(args.points, 20_000)
+    start = time.perf_counter()
+    [np.std(returns[:i + 1]) if i > 0 else 0 for i in range(sample)]
+    quadratic_time = (time.perf_counter() - start) * (args.points / sample) ** 2
+
+    start = time.perf_counter()
+    rolling = rolling_moments(returns, args.window)
+    rolling_time = time.perf_counter() - start
+    start = time.perf_counter()
+    reference = np.lib.stride_tricks.sliding_window_view(returns, args.window).std(axis=-1)
+    sliding_time = time.perf_counter() - start
+    error = np.max(np.abs(rolling['std'] - reference))
+    assert np.allclose(rolling['std'], reference, rtol=1e-8, atol=1e-12), error
+
+    print(f"\n{args.points:,} points")
+    print(f"expanding stats (8 series), one pass:   {expanding_time * 1000:10.1f} ms")
+    print(f"per-prefix np.std list (extrapolated):  {quadratic_time:10.1f} s")
+    print(f"rolling mean/std/skew, window {args.window:<4d}:    {rolling_time * 1000:10.1f} ms")
+    print(f"sliding_window_view std:                {sliding_time * 1000:10.1f} ms   (max difference {error:.1e})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,139 @@
+# benchmarks/bench_prewarm.py
+# Run from the repo root: python -m benchmarks.bench_prewarm [--latency 0.05] [--requests-per-minute 600]
+"""
+Warms a temporary history store, metadata cache and quote hub from a SimulatedProvider
+(every call waits --latency) for the catalog's universes plus some recorded views, then:
+  - checks coverage goes from cold to complete and a second warm-up fetches nothing,
+  - checks the warm-up stayed within its request budget,
+  - compares a first detail-view history read before and after warming,
+  - checks Schedule.next_after against a minute-by-minute reference.
+"""
+import argparse
+import os
+import random
+import tempfile
+import threading
+import time
+from datetime import datetime, timedelta
+
+from backend.async_provider import SyncProvider
+from backend.history_store import HistoryStore
+from backend.metadata_cache import MetadataCache
+from backend.prewarm import Prewarmer, Schedule, UsageStats
+from backend.providers import SimulatedProvider
+from backend.quote_hub import QuoteHub
+from backend.symbol_catalog import SymbolCatalog
+
+
+class CountingProvider(SyncProvider):
+    """SyncProvider that timestamps every request it passes on."""
+
+    def __init__(self, provider):
+        super().__init__(provider)
+        self.request_times = []
+        self._lock = threading.Lock()
+
+    def _count(self, n=1):
+        with self._lock:
+            self.request_times.extend([time.monotonic()] * n)
+
+    def quote_snapshot(self, tickers, metadata_cache=None):
+        self._count()
+        return super().quote_snapshot(tickers, metadata_cache)
+
+    def metadata(self, tickers):
+        self._count(len(tickers))
+        return super().metadata(tickers)
+
+    def history(self, symbol, interval, period=None, start=None):
+        self._count()
+        return super().history(symbol, interval, period, start)
+
+
+def reference_next(schedule, when):
+    """First matching minute after `when`, stepping one minute at a time."""
+    moment = datetime.fromtimestamp(when, schedule.timezone).replace(second=0, microsecond=0)
+    while True:
+        moment += timedelta(minutes=1)
+        if (moment.minute in schedule.minutes and moment.hour in schedule.hours
+                and moment.month in schedule.months and schedule._day_matches(moment)):
+            return moment.timestamp()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--latency", type=float, default=0.05)
+    parser.add_argument("--requests-per-minute", type=int, default=600)
+    args = parser.parse_args()
+
+    catalog = SymbolCatalog.load()
+    with tempfile.TemporaryDirectory() as root:
+        provider = CountingProvider(SimulatedProvider(latency=args.latency))
+        store = HistoryStore(root=os.path.join(root, "history"), fetch=provider.history)
+        cache = MetadataCache(os.path.join(root, "metadata.sqlite"))
+        hub = QuoteHub(provider.quote_snapshot, interval=60)
+        usage = UsageStats(path=os.path.join(root, "usage.json"))
+        for _ in range(5):
+            usage.record("TSLA", "1h", "1mo")
+        usage.record("NFLX", "15m", "1d")
+        prewarmer = Prewarmer(provider, store, cache, hub, catalog, usage, requests_per_minute=args.requests_per_minute)
+
+        assert usage.top_symbols(1) == ["TSLA"] and usage.top_charts(1) == [("TSLA", "1h", "1mo")]
+        before = prewarmer.coverage()
+        print(f"cold:   {before['ratio']:6.1%} covered   {len(prewarmer.plan())} tasks planned "
+              f"for {len(prewarmer.symbols())} symbols")
+
+        # What the first detail view of the day would wait for without a warm-up
+        cold_store = HistoryStore(root=os.path.join(root, "cold"), fetch=provider.history)
+        start = time.perf_counter()
+        cold_store.get("AAPL", "5m", "1d")
+        cold_read = time.perf_counter() - start
+
+        provider.request_times.clear()
+        start = time.perf_counter()
+        progress = prewarmer.run_once()
+        elapsed = time.perf_counter() - start
+        after = prewarmer.coverage()
+        print(f"warmed: {after['ratio']:6.1%} covered   {progress['fetched']} of {progress['total']} tasks fetched, "
+              f"{progress['failed']} failed, {len(provider.request_times)} requests in {elapsed:.2f} s")
+        assert progress['failed'] == 0 and progress['done'] == progress['total']
+        assert after['ratio'] == 1.0, after
+
+        # The bucket starts with an eighth of a minute's budget and refills at the limit
+        rate = args.requests_per_minute / 60
+        burst = args.requests_per_minute // 8
+        minimum = (len(provider.request_times) - burst) / rate
+        assert elapsed >= 0.95 * minimum, f"{len(provider.request_times)} requests in {elapsed:.2f} s exceed the budget"
+        print(f"budget: {args.requests_per_minute} requests/min -> at least {minimum:.2f} s for these requests; took {elapsed:.2f} s")
+
+        start = time.perf_counter()
+        store.get("AAPL", "5m", "1d")
+        warm_read = time.perf_counter() - start
+        print(f"first detail-view read: cold {cold_read * 1000:6.1f} ms   warmed {warm_read * 1000:6.1f} ms")
+        assert warm_read < cold_read
+
+        provider.request_times.clear()
+        progress = prewarmer.run_once()
+        assert progress['fetched'] == 0 and not provider.request_times, "a second warm-up should find everything fresh"
+        print("second warm-up: everything already fresh, no requests")
+        assert UsageStats(path=usage.path).top_symbols(1) == ["TSLA"], "usage stats should survive a restart"
+        provider.close()
+
+    rng = random.Random(0)
+    expressions = ["20 9 * * 1-5", "*/15 9-16 * * 1-5", "0 0 1 * *", "30 2 * * 0", "0 12 13 * 5", "5,35 */6 * 2,8 *"]
+    checked = 0
+    for expression in expressions:
+        schedule = Schedule(expression, "America/New_York")
+        for _ in range(20):
+            when = 1.7e9 + rng.uniform(0, 3e7)
+            assert schedule.next_after(when) == reference_next(schedule, when), (expression, when)
+            checked += 1
+    start = time.perf_counter()
+    for _ in range(1000):
+        Schedule("0 12 13 * 5").next_after(1.7e9)
+    print(f"Schedule.next_after matches the reference for {checked} cases; "
+          f"{(time.perf_counter() - start):.3f} ms per sparse lookup")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+# benchmarks/bench_providers.py
+# Run from the repo root: python -m benchmarks.bench_providers [--latency 0.05] [--symbols 200]
+"""
+Records a SimulatedProvider (every call waits --latency, like a network round trip) into
+a temporary cassette, then replays it:
+  - every replayed answer equals the recorded one, and takes about the recorded latency,
+    or next to nothing with latency_scale=0,
+  - a call that was never recorded fails instead of reaching a provider,
+  - RoutingProvider sends each data type to its own provider,
+  - HistoryStore works unchanged on top of the replay.
+Nothing here touches the network, so the numbers are the same on every run.
+"""
+import argparse
+import tempfile
+import time
+
+import pandas as pd
+
+from backend.async_provider import AsyncProvider, SyncProvider
+from backend.history_store import HistoryStore
+from backend.providers import Cassette, RecordingProvider, ReplayProvider, RoutingProvider, SimulatedProvider, provider_from_env
+
+
+def calls(provider, tickers):
+    return [
+        provider.quote_snapshot(tickers),
+        provider.metadata(tickers[:20]),
+        provider.history("AAPL", "1d", "1y"),
+        provider.history("AAPL", "5m", "5d"),
+        provider.exchange_rates(["EUR", "JPY", "GBP"]),
+    ]
+
+
+def timed(facade, tickers):
+    start = time.perf_counter()
+    results = facade.gather(*calls(facade.provider, tickers))
+    return results, time.perf_counter() - start
+
+
+def assert_same(expected, actual):
+    for left, right in zip(expected, actual):
+        if isinstance(left, pd.DataFrame):
+            pd.testing.assert_frame_equal(left, right)
+        else:
+            assert left == right, (left, right)
+
+
+class Named(AsyncProvider):
+    """Answers every call with its own name, to see where RoutingProvider sends it."""
+
+    def __init__(self, name):
+        self.name = name
+
+    async def quote_snapshot(self, tickers, metadata_cache=None):
+        return self.name
+
+    async def metadata(self, tickers):
+        return self.name
+
+    async def history(self, symbol, interval, period=None, start=None):
+        return self.name
+
+    async def exchange_rate(self, base, quote="USD"):
+        return self.name
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--latency", type=float, default=0.05)
+    parser.add_argument("--symbols", type=int, default=200)
+    args = parser.parse_args()
+    tickers = [f"S{i:04d}" for i in range(args.symbols)]
+
+    simulated = SimulatedProvider(seed=7, latency=args.latency)
+    assert_same(SyncProvider(simulated).gather(*calls(simulated, tickers)),
+                SyncProvider(SimulatedProvider(seed=7)).gather(*calls(SimulatedProvider(seed=7), tickers)))
+    print("SimulatedProvider: same seed, same answers")
+
+    with tempfile.TemporaryDirectory() as root:
+        cassette = Cassette(root)
+        recorded, elapsed = timed(SyncProvider(RecordingProvider(simulated, cassette)), tickers)
+        print(f"record:    {elapsed * 1000:7.1f} ms   {len(cassette)} responses written")
+
+        for label, replay in [("replay:   ", ReplayProvider(Cassette(root))),
+                              ("replay x0:", ReplayProvider(Cassette(root), latency_scale=0))]:
+            replayed, elapsed = timed(SyncProvider(replay), tickers)
+            assert_same(recorded, replayed)
+            print(f"{label} {elapsed * 1000:7.1f} ms   answers identical to the recording")
+            if replay.latency_scale:
+                # Calls overlap, so the batch takes about as long as the slowest recorded call
+                slowest = max(entry['latency'] for entry in cassette.index.values())
+                assert slowest * 0.9 < elapsed < slowest * 1.5 + 0.05, "replay should take the recorded latency"
+
+        facade = SyncProvider(ReplayProvider(Cassette(root)))
+        try:
+            facade.history("MSFT", "1d", "1y")
+        except KeyError as e:
+            print(f"unrecorded call: KeyError {e}")
+        else:
+            raise AssertionError("an unrecorded call must not be answered")
+
+        with tempfile.TemporaryDirectory() as history_root:
+            store = HistoryStore(root=history_root, fetch=facade.history)
+            bars = store.get("AAPL", "1d", "1y")
+            pd.testing.assert_frame_equal(bars, recorded[2], check_freq=False)
+            print(f"HistoryStore over the replay: {len(bars)} daily bars, same as recorded")
+
+        routed = provider_from_env({'MARKET_DATA_PROVIDER': "replay", 'MARKET_DATA_HISTORY_PROVIDER': "simulated",
+                                    'MARKET_DATA_CASSETTE': root})
+        assert isinstance(routed.default, ReplayProvider) and isinstance(routed.provider_for('history'), SimulatedProvider)
+        assert routed.provider_for('quotes') is routed.provider_for('fx') is routed.default
+
+    facade = SyncProvider(RoutingProvider(Named("default"), history=Named("history"), fx=Named("fx")))
+    routes = facade.gather(facade.provider.quote_snapshot(["A"]), facade.provider.metadata(["A"]),
+                           facade.provider.history("A", "1d"), facade.provider.exchange_rate("EUR"))
+    assert routes == ["default", "default", "history", "fx"], routes
+    print("RoutingProvider: quotes/metadata -> default, history -> history, fx -> fx")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+# benchmarks/bench_quote_diff.py
+# Run from the repo root: python -m benchmarks.bench_quote_diff [--sizes 3000 30000] [--changed 0.02]
+"""
+Simulates one refresh of a large quotes grid: a fraction of rows tick, a few tickers are
+listed or delisted. Times diff_quotes against the 1 s refresh budget and checks the delta
+against a row-by-row comparison of the two snapshots.
+"""
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from backend.quote_table import diff_quotes
+from benchmarks.bench_quote_table import synthetic_quotes
+
+
+def next_snapshot(frame, changed, seed=1):
+    """`frame` after one refresh: `changed` of the rows get a new price, 0.1% are replaced."""
+    rng = np.random.default_rng(seed)
+    current = frame.copy()
+    ticks = rng.choice(len(frame), int(len(frame) * changed), replace=False)
+    moves = 1 + rng.normal(0, 0.001, len(ticks))
+    current.loc[ticks, 'last_price'] = current.loc[ticks, 'last_price'] * moves
+    current.loc[ticks, 'change'] = current.loc[ticks, 'last_price'] - current.loc[ticks, 'open']
+    current.loc[ticks, 'volume'] += rng.integers(1, 1000, len(ticks))
+    churn = max(1, len(frame) // 1000)
+    listed = synthetic_quotes(churn, seed=seed + 100)
+    listed['ticker'] = [f"NEW{i}" for i in range(churn)]
+    current = current.drop(index=rng.choice(len(frame), churn, replace=False))
+    return pd.concat([current, listed], ignore_index=True)
+
+
+def reference_delta(previous, current, key='ticker'):
+    old = {row[key]: row for row in previous.to_dict('records')}
+    new = {row[key]: row for row in current.to_dict('records')}
+    same = lambda a, b: a == b or (pd.isna(a) and pd.isna(b))
+    added = [k for k in new if k not in old]
+    updated = [k for k in new if k in old and not all(same(new[k][c], old[k][c]) for c in new[k])]
+    removed = [k for k in old if k not in new]
+    return added, updated, removed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[3000, 30000])
+    parser.add_argument("--changed", type=float, default=0.02, help="fraction of rows that tick per refresh")
+    args = parser.parse_args()
+
+    for n in args.sizes:
+        previous = synthetic_quotes(n)
+        current = next_snapshot(previous, args.changed)
+        diff_quotes(previous, current)  # warm-up
+        samples = []
+        for _ in range(10):
+            start = time.perf_counter()
+            delta = diff_quotes(previous, current)
+            samples.append(time.perf_counter() - start)
+        print(f"{n:6,} rows   diff {min(samples) * 1000:6.2f} ms   {len(delta.updated):5,} changed "
+              f"{len(delta.added):3,} added {len(delta.removed):3,} removed")
+        assert min(samples) < 1.0, "diff exceeds the 1 s refresh budget"
+
+        added, updated, removed = reference_delta(previous, current)
+        assert delta.added['ticker'].tolist() == added
+        assert delta.updated['ticker'].tolist() == updated
+        assert delta.removed == removed
+    assert diff_quotes(previous, previous.copy()).empty
+    print("Deltas match a row-by-row comparison")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+# benchmarks/bench_quote_hub.py
+# Run from the repo root: python -m benchmarks.bench_quote_hub [--sessions 50] [--seconds 3]
+"""
+Counts upstream quote fetches with many concurrent viewers, using a stub provider that
+takes 100 ms per call: a cold start with every session asking at once, then sessions
+polling the grid every 200 ms for a few seconds while the hub refreshes in the background.
+Compared with one TTL cache per session, which is what a per-session cache expiry costs.
+Also checks a failed refresh keeps the previous snapshot published.
+"""
+import argparse
+import threading
+import time
+
+import pandas as pd
+
+from backend.quote_hub import QuoteHub
+
+SYMBOLS = tuple(f"T{i:03d}" for i in range(32))
+
+
+class StubProvider:
+    def __init__(self, latency=0.1):
+        self.latency = latency
+        self.calls = 0
+        self.fail_next = False
+        self._lock = threading.Lock()
+
+    def __call__(self, tickers):
+        with self._lock:
+            self.calls += 1
+            call = self.calls
+            fail, self.fail_next = self.fail_next, False
+        time.sleep(self.latency)
+        if fail:
+            raise ConnectionError("429 Too Many Requests")
+        return pd.DataFrame({'ticker': tickers, 'last_price': [100.0 + call] * len(tickers)})
+
+
+def run_sessions(sessions, seconds, read):
+    """Each session calls read() every 200 ms; returns the largest snapshot age seen."""
+    ages = []
+    stop = time.monotonic() + seconds
+
+    def session():
+        while time.monotonic() < stop:
+            ages.append(read())
+            time.sleep(0.2)
+
+    threads = [threading.Thread(target=session) for _ in range(sessions)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return max(ages)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sessions", type=int, default=50)
+    parser.add_argument("--seconds", type=float, default=3.0)
+    parser.add_argument("--interval", type=float, default=1.0, help="hub refresh interval / per-session TTL")
+    args = parser.parse_args()
+
+    provider = StubProvider()
+    hub = QuoteHub(provider, interval=args.interval)
+    barrier = threading.Barrier(args.sessions)
+    results = []
+
+    def cold_session():
+        barrier.wait()
+        results.append(hub.snapshot(SYMBOLS))
+
+    threads = [threading.Thread(target=cold_session) for _ in range(args.sessions)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert provider.calls == 1, f"cold start made {provider.calls} upstream calls"
+    assert len({id(snapshot) for snapshot in results}) == 1
+    print(f"cold start: {args.sessions} concurrent sessions -> {provider.calls} upstream call")
+
+    hub.start()
+    calls_before = provider.calls
+    worst_age = run_sessions(args.sessions, args.seconds, lambda: hub.snapshot(SYMBOLS).age)
+    hub_calls = provider.calls - calls_before
+    hub.stop()
+    print(f"hub:         {hub_calls:3d} upstream calls in {args.seconds:.0f} s, oldest snapshot served {worst_age:.2f} s")
+
+    per_session = StubProvider()
+    caches = {}
+
+    def read_own_cache():
+        key = threading.get_ident()
+        fetched_at, _ = caches.get(key, (0.0, None))
+        if time.time() - fetched_at > args.interval:
+            caches[key] = (time.time(), per_session(list(SYMBOLS)))
+        return time.time() - caches[key][0]
+
+    run_sessions(args.sessions, args.seconds, read_own_cache)
+    print(f"per session: {per_session.calls:3d} upstream calls in {args.seconds:.0f} s")
+    assert hub_calls <= args.seconds / args.interval + 1
+    assert worst_age < args.interval + 2 * provider.latency + 0.3
+
+    published = hub.snapshot(SYMBOLS)
+    provider.fail_next = True
+    try:
+        hub.refresh(SYMBOLS)
+    except ConnectionError:
+        pass
+    assert hub.snapshot(SYMBOLS) is published
+    assert hub.stats()['errors'] == 1
+    print(f"failed refresh kept snapshot v{published.version}: {hub.stats()['last_error']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,133 @@
+# benchmarks/bench_quote_snapshot.py
+# Run from the repo root: python -m benchmarks.bench_quote_snapshot [--latency 0.05] [--repeat 5]
+"""
+Compares the old per-ticker quote loop against the batched snapshot engine
+using a fixture of provider responses instead of the network. Each provider
+call sleeps for `--latency` seconds to stand in for a round trip.
+"""
+import argparse
+import json
+import os
+import time
+
+import pandas as pd
+
+from backend.quote_snapshot import build_quote_frame, fetch_quote_snapshot
+
+FIXTURE = os.path.join(os.path.dirname(__file__), "fixtures", "quote_snapshot.json")
+
+
+def load_fixture(path=FIXTURE):
+    with open(path) as f:
+        fixture = json.load(f)
+    # Rebuild the (ticker, field) column layout that yf.download(group_by='ticker') returns
+    index = pd.DatetimeIndex([fixture['date']], name='Date')
+    bars = pd.concat(
+        {ticker: pd.DataFrame([values], index=index) for ticker, values in fixture['bars'].items()},
+        axis=1
+    )
+    return list(fixture['bars']), bars, fixture['quotes']
+
+
+class FixtureProvider:
+    """Serves fixture data and counts calls, sleeping `latency` seconds per call."""
+
+    def __init__(self, bars, quotes, latency):
+        self.bars = bars
+        self.quotes = {q['symbol']: q for q in quotes}
+        self.latency = latency
+        self.calls = 0
+
+    def _round_trip(self):
+        self.calls += 1
+        time.sleep(self.latency)
+
+    def download(self, tickers):
+        self._round_trip()
+        return self.bars
+
+    def quote_batch(self, tickers, batch_size=50):
+        records = []
+        for start in range(0, len(tickers), batch_size):
+            self._round_trip()
+            records.extend(self.quotes[t] for t in tickers[start:start + batch_size] if t in self.quotes)
+        return records
+
+    def info(self, ticker):
+        self._round_trip()
+        return dict(self.quotes.get(ticker, {}))
+
+
+def legacy_quotes(provider, tickers):
+    """The row-by-row implementation that get_top_stocks_quotes used before the snapshot engine."""
+    data = provider.download(tickers)
+    quotes = []
+    for ticker in tickers:
+        last_close = data[ticker]['Close'].iloc[-1]
+        open_ = data[ticker]['Open'].iloc[-1]
+        name = provider.info(ticker).get('shortName', ticker)
+        info = provider.info(ticker)
+        change = last_close - open_
+        quotes.append({
+            'ticker': ticker,
+            'name': name,
+            'last_price': last_close,
+            'day_high': data[ticker]['High'].iloc[-1],
+            'day_low': data[ticker]['Low'].iloc[-1],
+            'open': open_,
+            'volume': data[ticker]['Volume'].iloc[-1],
+            'change': change,
+            'change_pct': change / open_ * 100 if open_ else None,
+            'currency': info.get('currency'),
+            'bid': info.get('bid'),
+            'ask': info.get('ask'),
+            'year_high': info.get('fiftyTwoWeekHigh'),
+            'year_low': info.get('fiftyTwoWeekLow'),
+            'market_cap': info.get('marketCap'),
+        })
+    return pd.DataFrame(quotes)
+
+
+def best_of(fn, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        timings.append(time.perf_counter() - start)
+    return min(timings), result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--latency", type=float, default=0.05, help="simulated seconds per provider call")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    tickers, bars, quotes = load_fixture()
+
+    legacy = FixtureProvider(bars, quotes, args.latency)
+    legacy_time, legacy_df = best_of(lambda: legacy_quotes(legacy, tickers), args.repeat)
+
+    batched = FixtureProvider(bars, quotes, args.latency)
+    batched_time, batched_df = best_of(
+        lambda: fetch_quote_snapshot(tickers, download=batched.download, fetch_metadata=batched.quote_batch),
+        args.repeat
+    )
+
+    # Frame assembly alone, without any simulated network time
+    assembly_time, _ = best_of(lambda: build_quote_frame(bars, quotes, tickers), max(args.repeat, 20))
+
+    pd.testing.assert_frame_equal(
+        legacy_df[['ticker', 'name', 'last_price', 'change_pct', 'market_cap']].reset_index(drop=True),
+        batched_df[['ticker', 'name', 'last_price', 'change_pct', 'market_cap']].reset_index(drop=True),
+        check_dtype=False
+    )
+
+    print(f"{len(tickers)} tickers, {args.latency * 1000:.0f} ms simulated latency per call")
+    print(f"legacy loop:      {legacy_time:8.3f} s  ({legacy.calls // args.repeat} provider calls)")
+    print(f"batched snapshot: {batched_time:8.3f} s  ({batched.calls // args.repeat} provider calls)")
+    print(f"frame assembly:   {assembly_time * 1000:8.3f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+# benchmarks/bench_quote_table.py
+# Run from the repo root: python -m benchmarks.bench_quote_table [--sizes 30 3000 30000]
+"""
+Compares sending the whole quotes frame to the grid with asking QuoteTable for one page,
+across universe sizes: page latency (first request per sort/filter and repeated ones) and
+the JSON payload handed to AG Grid. Pages are checked against a plain pandas
+filter + sort_values + slice.
+"""
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from backend.quote_snapshot import QUOTE_COLUMNS
+from backend.quote_table import QuoteTable
+from benchmarks.bench_search import synthetic_universe
+
+
+def synthetic_quotes(n, seed=0):
+    rng = np.random.default_rng(seed)
+    tickers, names = synthetic_universe(n, seed)
+    last = rng.lognormal(4, 1, n)
+    open_ = last * (1 + rng.normal(0, 0.02, n))
+    frame = pd.DataFrame({
+        'ticker': tickers, 'name': names, 'last_price': last, 'day_high': np.maximum(last, open_) * 1.01,
+        'day_low': np.minimum(last, open_) * 0.99, 'open': open_, 'volume': rng.integers(1000, 10_000_000, n),
+        'change': last - open_, 'change_pct': (last - open_) / open_ * 100, 'currency': 'USD',
+        'bid': last * 0.999, 'ask': last * 1.001, 'year_high': last * 1.3, 'year_low': last * 0.7,
+        'market_cap': rng.lognormal(22, 2, n),
+    })
+    # A few missing prices, like tickers the provider returned nothing for
+    frame.loc[rng.choice(n, max(1, n // 100), replace=False), ['last_price', 'change_pct']] = np.nan
+    return frame[QUOTE_COLUMNS]
+
+
+def reference_page(frame, page, page_size, sort_by, ascending, query):
+    rows = frame
+    if query:
+        q = query.lower()
+        rows = rows[rows['ticker'].str.lower().str.contains(q, regex=False) | rows['name'].str.lower().str.contains(q, regex=False)]
+    key = (lambda s: s.str.lower()) if pd.api.types.is_string_dtype(rows[sort_by]) else None
+    rows = rows.sort_values(sort_by, ascending=ascending, kind='stable', na_position='last', key=key)
+    return rows.iloc[page * page_size:(page + 1) * page_size]
+
+
+def timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return time.perf_counter() - start, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[30, 3000, 30000])
+    parser.add_argument("--page-size", type=int, default=25)
+    args = parser.parse_args()
+
+    requests = [("last_price", False, None), ("change_pct", True, "gold"), ("name", True, "bank"), ("volume", False, "a")]
+    for n in args.sizes:
+        frame = synthetic_quotes(n)
+        full_payload = len(frame.to_json(orient='records'))
+        build_time, table = timed(lambda: QuoteTable(frame))
+        cold, warm, payloads = [], [], []
+        for sort_by, ascending, query in requests:
+            cold_time, result = timed(lambda: table.page(1, args.page_size, sort_by, ascending, query))
+            warm_time, _ = timed(lambda: table.page(1, args.page_size, sort_by, ascending, query))
+            cold.append(cold_time)
+            warm.append(warm_time)
+            payloads.append(len(result.rows.to_json(orient='records')))
+            expected = reference_page(frame, result.page, args.page_size, sort_by, ascending, query)
+            pd.testing.assert_frame_equal(result.rows, expected)
+        print(f"{n:6,} rows   build {build_time * 1000:6.2f} ms   page cold {np.mean(cold) * 1000:6.2f} ms   "
+              f"warm {np.mean(warm) * 1000:5.2f} ms   payload {max(payloads) / 1024:5.1f} KB vs full grid {full_payload / 1024:8.1f} KB")
+    print("Pages match pandas filter + sort + slice")
+
+
+if __name__ == "__main__":
+    main()
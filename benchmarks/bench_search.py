@@ -0,0 +1,94 @@
+# benchmarks/bench_search.py
+# Run from the repo root: python -m benchmarks.bench_search [--symbols 100000]
+"""
+Builds a SymbolIndex over a synthetic universe and times typical keystroke queries
+(prefixes, full tickers, company words, typos) against the budget of 5 ms per query.
+On a smaller universe it checks every ticker or name word within the edit-distance
+bound, as found by a brute-force scan, is also returned by the index.
+"""
+import argparse
+import string
+import time
+
+import numpy as np
+
+from backend.search import SymbolIndex, bounded_levenshtein, default_max_distance
+
+WORDS = [
+    "Apple", "Micro", "Soft", "Alpha", "Global", "Energy", "Pharma", "Bio", "Tech", "Capital",
+    "Holdings", "Systems", "Networks", "Motors", "Foods", "Mining", "Gold", "Silver", "Bank",
+    "Financial", "Health", "Medical", "Solar", "Power", "Retail", "Digital", "Semiconductor",
+    "Airlines", "Logistics", "Insurance", "Realty", "Water", "Telecom", "Media", "Gaming",
+]
+SUFFIXES = ["Inc.", "Corp.", "Ltd.", "PLC", "AG", "SA", "Group", "Co."]
+
+
+def synthetic_universe(n, seed=0):
+    rng = np.random.default_rng(seed)
+    letters = np.array(list(string.ascii_uppercase))
+    tickers, names, seen = [], [], set()
+    while len(tickers) < n:
+        ticker = "".join(rng.choice(letters, int(rng.integers(1, 6))))
+        if rng.random() < 0.2:
+            ticker += "." + str(rng.choice(["L", "DE", "TO", "HK", "PA"]))
+        if ticker in seen:
+            continue
+        seen.add(ticker)
+        words = rng.choice(WORDS, int(rng.integers(1, 4)), replace=False)
+        tickers.append(ticker)
+        names.append(" ".join(words) + " " + str(rng.choice(SUFFIXES)))
+    return tickers, names
+
+
+def brute_force(query, tickers, names, max_distance):
+    """Positions whose ticker or any name word is within max_distance of the query."""
+    query = query.lower()
+    hits = set()
+    for position, (ticker, name) in enumerate(zip(tickers, names)):
+        terms = [ticker.lower()] + name.lower().replace(",", " ").replace(".", " ").split()
+        if any(bounded_levenshtein(query, term, max_distance) <= max_distance for term in terms):
+            hits.add(position)
+    return hits
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--symbols", type=int, default=100_000)
+    parser.add_argument("--budget-ms", type=float, default=5.0)
+    args = parser.parse_args()
+
+    tickers, names = synthetic_universe(args.symbols)
+    start = time.perf_counter()
+    index = SymbolIndex(tickers, names)
+    print(f"Indexed {len(index):,} symbols in {time.perf_counter() - start:.2f} s")
+
+    queries = ["A", "AA", "AAP", "AAPL", "apple", "appel", "aple", "micro", "mircosoft", "semicon",
+               "semiconductr", "goldd", "bank", "insurence", "digital media", "XYZ", "QQ.L", "telecmo"]
+    timings = []
+    for query in queries:
+        index.search(query)  # warm-up
+        samples = []
+        for _ in range(20):
+            begin = time.perf_counter()
+            results = index.search(query, k=20)
+            samples.append(time.perf_counter() - begin)
+        timings.append(np.median(samples))
+        top = ", ".join(tickers[p] for p in results[:3])
+        print(f"{query!r:17s} {np.median(samples) * 1000:6.3f} ms   {len(results):2d} results   top: {top}")
+    worst = max(timings) * 1000
+    print(f"median {np.median(timings) * 1000:.3f} ms, worst {worst:.3f} ms (budget {args.budget_ms} ms)")
+    assert worst < args.budget_ms, "a query exceeded the latency budget"
+
+    small_tickers, small_names = synthetic_universe(3000, seed=1)
+    small = SymbolIndex(small_tickers, small_names)
+    for query in ["appel", "mircosoft", "insurence", "telecmo", "goldd", "finacial"]:
+        bound = default_max_distance(query)
+        expected = brute_force(query, small_tickers, small_names, bound)
+        found = set(small.search(query, k=len(small_tickers), max_distance=bound))
+        missing = expected - found
+        assert not missing, f"{query!r}: index missed {len(missing)} of {len(expected)} brute-force matches"
+    print("Index recall matches the brute-force scan on the typo queries")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,131 @@
+# benchmarks/bench_single_flight.py
+# Run from the repo root: python -m benchmarks.bench_single_flight [--requests 100]
+"""
+Fires concurrent identical requests at slow stub providers and counts how
+often the provider is called:
+  - SingleFlight.do and StaleWhileRevalidate.get on a cold key,
+  - the same after the TTL expired (stale value served at once, one background refresh),
+  - HistoryStore.get for one symbol, cold and after its refresh time passed.
+Each scenario must reach the provider exactly once.
+"""
+import argparse
+import os
+import tempfile
+import threading
+import time
+
+import pandas as pd
+
+from backend.history_store import REFRESH_AFTER, HistoryStore
+from backend.market_sim import simulate_ohlcv
+from backend.single_flight import SingleFlight, StaleWhileRevalidate
+
+
+class StubProvider:
+    def __init__(self, latency=0.2, fail=False):
+        self.latency = latency
+        self.fail = fail
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def __call__(self, *args, **kwargs):
+        with self._lock:
+            self.calls += 1
+            call = self.calls
+        time.sleep(self.latency)
+        if self.fail:
+            raise ConnectionError("provider unavailable")
+        return call
+
+
+class StubHistory(StubProvider):
+    """fetch_history replacement: a year of daily bars, or the bars from `start` on."""
+
+    def __call__(self, symbol, interval, period=None, start=None):
+        super().__call__()
+        index = pd.date_range(end=pd.Timestamp.now(tz="America/New_York").normalize(), periods=365, freq="D", name="Date")
+        bars = simulate_ohlcv(len(index), seed=1, index=index)
+        return bars if start is None else bars[bars.index >= start]
+
+
+def concurrently(n, fn):
+    """Calls fn() from n threads released at the same moment; returns (results, slowest call)."""
+    barrier = threading.Barrier(n)
+    results, latencies = [None] * n, [0.0] * n
+
+    def worker(i):
+        barrier.wait()
+        start = time.perf_counter()
+        results[i] = fn()
+        latencies[i] = time.perf_counter() - start
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(n)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results, max(latencies)
+
+
+def wait_idle(flight, key, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while flight.in_flight(key) and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+
+def report(label, calls, slowest):
+    print(f"{label:44s} {calls} upstream call(s)   slowest caller {slowest * 1000:6.1f} ms")
+    assert calls == 1, f"{label}: provider called {calls} times"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=100)
+    args = parser.parse_args()
+    n = args.requests
+
+    provider = StubProvider()
+    flight = SingleFlight()
+    results, slowest = concurrently(n, lambda: flight.do(("AAPL", "1d"), provider))
+    report("SingleFlight.do, cold", provider.calls, slowest)
+    assert set(results) == {1}
+
+    provider = StubProvider()
+    cache = StaleWhileRevalidate(ttl=0.5, max_stale=60)
+    results, slowest = concurrently(n, lambda: cache.get("quotes", provider))
+    report("StaleWhileRevalidate.get, cold", provider.calls, slowest)
+    time.sleep(0.6)
+    results, slowest = concurrently(n, lambda: cache.get("quotes", provider))
+    assert set(results) == {1}, "expired entry should be served while it refreshes"
+    assert slowest < provider.latency / 2, "stale reads should not wait for the refresh"
+    wait_idle(cache.flight, "quotes")
+    report("StaleWhileRevalidate.get, expired", provider.calls - 1, slowest)
+    assert cache.get("quotes", provider) == 2
+
+    failing = StubProvider(fail=True)
+    time.sleep(0.6)
+    assert cache.get("quotes", failing) == 2
+    wait_idle(cache.flight, "quotes")
+    assert cache.get("quotes", failing) == 2 and cache.stats()['errors'] == 1
+    print("failed background refresh keeps serving the stale value")
+
+    with tempfile.TemporaryDirectory() as root:
+        # Reading the file from 100 threads at once takes a while on its own, so give the
+        # provider a latency that separates "served from disk" from "waited for the refresh"
+        history = StubHistory(latency=1.0)
+        store = HistoryStore(root=root, fetch=history)
+        results, slowest = concurrently(n, lambda: store.get("AAPL", "1d", "6mo"))
+        report("HistoryStore.get, cold", history.calls, slowest)
+        assert all(r.equals(results[0]) for r in results)
+
+        past = time.time() - REFRESH_AFTER['1d'] - 1
+        os.utime(store.path("AAPL", "1d"), (past, past))
+        results, slowest = concurrently(n, lambda: store.get("AAPL", "1d", "6mo"))
+        assert slowest < history.latency, "stale history should be served without waiting"
+        wait_idle(store.flight, ("AAPL", "1d", "6mo"))
+        report("HistoryStore.get, past refresh time", history.calls - 1, slowest)
+        assert store.age("AAPL", "1d") < REFRESH_AFTER['1d']
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+# benchmarks/bench_symbol_catalog.py
+# Run from the repo root: python -m benchmarks.bench_symbol_catalog [--symbols 50000]
+"""
+Writes a synthetic universe CSV, loads it into a SymbolCatalog and reports load time,
+memory against the equivalent list of dicts, ticker lookups and attribute filters.
+Also checks the shipped data/symbols.csv covers every tab's universe.
+"""
+import argparse
+import csv
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+from backend.symbol_catalog import CATALOG_COLUMNS, SymbolCatalog
+from benchmarks.bench_search import synthetic_universe
+
+EXCHANGES = ["NYSE", "NASDAQ", "LSE", "XETRA", "TSX", "ASX", "TSE", "HKEX", "EURONEXT", "SIX"]
+COUNTRIES = ["USA", "USA", "USA", "GBR", "DEU", "CAN", "AUS", "JPN", "HKG", "FRA", "CHE"]
+ASSET_CLASSES = ["Equity"] * 8 + ["ETF", "Fund", "Index", "Forex", "Crypto", "Commodity"]
+SECTORS = ["Technology", "Financials", "Health Care", "Energy", "Industrials", "Utilities",
+           "Materials", "Consumer Staples", "Consumer Discretionary", "Communication Services", "Real Estate"]
+CURRENCIES = ["USD", "EUR", "GBP", "JPY", "CAD", "AUD", "HKD", "CHF"]
+
+
+def write_universe(path, n, seed=0):
+    rng = np.random.default_rng(seed)
+    tickers, names = synthetic_universe(n, seed)
+    with open(path, "w", newline="") as f:
+        writer = csv.writer(f, lineterminator="\n")
+        writer.writerow(CATALOG_COLUMNS)
+        for ticker, name in zip(tickers, names):
+            writer.writerow([
+                ticker, name, rng.choice(EXCHANGES), rng.choice(COUNTRIES), rng.choice(ASSET_CLASSES),
+                rng.choice(SECTORS), rng.choice(CURRENCIES), f"{rng.lognormal(22, 2):.4g}",
+                "top_quotes" if rng.random() < 0.001 else "",
+            ])
+    return tickers
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--symbols", type=int, default=50_000)
+    args = parser.parse_args()
+
+    shipped = SymbolCatalog.load()
+    for tag, expected in [("top_quotes", 32), ("charts", 15), ("analytics", 8), ("country_index", 14)]:
+        assert len(shipped.filter(tag=tag)) == expected, f"{tag}: {len(shipped.filter(tag=tag))} symbols"
+    print(f"data/symbols.csv: {len(shipped)} symbols, every tab universe present")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "symbols.csv")
+        tickers = write_universe(path, args.symbols)
+        start = time.perf_counter()
+        catalog = SymbolCatalog.load(path)
+        load_time = time.perf_counter() - start
+
+    records = catalog.records()
+    dict_bytes = sum(sys.getsizeof(r) + sum(sys.getsizeof(v) for v in r.values()) for r in records)
+    print(f"{len(catalog):,} symbols loaded in {load_time * 1000:.0f} ms   "
+          f"catalog {catalog.memory_usage() / 2**20:.1f} MB vs list of dicts {dict_bytes / 2**20:.1f} MB")
+
+    rng = np.random.default_rng(1)
+    probes = [tickers[i] for i in rng.integers(0, len(tickers), 10_000)]
+    start = time.perf_counter()
+    assert all(ticker in catalog for ticker in probes)
+    contains_time = (time.perf_counter() - start) / len(probes)
+    start = time.perf_counter()
+    for ticker in probes[:1000]:
+        catalog.get(ticker)
+    get_time = (time.perf_counter() - start) / 1000
+    print(f"lookup: 'in' {contains_time * 1e6:.2f} us   get() {get_time * 1e6:.1f} us")
+
+    for label, kwargs in [
+        ("asset_class=Equity", {"asset_class": "Equity"}),
+        ("country=USA, sector=Energy", {"country": "USA", "sector": "Energy"}),
+        ("exchange in [LSE, XETRA]", {"exchange": ["LSE", "XETRA"]}),
+        ("tag=top_quotes", {"tag": "top_quotes"}),
+    ]:
+        start = time.perf_counter()
+        view = catalog.filter(**kwargs)
+        first = time.perf_counter() - start
+        start = time.perf_counter()
+        catalog.filter(**kwargs)
+        again = time.perf_counter() - start
+        expected = [r for r in records if all(
+            (r['tags'].split().count(v) if k == 'tag' else (r[k] in v if isinstance(v, list) else r[k] == v))
+            for k, v in kwargs.items())]
+        assert list(view.tickers) == [r['ticker'] for r in expected]
+        print(f"filter {label:28s} {len(view):6,} rows   {first * 1000:6.2f} ms   memoized {again * 1e6:5.1f} us")
+
+
+if __name__ == "__main__":
+    main()
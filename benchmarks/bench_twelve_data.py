@@ -0,0 +1,188 @@
+# benchmarks/bench_twelve_data.py
+# Run from the repo root: python -m benchmarks.bench_twelve_data [--symbols 1200] [--credits 400]
+"""
+Runs a local HTTP stub of the Twelve Data /quote endpoint that charges one credit per
+symbol and rejects requests beyond --credits per one-second window (a scaled-down
+per-minute budget), then fetches a large symbol list two ways:
+  - the old approach: a fresh requests.get per 120-symbol chunk, no limiter,
+  - TwelveDataClient: pooled keep-alive session, token bucket, chunking and parsing.
+Reports time, credits/s against the budget, rate-limit rejections and TCP connections
+opened, and checks the parsed frame against the values the stub served, the request
+counters of a client shared by several threads, and Retry-After parsing.
+"""
+import argparse
+import json
+import threading
+import time
+import zlib
+from email.utils import formatdate
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import numpy as np
+import requests
+
+from backend.quote_snapshot import QUOTE_COLUMNS
+from backend.twelve_data import TwelveDataClient, chunk_symbols, parse_retry_after
+
+
+def stub_quote(symbol):
+    """Deterministic quote for `symbol`, formatted like Twelve Data (numbers as strings)."""
+    seed = zlib.crc32(symbol.encode())
+    close = 10 + seed % 50000 / 100
+    open_ = close * (1 + (seed % 200 - 100) / 10000)
+    return {
+        'symbol': symbol, 'name': f"{symbol} Inc", 'exchange': "NASDAQ", 'currency': "USD",
+        'open': f"{open_:.5f}", 'high': f"{max(open_, close) * 1.01:.5f}", 'low': f"{min(open_, close) * 0.99:.5f}",
+        'close': f"{close:.5f}", 'volume': str(seed % 1_000_000), 'change': f"{close - open_:.5f}",
+        'percent_change': f"{(close - open_) / open_ * 100:.5f}",
+        'fifty_two_week': {'low': f"{close * 0.7:.5f}", 'high': f"{close * 1.3:.5f}"},
+    }
+
+
+class StubProvider:
+    """Fixed-window credit budget, like the provider's per-minute one."""
+
+    def __init__(self, credits, window):
+        self.credits = credits
+        self.window = window
+        self.lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        self.current_window = None
+        self.used = 0
+        self.served = 0
+        self.rejected = 0
+        self.connections = 0
+        self.requests = 0
+
+    def charge(self, cost):
+        with self.lock:
+            window = int(time.monotonic() / self.window)
+            if window != self.current_window:
+                self.current_window, self.used = window, 0
+            if self.used + cost > self.credits:
+                self.rejected += 1
+                return False
+            self.used += cost
+            self.served += cost
+            return True
+
+
+def make_handler(provider):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"  # keep-alive
+
+        def setup(self):
+            super().setup()
+            with provider.lock:
+                provider.connections += 1
+
+        def log_message(self, *args):
+            pass
+
+        def do_GET(self):
+            url = urlparse(self.path)
+            symbols = parse_qs(url.query).get('symbol', [''])[0].split(',')
+            with provider.lock:
+                provider.requests += 1
+            if provider.charge(len(symbols)):
+                quotes = {symbol: stub_quote(symbol) for symbol in symbols}
+                payload = quotes[symbols[0]] if len(symbols) == 1 else quotes
+            else:
+                payload = {'code': 429, 'message': "You have run out of API credits for the current minute.", 'status': 'error'}
+            body = json.dumps(payload).encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+    return Handler
+
+
+def naive_fetch(base_url, symbols):
+    """What fetch_quotes used to do, chunked: a new connection per request, no budget."""
+    failed = 0
+    for chunk in chunk_symbols(symbols, 120):
+        data = requests.get(f"{base_url}/quote", params={'symbol': ",".join(chunk), 'apikey': "demo"}).json()
+        failed += len(chunk) if data.get('status') == 'error' else 0
+    return failed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--symbols", type=int, default=1200)
+    parser.add_argument("--credits", type=int, default=400, help="credits per one-second window")
+    args = parser.parse_args()
+
+    provider = StubProvider(args.credits, window=1.0)
+    server = ThreadingHTTPServer(("127.0.0.1", 0), make_handler(provider))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base_url = f"http://127.0.0.1:{server.server_port}"
+    symbols = [f"S{i:05d}" for i in range(args.symbols)]
+    budget = args.credits / provider.window
+
+    try:
+        start = time.perf_counter()
+        failed = naive_fetch(base_url, symbols)
+        elapsed = time.perf_counter() - start
+        print(f"requests.get per chunk: {elapsed:5.2f} s   {provider.rejected:3d} requests rejected, "
+              f"{failed:,} of {len(symbols):,} symbols missing   {provider.connections} connections")
+
+        provider.reset()
+        client = TwelveDataClient("demo", base_url=base_url, credits_per_window=args.credits, window=provider.window)
+        start = time.perf_counter()
+        quotes = client.quotes(symbols)
+        elapsed = time.perf_counter() - start
+        rate = provider.served / elapsed
+        print(f"TwelveDataClient:       {elapsed:5.2f} s   {provider.rejected:3d} requests rejected, "
+              f"{quotes['last_price'].isna().sum():,} symbols missing   {provider.connections} connection(s)   "
+              f"{rate:.0f} credits/s of {budget:.0f} ({client.requests} requests of {client.chunk_size} symbols)")
+        assert provider.rejected == 0, "client exceeded the credit budget"
+        assert provider.connections == 1, "client did not reuse its connection"
+        assert rate > 0.8 * budget * 7 / 8, "client left too much of the budget unused"
+
+        assert list(quotes.columns) == QUOTE_COLUMNS and quotes['volume'].dtype == np.int64
+        expected = [stub_quote(symbol) for symbol in symbols]
+        assert np.allclose(quotes['last_price'], [float(q['close']) for q in expected])
+        assert np.allclose(quotes['change_pct'], [float(q['percent_change']) for q in expected])
+        assert np.allclose(quotes['year_high'], [float(q['fifty_two_week']['high']) for q in expected])
+        assert quotes['name'].tolist() == [q['name'] for q in expected]
+        print("Parsed frame matches the quotes the stub served")
+        client.close()
+
+        # Someone else on the same key spent this window's credits: the client backs off and retries
+        provider.reset()
+        provider.charge(args.credits)
+        client = TwelveDataClient("demo", base_url=base_url, credits_per_window=args.credits, window=provider.window)
+        quotes = client.quotes(symbols[:200])
+        assert client.rate_limited >= 1 and quotes['last_price'].notna().all()
+        print(f"budget spent elsewhere: {client.rate_limited} rate-limited answer(s), all quotes fetched after backing off")
+        client.close()
+
+        # One client shared by several sessions: its counters must agree with what the stub saw
+        provider.reset()
+        client = TwelveDataClient("demo", base_url=base_url, credits_per_window=args.credits, window=provider.window)
+        sessions = [threading.Thread(target=client.quotes, args=(symbols[i::8],)) for i in range(8)]
+        for session in sessions:
+            session.start()
+        for session in sessions:
+            session.join()
+        assert client.requests == provider.requests, (client.requests, provider.requests)
+        print(f"8 threads on one client: {client.requests} requests counted, {provider.requests} served")
+        client.close()
+    finally:
+        server.shutdown()
+
+    # Retry-After may be seconds or an HTTP-date; anything else falls back to the window
+    assert parse_retry_after("7", 60.0) == 7.0
+    assert 25 < parse_retry_after(formatdate(time.time() + 30, usegmt=True), 60.0) <= 30
+    assert parse_retry_after(formatdate(time.time() - 30, usegmt=True), 60.0) == 0.0
+    assert parse_retry_after("soon", 60.0) == 60.0 and parse_retry_after(None, 60.0) == 60.0
+    print("Retry-After parsed as seconds or an HTTP-date, with the window as fallback")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+# benchmarks/bench_volatility.py
+# Run from the repo root: python -m benchmarks.bench_volatility [--symbols 2000] [--periods 1260] [--window 20]
+"""
+Checks backend.volatility and times it over a simulated OHLC panel:
+  - every estimator against a per-symbol pandas implementation of its textbook formula,
+  - accuracy: on driftless bars with no overnight gaps (true daily volatility 2%), the spread
+    of each estimator across symbols for a single --window, and its efficiency (variance of
+    close-to-close / variance of the estimator: how many times fewer bars it needs),
+  - speed: all six estimators over --symbols x --periods bars, against looping the pandas
+    reference over the symbols.
+"""
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from backend import market_sim, volatility
+
+
+def reference(bars, window, model):
+    """One symbol's rolling volatility with pandas, straight from the formulas."""
+    o, h, l, c = (bars[name] for name in ('Open', 'High', 'Low', 'Close'))
+    rs = np.log(h / c) * np.log(h / o) + np.log(l / c) * np.log(l / o)
+    if model == 'close_to_close':
+        return c.pct_change().rolling(window).std(ddof=0)
+    if model == 'ewma':
+        squares = c.pct_change() ** 2
+        variance = pd.Series(np.nan, index=c.index)
+        variance.iloc[window] = squares.iloc[1:window + 1].mean()
+        for t in range(window + 1, len(c)):
+            variance.iloc[t] = 0.94 * variance.iloc[t - 1] + 0.06 * squares.iloc[t]
+        return np.sqrt(variance)
+    if model == 'parkinson':
+        return np.sqrt((np.log(h / l) ** 2).rolling(window).mean() / (4 * np.log(2)))
+    if model == 'garman_klass':
+        return np.sqrt((0.5 * np.log(h / l) ** 2 - (2 * np.log(2) - 1) * np.log(c / o) ** 2).rolling(window).mean())
+    if model == 'rogers_satchell':
+        return np.sqrt(rs.rolling(window).mean())
+    overnight = np.log(o / c.shift())
+    k = 0.34 / (1.34 + (window + 1) / (window - 1))
+    valid = overnight.notna()
+    return np.sqrt(overnight.rolling(window).var() + k * np.log(c / o).where(valid).rolling(window).var()
+                   + (1 - k) * rs.where(valid).rolling(window).mean())
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--symbols", type=int, default=2000)
+    parser.add_argument("--periods", type=int, default=1260)
+    parser.add_argument("--window", type=int, default=20)
+    args = parser.parse_args()
+
+    small = market_sim.simulate_ohlc_panel([f"T{i}" for i in range(5)], 300, seed=4)
+    for model in volatility.ESTIMATORS:
+        panel = volatility.rolling_volatility(small, args.window, model)
+        for symbol in small['Close'].columns:
+            expected = reference({name: frame[symbol] for name, frame in small.items()}, args.window, model)
+            assert np.allclose(panel[symbol], expected, equal_nan=True, rtol=1e-9, atol=1e-14), (model, symbol)
+            assert panel[symbol].isna().sum() == expected.isna().sum(), (model, symbol)
+    print("every estimator matches its pandas reference")
+
+    # One estimate per symbol from the first `window` bars: the spread across symbols is the
+    # estimator's sampling error
+    names = [f"S{i:05d}" for i in range(4000)]
+    pure = market_sim.simulate_ohlc_panel(names, args.window + 1, seed=8, overnight=0.0)
+    print(f"\nAccuracy from {args.window} daily bars (true volatility 2.00%, no overnight gaps)")
+    spread = {}
+    for label, model in volatility.MODELS.items():
+        estimates = volatility.rolling_volatility(pure, args.window, model).iloc[-1].to_numpy()
+        spread[model] = estimates.var()
+        print(f"  {label:20s} mean {estimates.mean():.4%}   std {estimates.std():.4%}   "
+              f"efficiency {spread['close_to_close'] / spread[model]:5.2f}x")
+    assert spread['close_to_close'] / spread['parkinson'] > 3
+    assert spread['close_to_close'] / spread['garman_klass'] > 4
+    assert spread['close_to_close'] / spread['rogers_satchell'] > 3
+    assert spread['close_to_close'] / spread['yang_zhang'] > 2
+
+    start = time.perf_counter()
+    bars = market_sim.simulate_ohlc_panel([f"S{i:05d}" for i in range(args.symbols)], args.periods, seed=1)
+    simulate_time = time.perf_counter() - start
+    print(f"\n{args.symbols} symbols x {args.periods} bars (simulated in {simulate_time:.2f} s), window {args.window}")
+    for label, model in volatility.MODELS.items():
+        start = time.perf_counter()
+        volatility.rolling_volatility(bars, args.window, model)
+        elapsed = time.perf_counter() - start
+        print(f"  {label:20s} {elapsed * 1000:8.1f} ms")
+
+    sample = bars['Close'].columns[:50]
+    start = time.perf_counter()
+    for symbol in sample:
+        reference({name: frame[symbol] for name, frame in bars.items()}, args.window, 'yang_zhang')
+    loop_time = (time.perf_counter() - start) / len(sample) * args.symbols
+    start = time.perf_counter()
+    volatility.yang_zhang(bars, args.window)
+    panel_time = time.perf_counter() - start
+    print(f"Yang-Zhang, pandas per symbol (extrapolated): {loop_time * 1000:8.1f} ms   panel: {panel_time * 1000:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,295 @@
+# benchmarks/suite.py
+# Run from the repo root: python -m benchmarks.suite [--quick] [--only indicators] [--save]
+"""
+Headless benchmark suite for the compute paths behind each tab: fuzzy search, quote frame
+assembly and refresh diffs, every Charts tab indicator, seasonal decomposition, the Analytics
+tab returns, correlation, rolling/expanding and OHLC volatility, risk metrics and Monte Carlo
+VaR, and building the Plotly figures.
+Needs neither Streamlit nor the network; all inputs come from backend.market_sim.
+
+Each case runs at several data sizes. Timings are the best of --repeat samples, each sample
+looping the case until it takes at least 10 ms. --save writes them to baselines.json; a
+normal run compares against that file and exits non-zero if any case got slower than
+baseline * (1 + --tolerance). Baselines are machine-specific: re-save after changing hardware.
+"""
+import argparse
+import json
+import os
+import platform
+import string
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+import plotly.graph_objects as go
+from statsmodels.tsa.seasonal import seasonal_decompose
+
+from backend import analytics, indicators, market_sim, monte_carlo, online_stats, risk, volatility
+from backend.correlation import RollingCorrelation
+from backend.quote_snapshot import BAR_FIELDS, build_quote_frame
+from backend.quote_table import diff_quotes
+from backend.search import SymbolIndex, fuzzy_search
+
+BASELINE_PATH = os.path.join(os.path.dirname(__file__), "baselines.json")
+# Differences below this are timer noise, whatever the ratio
+MIN_DELTA = 0.001
+
+
+def sample_items(n, seed=0):
+    """Catalog entries shaped like the tabs' symbol lists."""
+    rng = np.random.default_rng(seed)
+    letters = np.array(list(string.ascii_uppercase))
+    items = []
+    for i in range(n):
+        ticker = "".join(rng.choice(letters, int(rng.integers(1, 6))))
+        items.append({"ticker": ticker, "name": f"{ticker.title()} Holdings {i} Inc."})
+    return items
+
+
+def sample_quote_inputs(n, seed=0):
+    """A one-row yf.download-style bar frame and quote records for n tickers."""
+    tickers = [f"T{i:05d}" for i in range(n)]
+    bars = market_sim.simulate_ohlcv(n, seed=seed)
+    columns = pd.MultiIndex.from_product([tickers, BAR_FIELDS])
+    row = bars.to_numpy().reshape(1, -1)
+    frame = pd.DataFrame(row, index=pd.DatetimeIndex(["2024-01-02"], name="Date"), columns=columns)
+    records = [
+        {"symbol": t, "shortName": f"{t} Corp", "currency": "USD", "bid": 1.0, "ask": 1.1,
+         "fiftyTwoWeekHigh": 2.0, "fiftyTwoWeekLow": 0.5, "marketCap": 1e9}
+        for t in tickers
+    ]
+    return frame, records, tickers
+
+
+def sample_returns(symbols, periods=365, seed=0):
+    names = [f"S{i:04d}" for i in range(symbols)]
+    prices = market_sim.simulate_prices(names, periods, seed=seed)
+    return prices, analytics.returns_by_symbol(prices)
+
+
+def chart_figure(times, bars, overlays):
+    """Main Charts tab figure: candlestick, overlay indicator lines and volume bars."""
+    fig = go.Figure()
+    fig.add_trace(go.Candlestick(x=times, open=bars['Open'], high=bars['High'], low=bars['Low'], close=bars['Close']))
+    for name, values in overlays.items():
+        fig.add_trace(go.Scatter(x=times, y=values, mode='lines', name=name, line=dict(width=1, dash='dash')))
+    fig.add_trace(go.Bar(x=times, y=bars['Volume'], name="Volume", yaxis="y2", opacity=0.3))
+    fig.update_layout(height=600, xaxis_rangeslider_visible=False, template="plotly_white",
+                      yaxis2=dict(title="Volume", overlaying="y", side="right"))
+    return fig
+
+
+def macd_figure(times, closes):
+    macd_line, signal_line, histogram = indicators.macd(closes)
+    fig = go.Figure()
+    fig.add_trace(go.Scatter(x=times, y=macd_line, mode='lines'))
+    fig.add_trace(go.Scatter(x=times, y=signal_line, mode='lines'))
+    fig.add_trace(go.Bar(x=times, y=histogram, marker_color=['green' if h >= 0 else 'red' for h in histogram]))
+    fig.update_layout(height=500, template="plotly_white")
+    return fig
+
+
+def correlation_heatmap(corr_matrix):
+    return go.Figure(data=go.Heatmap(
+        z=corr_matrix.values, x=corr_matrix.columns, y=corr_matrix.columns, colorscale='RdBu', zmid=0,
+        text=np.round(corr_matrix.values, 3), texttemplate="%{text}"
+    ))
+
+
+def returns_boxplot(returns_data):
+    fig = go.Figure()
+    for symbol, returns in returns_data.items():
+        fig.add_trace(go.Box(y=returns, name=symbol, boxpoints='outliers'))
+    return fig
+
+
+def charts_cases(size):
+    bars = market_sim.simulate_ohlcv(size, seed=1)
+    o, h, l, c, v = (bars[column].to_numpy() for column in bars.columns)
+    times = pd.date_range(end="2024-01-01", periods=size, freq="1min")
+    overlays = {'SMA': indicators.sma(c, 20), 'EMA': indicators.ema(c, 20), 'VWAP': indicators.vwap(o, h, l, c, v)}
+    return {
+        "indicators.sma": lambda: indicators.sma(c, 20),
+        "indicators.ema": lambda: indicators.ema(c, 20),
+        "indicators.wma": lambda: indicators.wma(c, 20),
+        "indicators.hma": lambda: indicators.hma(c, 20),
+        "indicators.vwap": lambda: indicators.vwap(o, h, l, c, v),
+        "indicators.bollinger": lambda: indicators.bollinger(c, 20, 2.0),
+        "indicators.rsi": lambda: indicators.rsi(c, 14),
+        "indicators.macd": lambda: indicators.macd(c, 12, 26, 9),
+        "indicators.stochastic": lambda: indicators.stochastic(h, l, c, 14, 3),
+        "indicators.williams_r": lambda: indicators.williams_r(h, l, c, 14),
+        "indicators.atr": lambda: indicators.atr(h, l, c, 14),
+        "charts.decomposition": lambda: seasonal_decompose(pd.Series(c), model='additive', period=7),
+        "figures.chart": lambda: chart_figure(times, bars, overlays),
+        "figures.macd": lambda: macd_figure(times, c),
+    }
+
+
+def analytics_cases(size):
+    prices, returns_data = sample_returns(size)
+    corr_matrix = analytics.correlation_matrix(returns_data)
+    returns_panel = analytics.returns_frame(prices)
+    returns_matrix = returns_panel.to_numpy()
+    engine = RollingCorrelation(returns_panel)
+    ohlc_panel = market_sim.simulate_ohlc_panel(list(prices.columns), len(prices), seed=0)
+
+    return {
+        "analytics.returns": lambda: analytics.returns_by_symbol(prices),
+        "analytics.correlation": lambda: analytics.correlation_matrix(returns_data),
+        # A lookback slider step each way: only the 5 periods in between are added or removed
+        "analytics.rolling_correlation": lambda: (engine.correlation(60), engine.correlation(65)),
+        "analytics.rolling_volatility": lambda: analytics.rolling_volatility(returns_matrix, 30),
+        # The most involved estimator on the chart's model selector: three rolling passes over OHLC
+        "analytics.yang_zhang_volatility": lambda: volatility.yang_zhang(ohlc_panel, 30),
+        "analytics.expanding_volatility": lambda: [analytics.expanding_volatility(r) for r in returns_data.values()],
+        # Every expanding statistic the tab reads, for the whole panel in one pass
+        "analytics.expanding_stats": lambda: online_stats.expanding_stats(returns_panel),
+        # Volatility, VaR/CVaR (three ways), drawdown and moments for every symbol at once
+        "analytics.risk_metrics": lambda: risk.risk_metrics(returns_panel, 0.95),
+        # The Analytics tab's default: 100k paths over 10 days, inline (below the pool threshold)
+        "analytics.monte_carlo": lambda: monte_carlo.simulate_portfolio(returns_panel, paths=100_000, horizon=10),
+        "figures.correlation_heatmap": lambda: correlation_heatmap(corr_matrix),
+        "figures.returns_boxplot": lambda: returns_boxplot(returns_data),
+    }
+
+
+def search_cases(size):
+    items = sample_items(size)
+    index = SymbolIndex.from_items(items)
+    return {
+        "search.build_index": lambda: SymbolIndex.from_items(items),
+        "search.fuzzy_search": lambda: fuzzy_search("appl", items, index=index),
+    }
+
+
+def quotes_cases(size):
+    bars, records, tickers = sample_quote_inputs(size)
+    previous = build_quote_frame(bars, records, tickers)
+    current = previous.copy()
+    current.loc[::50, 'last_price'] *= 1.001
+    return {
+        "quotes.build_quote_frame": lambda: build_quote_frame(bars, records, tickers),
+        "quotes.diff_quotes": lambda: diff_quotes(previous, current),
+    }
+
+
+# group -> (case factory, sizes). --quick only runs the first size of each group.
+GROUPS = {
+    "search": (search_cases, [100, 2000, 100_000]),
+    "quotes": (quotes_cases, [32, 2000]),
+    "charts": (charts_cases, [7200, 43_200]),
+    "analytics": (analytics_cases, [8, 200]),
+}
+
+
+def measure(fn, repeat, budget=3.0):
+    """
+    Best-of-`repeat` seconds per call, looping each sample until it lasts >= 10 ms.
+    Slow cases stop sampling once they have used `budget` seconds.
+    """
+    start = time.perf_counter()
+    fn()  # warm-up
+    first = time.perf_counter() - start
+    if first >= 0.5:
+        samples = [first]
+        while len(samples) < repeat and sum(samples) + first < budget:
+            start = time.perf_counter()
+            fn()
+            samples.append(time.perf_counter() - start)
+        return min(samples)
+    loops = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(loops):
+            fn()
+        elapsed = time.perf_counter() - start
+        if elapsed >= 0.01 or loops >= 1 << 16:
+            break
+        loops *= 2
+    samples = [elapsed / loops]
+    for _ in range(repeat - 1):
+        start = time.perf_counter()
+        for _ in range(loops):
+            fn()
+        samples.append((time.perf_counter() - start) / loops)
+    return min(samples)
+
+
+def load_baselines(path):
+    if not os.path.exists(path):
+        return {}
+    with open(path) as f:
+        return json.load(f).get('results', {})
+
+
+def save_baselines(path, results):
+    payload = {
+        'machine': f"{platform.machine()} {platform.processor() or platform.system()}",
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'pandas': pd.__version__,
+        'results': dict(sorted(results.items())),
+    }
+    with open(path, "w") as f:
+        json.dump(payload, f, indent=2)
+        f.write("\n")
+
+
+def format_seconds(seconds):
+    if seconds >= 1:
+        return f"{seconds:8.3f} s "
+    if seconds >= 1e-3:
+        return f"{seconds * 1e3:8.3f} ms"
+    return f"{seconds * 1e6:8.1f} us"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--only", action="append", default=[], help="substring filter on case names (repeatable)")
+    parser.add_argument("--quick", action="store_true", help="only the smallest size per group")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--tolerance", type=float, default=0.5, help="allowed slowdown before flagging (0.5 = 50%%)")
+    parser.add_argument("--baselines", default=BASELINE_PATH)
+    parser.add_argument("--save", action="store_true", help="write these timings as the new baselines")
+    args = parser.parse_args()
+
+    baselines = load_baselines(args.baselines)
+    results = dict(baselines) if args.save else {}
+    regressions = []
+    for group, (factory, sizes) in GROUPS.items():
+        for size in sizes[:1] if args.quick else sizes:
+            cases = factory(size)
+            for name, fn in cases.items():
+                key = f"{name}[{size}]"
+                if args.only and not any(pattern in key for pattern in args.only):
+                    continue
+                seconds = measure(fn, args.repeat)
+                results[key] = seconds
+                baseline = baselines.get(key)
+                if baseline is None:
+                    status = "(no baseline)"
+                else:
+                    ratio = seconds / baseline
+                    regressed = ratio > 1 + args.tolerance and seconds - baseline > MIN_DELTA
+                    status = f"{ratio:6.2f}x baseline" + ("  REGRESSION" if regressed else "")
+                    if regressed:
+                        regressions.append((key, baseline, seconds))
+                print(f"{key:45s} {format_seconds(seconds)}   {status}")
+
+    if args.save:
+        save_baselines(args.baselines, results)
+        print(f"\nSaved {len(results)} baselines to {args.baselines}")
+        return 0
+    if regressions:
+        print(f"\n{len(regressions)} regression(s) beyond {args.tolerance:.0%}:")
+        for key, baseline, seconds in regressions:
+            print(f"  {key}: {format_seconds(baseline).strip()} -> {format_seconds(seconds).strip()}")
+        return 1
+    print("\nNo regressions")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())